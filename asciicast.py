@@ -0,0 +1,84 @@
+import json
+import queue
+import sys
+import threading
+import time
+from typing import IO, Iterator, Optional, Tuple
+
+class AsciicastRecorder:
+    def __init__(self, path: str, width: int, height: int, max_pending: int = 64):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.events: 'queue.Queue[Optional[Tuple[float, str]]]' = queue.Queue(maxsize=max_pending)
+        self.dropped_events = 0
+        self.recorded_events = 0
+        self.start_time = time.monotonic()
+        self.output = open(path, 'w', encoding='utf-8')
+        header = {
+            "version": 2,
+            "width": width,
+            "height": height,
+            "timestamp": int(time.time()),
+            "env": {"TERM": "xterm-256color", "SHELL": "/bin/sh"},
+        }
+        self.output.write(json.dumps(header) + "\n")
+        self.writer = threading.Thread(target=self._write_events, name="asciicast-writer", daemon=True)
+        self.writer.start()
+        self.record("\033[2J\033[H\033[?25l")
+
+    def record(self, data: str) -> bool:
+        if not data:
+            return True
+        try:
+            self.events.put_nowait((time.monotonic() - self.start_time, data))
+        except queue.Full:
+            self.dropped_events += 1
+            return False
+        return True
+
+    def _write_events(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                break
+            elapsed, data = event
+            self.output.write(json.dumps([round(elapsed, 6), "o", data], ensure_ascii=False) + "\n")
+            self.recorded_events += 1
+
+    def close(self):
+        if self.writer.is_alive():
+            self.events.put(None)
+            self.writer.join()
+        if not self.output.closed:
+            self.output.close()
+
+def read_asciicast(path: str) -> Iterator[Tuple[float, str]]:
+    with open(path, 'r', encoding='utf-8') as cast:
+        header = json.loads(cast.readline())
+        if header.get("version") != 2:
+            raise ValueError(f"Unsupported asciicast version: {header.get('version')}")
+        for line in cast:
+            if not line.strip():
+                continue
+            elapsed, kind, data = json.loads(line)
+            if kind == "o":
+                yield elapsed, data
+
+def play_asciicast(path: str, speed: float = 1.0, max_idle: Optional[float] = None, stream: Optional[IO[str]] = None):
+    if speed <= 0:
+        raise ValueError(f"speed must be positive, got {speed}")
+    stream = stream or sys.stdout
+    start = time.monotonic()
+    offset = 0.0
+    previous = 0.0
+
+    for elapsed, data in read_asciicast(path):
+        if max_idle is not None and elapsed - previous > max_idle:
+            offset += elapsed - previous - max_idle
+        previous = elapsed
+        delay = (elapsed - offset) / speed - (time.monotonic() - start)
+        if delay > 0:
+            time.sleep(delay)
+        stream.write(data)
+        stream.flush()
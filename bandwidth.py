@@ -0,0 +1,142 @@
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
+from colors import Colors
+
+@dataclass(frozen=True)
+class QualityLevel:
+    name: str
+    ring_samples: int
+    trails: bool
+    live_panel: bool
+
+QUALITY_LEVELS = (
+    QualityLevel("full", 48, True, True),
+    QualityLevel("no trails", 48, False, True),
+    QualityLevel("sparse rings", 24, False, True),
+    QualityLevel("minimal", 12, False, False),
+)
+
+WINDOW_SECONDS = 2.0
+MIN_WINDOW_FRAMES = 4
+SETTLE_SECONDS = 1.0
+DEGRADE_BELOW = 0.75
+UPGRADE_ABOVE = 2.0
+SATURATED = 0.5
+AUTO_HEADROOM = 0.8
+BACKOFF = 0.75
+PROBE_GROWTH = 1.15
+PROBE_USAGE = 0.9
+FRAME_BYTES_SMOOTHING = 0.2
+
+UNITS = {"": 1, "k": 1024, "m": 1024 * 1024}
+
+def parse_bandwidth(value: str) -> Optional[float]:
+    value = value.strip().lower()
+    if value == "auto":
+        return None
+    number = value.rstrip("kmb/s")
+    try:
+        rate = float(number) * UNITS[value[len(number):].rstrip("b/s")]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown bandwidth {value!r}, use bytes per second such as 9600, 4k or 1.5M, or auto")
+    if rate <= 0:
+        raise ValueError("Bandwidth must be positive")
+    return rate
+
+class BandwidthGovernor:
+    def __init__(self, target_fps: float, budget: Optional[float] = None):
+        self.target_fps = target_fps
+        self.budget = budget
+        self.level_index = 0
+        self.pace_fps = target_fps
+        self.samples: Deque[Tuple[float, int, float]] = deque()
+        self.window_bytes = 0
+        self.window_write_time = 0.0
+        self.frame_bytes: Optional[float] = None
+        self.link_bandwidth: Optional[float] = None
+        self.total_bytes = 0
+        self.total_write_time = 0.0
+        self.changed_at = self.probed_at = time.monotonic()
+        self.level_changes = 0
+
+    @property
+    def level(self) -> QualityLevel:
+        return QUALITY_LEVELS[self.level_index]
+
+    def record(self, total_bytes: int, total_write_time: float, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        size = total_bytes - self.total_bytes
+        write_time = total_write_time - self.total_write_time
+        self.total_bytes = total_bytes
+        self.total_write_time = total_write_time
+        if self.samples:
+            self.window_bytes += size
+            self.window_write_time += write_time
+            if self.frame_bytes is None:
+                self.frame_bytes = float(size)
+            else:
+                self.frame_bytes += (size - self.frame_bytes) * FRAME_BYTES_SMOOTHING
+        self.samples.append((now, size, write_time))
+        while len(self.samples) > MIN_WINDOW_FRAMES and now - self.samples[0][0] > WINDOW_SECONDS:
+            self.samples.popleft()
+            _, first_size, first_write_time = self.samples[0]
+            self.window_bytes -= first_size
+            self.window_write_time -= first_write_time
+        return self.adapt(now, size)
+
+    def window_span(self) -> float:
+        return self.samples[-1][0] - self.samples[0][0] if self.samples else 0.0
+
+    def used_bandwidth(self) -> float:
+        span = self.window_span()
+        return self.window_bytes / span if span > 0 else 0.0
+
+    def budget_bandwidth(self) -> Optional[float]:
+        if self.budget is not None:
+            return self.budget
+        return None if self.link_bandwidth is None else self.link_bandwidth * AUTO_HEADROOM
+
+    def measure_link(self, now: float):
+        span = self.window_span()
+        if span <= 0 or now - self.probed_at < WINDOW_SECONDS:
+            return
+        used = self.window_bytes / span
+        if self.window_write_time >= span * SATURATED:
+            self.link_bandwidth = used if self.link_bandwidth is None else max(used, self.link_bandwidth * BACKOFF)
+        elif self.link_bandwidth is not None and used >= self.link_bandwidth * AUTO_HEADROOM * PROBE_USAGE:
+            self.link_bandwidth *= PROBE_GROWTH
+        else:
+            return
+        self.probed_at = now
+
+    def adapt(self, now: float, size: int) -> bool:
+        previous = self.level_index
+        settled = now - self.changed_at >= SETTLE_SECONDS
+        if self.budget is None:
+            self.measure_link(now)
+        budget = self.budget_bandwidth()
+        affordable = math.inf if budget is None else budget / max(self.frame_bytes or 0.0, 1.0)
+        if settled:
+            if affordable < self.target_fps * DEGRADE_BELOW and self.level_index < len(QUALITY_LEVELS) - 1:
+                self.level_index += 1
+            elif affordable > self.target_fps * UPGRADE_ABOVE and self.level_index > 0:
+                self.level_index -= 1
+            if self.level_index != previous:
+                self.changed_at = now
+                self.level_changes += 1
+        self.pace_fps = self.target_fps if budget is None else min(self.target_fps, budget / max(size, 1))
+        return self.level_index != previous
+
+    def status(self) -> str:
+        budget = self.budget_bandwidth()
+        limit = "unlimited" if budget is None else f"{budget / 1024:.1f} KB/s"
+        return (f"quality {self.level_index + 1}/{len(QUALITY_LEVELS)} {self.level.name} | "
+                f"{self.used_bandwidth() / 1024:.1f} of {limit}")
+
+    def summary(self) -> str:
+        return (f"{Colors.INFO}Bandwidth: {self.used_bandwidth() / 1024:.1f} KB/s used at quality "
+                f"{self.level_index + 1}/{len(QUALITY_LEVELS)} ({self.level.name}), "
+                f"{self.level_changes} quality change(s){Colors.RESET}")
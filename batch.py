@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+from colors import COLOR_LEVELS, Colors, get_color_level, set_color_level
+from elements import get_element
+from renderer import RASTER_MODES, AtomRenderer
+
+_renderers: Dict[Tuple[int, int, str, str], AtomRenderer] = {}
+
+def parse_atomic_numbers(spec: str) -> List[int]:
+    numbers = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            numbers.extend(range(int(first), int(last) + 1))
+        else:
+            numbers.append(int(part))
+    for number in numbers:
+        if not 1 <= number <= 118:
+            raise ValueError(f"Atomic number must be between 1 and 118, got {number}")
+    return sorted(set(numbers))
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {number}")
+    return number
+
+def positive_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}")
+    if not 0 < number < float('inf'):
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return number
+
+def time_steps(start: float, stop: float, frames: int) -> List[float]:
+    if frames <= 1:
+        return [start]
+    step = (stop - start) / frames
+    return [start + i * step for i in range(frames)]
+
+def output_path(output_dir: str, atomic_number: int, animated: bool) -> str:
+    element = get_element(atomic_number)
+    mode = "animated" if animated else "static"
+    return os.path.join(output_dir, f"{atomic_number:03d}_{element.symbol}_{mode}.ans")
+
+def render_element(atomic_number: int, animated: bool, steps: List[float], output_dir: str,
+                   width: int = 100, height: int = 40, raster: str = "cell",
+                   color_level: Optional[str] = None) -> Tuple[int, bool, int, int]:
+    if color_level is not None and color_level != get_color_level():
+        set_color_level(color_level)
+    key = (width, height, raster, get_color_level())
+    renderer = _renderers.get(key)
+    if renderer is None:
+        renderer = AtomRenderer(width, height, raster=raster)
+        _renderers[key] = renderer
+
+    element = get_element(atomic_number)
+    frames = 0
+    written = 0
+    with open(output_path(output_dir, atomic_number, animated), 'wb') as output:
+        for time_step in (steps if animated else steps[:1]):
+            lines = renderer.build_frame_buffer(element, animated=animated, time_step=time_step)
+            written += output.write(("\033[H" + "\n".join(lines) + "\n\033[J").encode('utf-8'))
+            frames += 1
+    return atomic_number, animated, frames, written
+
+def render_batch(atomic_numbers: Iterable[int], modes: Iterable[bool], steps: List[float], output_dir: str,
+                 workers: Optional[int] = None, width: int = 100, height: int = 40, progress: bool = True,
+                 raster: str = "cell", color_level: Optional[str] = None) -> Tuple[int, float]:
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(number, animated) for number in atomic_numbers for animated in modes]
+    total_frames = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_element, number, animated, steps, output_dir, width, height, raster,
+                               color_level or get_color_level())
+                   for number, animated in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            number, animated, frames, _ = future.result()
+            total_frames += frames
+            if progress:
+                elapsed = time.perf_counter() - started
+                rate = total_frames / elapsed if elapsed > 0 else 0.0
+                mode = "animated" if animated else "static"
+                print(f"\r{Colors.INFO}[{done:4d}/{len(jobs)}] {get_element(number).symbol:<3} {mode:<8} "
+                      f"{total_frames} frames, {rate:.0f} frames/s{Colors.RESET}", end="", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    if progress:
+        print(file=sys.stderr)
+    return total_frames, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Render atom frames for many elements without a terminal.")
+    parser.add_argument("elements", nargs="?", default="1-118", help="atomic numbers, e.g. 1-10,26,79 (default: 1-118)")
+    parser.add_argument("-o", "--output", default="frames", help="output directory (default: frames)")
+    parser.add_argument("--mode", choices=["animated", "static", "both"], default="both")
+    parser.add_argument("--frames", type=positive_int, default=40, help="animated frames per element (default: 40)")
+    parser.add_argument("--start", type=float, default=0.0, help="first time step (default: 0)")
+    parser.add_argument("--stop", type=float, default=3.2, help="time step the range ends before (default: 3.2)")
+    parser.add_argument("--workers", type=positive_int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--width", type=positive_int, default=100)
+    parser.add_argument("--height", type=positive_int, default=40)
+    parser.add_argument("--raster", choices=RASTER_MODES, default="cell")
+    parser.add_argument("--colors", choices=("auto",) + COLOR_LEVELS, default="auto",
+                        help="color support to render for (default: auto, from NO_COLOR, TERM and COLORTERM)")
+    args = parser.parse_args()
+    if args.colors != "auto":
+        set_color_level(args.colors)
+
+    try:
+        atomic_numbers = parse_atomic_numbers(args.elements)
+    except ValueError as e:
+        print(f"{Colors.ERROR}{e}{Colors.RESET}")
+        sys.exit(1)
+
+    modes = {"animated": [True], "static": [False], "both": [False, True]}[args.mode]
+    steps = time_steps(args.start, args.stop, args.frames)
+    frames, elapsed = render_batch(atomic_numbers, modes, steps, args.output, args.workers, args.width, args.height,
+                                   raster=args.raster)
+    print(f"{Colors.SUCCESS}Rendered {frames} frames for {len(atomic_numbers)} elements in {elapsed:.2f}s "
+          f"({frames / elapsed:.0f} frames/s) to {args.output}/{Colors.RESET}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+from colors import Colors
+from elements import ELEMENTS, Element, get_electron_shells, get_element
+from geometry import loop_period
+from pixels import DEFAULT_PIXEL_SIZE, PIXEL_PROTOCOLS, PixelRenderer, decode_kitty, decode_sixel
+from renderer import INFO_PANEL_ROWS, AtomRenderer
+from vectorized import numpy_available
+
+DEFAULT_ELEMENTS = "H,Fe,Au,Og"
+DEFAULT_SIZES = "60x24,100x40,160x50"
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+STARTUP_MODES = ("static", "animated")
+
+@dataclass
+class BenchmarkCase:
+    path: str
+    run: Callable[[], None]
+    frame_bytes: Optional[Callable[[], int]] = None
+    writes: Optional[Callable[[], int]] = None
+
+class CountingFile(io.FileIO):
+    def __init__(self, path: str):
+        super().__init__(path, 'w')
+        self.writes = 0
+
+    def write(self, data) -> int:
+        self.writes += 1
+        return super().write(data)
+
+def open_sink() -> TextIO:
+    return io.TextIOWrapper(io.BufferedWriter(CountingFile(os.devnull)), encoding='utf-8', line_buffering=True)
+
+def parse_elements(spec: str) -> List[Element]:
+    symbols = {element.symbol.lower(): number for number, element in ELEMENTS.items()}
+    elements = []
+    for part in spec.split(','):
+        part = part.strip()
+        if part.isdigit():
+            elements.append(get_element(int(part)))
+        elif part.lower() in symbols:
+            elements.append(get_element(symbols[part.lower()]))
+        else:
+            raise ValueError(f"Unknown element: {part}")
+    return elements
+
+def parse_sizes(spec: str) -> List[Tuple[int, int]]:
+    sizes = []
+    for part in spec.split(','):
+        width, height = part.lower().split('x')
+        sizes.append((int(width), int(height)))
+    return sizes
+
+def time_steps():
+    step = 0
+    while True:
+        yield step * 0.08
+        step += 1
+
+def frame_output(buffer: List[str]) -> str:
+    return "\033[H" + "\n".join(buffer) + "\n\033[J"
+
+def print_frame_buffer(buffer: List[str]):
+    print("\033[H", end="")
+    print("\n".join(buffer))
+    print("\033[J", end="")
+
+def build_cases(renderer: AtomRenderer, element: Element, sink: TextIO) -> List[BenchmarkCase]:
+    steps = time_steps()
+    grid = renderer.create_grid()
+    static_buffer = renderer.build_frame_buffer(element, animated=False)
+    animated_buffer = renderer.build_frame_buffer(element, animated=True, time_step=1.0)
+
+    def print_animated():
+        with contextlib.redirect_stdout(sink):
+            print_frame_buffer(animated_buffer)
+
+    def render_static():
+        with contextlib.redirect_stdout(sink):
+            renderer.render_frame_buffer(static_buffer)
+
+    def render_animated():
+        with contextlib.redirect_stdout(sink):
+            renderer.render_frame_buffer(animated_buffer)
+
+    renderer.diff_renderer.stream = sink
+    renderer.diff_renderer.reset()
+    diff_frames = [0, 0]
+
+    def diff_render():
+        renderer.draw_animated_frame(element, next(steps))
+        diff_frames[0] += 1
+        diff_frames[1] += renderer.diff_renderer.bytes_last_frame
+
+    braille = AtomRenderer(renderer.width, renderer.height, raster="braille", frame_cache_bytes=0)
+    braille.diff_renderer.stream = sink
+    braille_frames = [0, 0]
+
+    def diff_render_braille():
+        braille.draw_animated_frame(element, next(steps))
+        braille_frames[0] += 1
+        braille_frames[1] += braille.diff_renderer.bytes_last_frame
+
+    cycled = AtomRenderer(renderer.width, renderer.height)
+    cycled.diff_renderer.stream = sink
+    cycled.scheduler.set_period(loop_period(get_electron_shells(element.atomic_number)))
+    cycle_frames = [0, 0]
+    for frame in range(cycled.scheduler.loop_frames(cycled.scheduler.period) + 1):
+        cycled.draw_animated_frame(element, cycled.scheduler.frame_time_step(frame))
+    cycled_start = cycled.diff_renderer.total_bytes
+
+    def diff_render_cycle():
+        cycle_frames[0] += 1
+        cycled.draw_animated_frame(element, cycled.scheduler.frame_time_step(cycle_frames[0]))
+        cycle_frames[1] = cycled.diff_renderer.total_bytes - cycled_start
+
+    cases = [
+        BenchmarkCase("create_grid", renderer.create_grid),
+        BenchmarkCase("draw_nucleus", lambda: renderer.draw_nucleus(grid, element, next(steps))),
+        BenchmarkCase("draw_electron_shells_animated", lambda: renderer.draw_electron_shells_animated(grid, element, next(steps))),
+        BenchmarkCase("draw_electron_shells_static", lambda: renderer.draw_electron_shells_static(grid, element)),
+        BenchmarkCase("build_frame_buffer_static", lambda: renderer.build_frame_buffer(element, animated=False)),
+        BenchmarkCase("build_frame_buffer_animated", lambda: renderer.build_frame_buffer(element, animated=True, time_step=next(steps))),
+        BenchmarkCase("print_frame_buffer_animated", print_animated,
+                      lambda: len(frame_output(animated_buffer).encode('utf-8')), lambda: sink.buffer.raw.writes),
+        BenchmarkCase("render_frame_buffer_static", render_static,
+                      lambda: len(frame_output(static_buffer).encode('utf-8')), lambda: renderer.diff_renderer.frame_writer().writes),
+        BenchmarkCase("render_frame_buffer_animated", render_animated,
+                      lambda: len(frame_output(animated_buffer).encode('utf-8')), lambda: renderer.diff_renderer.frame_writer().writes),
+        BenchmarkCase("diff_render_animated", diff_render,
+                      lambda: diff_frames[1] // max(diff_frames[0], 1), lambda: renderer.diff_renderer.frame_writer().writes),
+        BenchmarkCase("build_frame_buffer_braille", lambda: braille.build_frame_buffer(element, animated=True, time_step=next(steps))),
+        BenchmarkCase("diff_render_braille", diff_render_braille,
+                      lambda: braille_frames[1] // max(braille_frames[0], 1),
+                      lambda: braille.diff_renderer.frame_writer().writes),
+        BenchmarkCase("diff_render_cycle_cached", diff_render_cycle,
+                      lambda: cycle_frames[1] // max(cycle_frames[0], 1), lambda: cycled.diff_renderer.frame_writer().writes),
+    ]
+    if numpy_available():
+        vectorized = AtomRenderer(renderer.width, renderer.height, backend="numpy")
+        cases.append(BenchmarkCase("draw_electron_shells_animated_numpy",
+                                   lambda: vectorized.draw_electron_shells_animated(grid, element, next(steps))))
+        cases.append(BenchmarkCase("build_frame_buffer_animated_numpy",
+                                   lambda: vectorized.build_frame_buffer(element, animated=True, time_step=next(steps))))
+    return cases
+
+def build_pixel_case(pixels: PixelRenderer, element: Element) -> BenchmarkCase:
+    steps = time_steps()
+    frame_bytes = [0, 0]
+
+    def encode():
+        frame_bytes[0] += 1
+        frame_bytes[1] += len(pixels.encode_frame(element, next(steps)))
+
+    return BenchmarkCase(f"encode_{pixels.protocol}_animated", encode, lambda: frame_bytes[1] // max(frame_bytes[0], 1))
+
+def pixel_round_trip(pixels: PixelRenderer, element: Element, time_step: float = 1.0) -> bool:
+    frame = pixels.scene.draw(element, time_step)
+    image = pixels.encoder.encode(frame)
+    if pixels.protocol == "sixel":
+        width, height, palette, decoded = decode_sixel(image)
+        return decoded == frame.pixels and len(palette) == len(pixels.scene.palette)
+    width, height, rgb = decode_kitty(image)
+    return rgb == pixels.scene.rgb(frame.pixels)
+
+def measure(run: Callable[[], None], min_time: float, repeats: int) -> float:
+    run()
+    iterations = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9 or iterations >= 1 << 20:
+            break
+        iterations *= 2
+
+    best = elapsed / iterations
+    for _ in range(repeats - 1):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            run()
+        best = min(best, (time.perf_counter_ns() - start) / iterations)
+    return best
+
+def measure_startup(element: Element, width: int, height: int, mode: str, repeats: int) -> float:
+    command = [sys.executable, MAIN_SCRIPT, "--element", str(element.atomic_number), "--mode", mode,
+               "--frames", "1", "--output", os.devnull]
+    env = dict(os.environ, COLUMNS=str(width), LINES=str(height + INFO_PANEL_ROWS))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter_ns() - start)
+    return best
+
+def writes_per_frame(case: BenchmarkCase, frames: int = 32) -> float:
+    before = case.writes()
+    for _ in range(frames):
+        case.run()
+    return (case.writes() - before) / frames
+
+def run_pixel_benchmarks(elements: List[Element], pixel_size: Tuple[int, int], min_time: float, repeats: int,
+                         verbose: bool) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    renderer = AtomRenderer(100, 40, frame_cache_bytes=0)
+    width, height = pixel_size
+    for protocol in PIXEL_PROTOCOLS:
+        pixels = PixelRenderer(renderer, protocol, width, height)
+        for element in elements:
+            round_trip = pixel_round_trip(pixels, element)
+            case = build_pixel_case(pixels, element)
+            ns_per_op = measure(case.run, min_time, repeats)
+            key = f"{case.path}/{element.symbol}/{width}x{height}"
+            results[key] = {
+                "ns_per_op": round(ns_per_op, 1),
+                "frames_per_s": round(1e9 / ns_per_op, 1) if ns_per_op > 0 else 0.0,
+                "ns_per_pixel": round(ns_per_op / (width * height), 3),
+                "bytes_per_frame": case.frame_bytes(),
+                "round_trip": round_trip,
+            }
+            if verbose:
+                check = "decodes OK" if round_trip else f"{Colors.ERROR}DECODE MISMATCH{Colors.RESET}"
+                print(f"{key:<48} {ns_per_op / 1000:>10.1f} us {results[key]['frames_per_s']:>10.1f}/s "
+                      f"{results[key]['ns_per_pixel']:>8.2f} ns/px {results[key]['bytes_per_frame']:>7d} B/frame {check}")
+    return results
+
+def run_benchmarks(elements: List[Element], sizes: List[Tuple[int, int]], min_time: float = 0.05,
+                   repeats: int = 5, verbose: bool = True, startup: bool = True,
+                   pixel_size: Optional[Tuple[int, int]] = DEFAULT_PIXEL_SIZE) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with open_sink() as sink:
+        for width, height in sizes:
+            renderer = AtomRenderer(width, height, frame_cache_bytes=0)
+            for element in elements:
+                for case in build_cases(renderer, element, sink):
+                    ns_per_op = measure(case.run, min_time, repeats)
+                    key = f"{case.path}/{element.symbol}/{width}x{height}"
+                    result = {
+                        "ns_per_op": round(ns_per_op, 1),
+                        "frames_per_s": round(1e9 / ns_per_op, 1) if ns_per_op > 0 else 0.0,
+                        "ns_per_cell": round(ns_per_op / (width * height), 3),
+                    }
+                    if case.frame_bytes is not None:
+                        result["bytes_per_frame"] = case.frame_bytes()
+                    if case.writes is not None:
+                        result["writes_per_frame"] = round(writes_per_frame(case), 2)
+                    results[key] = result
+                    if verbose:
+                        extra = f" {result['bytes_per_frame']:>7d} B/frame" if "bytes_per_frame" in result else ""
+                        if "writes_per_frame" in result:
+                            extra += f" {result['writes_per_frame']:>5.2f} writes/frame"
+                        print(f"{key:<48} {ns_per_op / 1000:>10.1f} us {result['frames_per_s']:>10.1f}/s "
+                              f"{result['ns_per_cell']:>8.2f} ns/cell{extra}")
+                if not startup:
+                    continue
+                for mode in STARTUP_MODES:
+                    ns_per_op = measure_startup(element, width, height, mode, repeats)
+                    key = f"startup_first_frame_{mode}/{element.symbol}/{width}x{height}"
+                    results[key] = {"ns_per_op": round(ns_per_op, 1)}
+                    if verbose:
+                        print(f"{key:<48} {ns_per_op / 1e6:>10.1f} ms from interpreter start")
+    if pixel_size is not None:
+        results.update(run_pixel_benchmarks(elements, pixel_size, min_time, repeats, verbose))
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[Tuple[str, float]]:
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if not previous or not previous.get("ns_per_op"):
+            continue
+        ratio = result["ns_per_op"] / previous["ns_per_op"]
+        if ratio > 1 + threshold:
+            regressions.append((key, ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the atom render hot path.")
+    parser.add_argument("--elements", default=DEFAULT_ELEMENTS, help=f"symbols or numbers (default: {DEFAULT_ELEMENTS})")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"grid sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("-o", "--output", default="bench_output.json", help="results file (default: bench_output.json)")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--save-baseline", metavar="FILE", help="write the results as a new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before failing (default: 0.15)")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timing sample (default: 0.05)")
+    parser.add_argument("--repeats", type=int, default=5, help="timing samples per case (default: 5)")
+    parser.add_argument("--no-startup", action="store_true", help="skip the startup-to-first-frame runs of main.py")
+    parser.add_argument("--pixel-size", default="x".join(map(str, DEFAULT_PIXEL_SIZE)),
+                        help="image size for the sixel and kitty encoders, or none to skip them "
+                             f"(default: {'x'.join(map(str, DEFAULT_PIXEL_SIZE))})")
+    args = parser.parse_args()
+
+    try:
+        elements = parse_elements(args.elements)
+        sizes = parse_sizes(args.sizes)
+        pixel_size = None if args.pixel_size == "none" else parse_sizes(args.pixel_size)[0]
+    except ValueError as e:
+        print(f"{Colors.ERROR}{e}{Colors.RESET}")
+        sys.exit(2)
+
+    results = run_benchmarks(elements, sizes, args.min_time, args.repeats, startup=not args.no_startup,
+                             pixel_size=pixel_size)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2)
+    print(f"{Colors.INFO}Results written to {args.output}{Colors.RESET}")
+    if any(result.get("round_trip") is False for result in results.values()):
+        print(f"{Colors.ERROR}A pixel encoder's output did not decode back to the frame it encoded{Colors.RESET}")
+        sys.exit(1)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+        print(f"{Colors.INFO}Baseline saved to {args.save_baseline}{Colors.RESET}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as saved:
+            baseline = json.load(saved)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            for key, ratio in regressions:
+                print(f"{Colors.ERROR}REGRESSION {key}: {ratio:.2f}x baseline{Colors.RESET}")
+            sys.exit(1)
+        print(f"{Colors.SUCCESS}No regressions beyond {args.threshold:.0%} against {args.baseline}{Colors.RESET}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import math
+import sys
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from cellbuffer import BLANK, PLAIN, CellBuffer
+from geometry import ANGLE_SCALE, ANGLE_STEPS, shell_speed
+
+BRAILLE_BASE = 0x2800
+DOT_BITS = ((0x01, 0x08), (0x02, 0x10), (0x04, 0x20), (0x40, 0x80))
+
+Dot = Tuple[int, int]
+
+_LOW_BYTES = bytes([BLANK]) + bytes(range(1, 256))
+_HIGH_BYTES = bytes([0] + [BRAILLE_BASE >> 8] * 255)
+_LOW_OFFSET, _HIGH_OFFSET = (0, 1) if sys.byteorder == 'little' else (3, 2)
+
+class BrailleCanvas:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.dot_width = width * 2
+        self.dot_height = height * 4
+        self.dots = bytearray(width * height)
+        self.styles = bytearray(width * height)
+
+    def copy(self) -> 'BrailleCanvas':
+        clone = BrailleCanvas.__new__(BrailleCanvas)
+        clone.width = self.width
+        clone.height = self.height
+        clone.dot_width = self.dot_width
+        clone.dot_height = self.dot_height
+        clone.dots = bytearray(self.dots)
+        clone.styles = bytearray(self.styles)
+        return clone
+
+    def dot(self, px: int, py: int) -> Optional[Dot]:
+        if 0 <= px < self.dot_width and 0 <= py < self.dot_height:
+            return (py >> 2) * self.width + (px >> 1), DOT_BITS[py & 3][px & 1]
+        return None
+
+    def plot(self, px: int, py: int, style: int):
+        dot = self.dot(px, py)
+        if dot is not None:
+            index, bit = dot
+            self.dots[index] |= bit
+            self.styles[index] = style
+
+    def to_cells(self) -> CellBuffer:
+        size = self.width * self.height
+        encoded = bytearray(size * 4)
+        encoded[_LOW_OFFSET::4] = self.dots.translate(_LOW_BYTES)
+        encoded[_HIGH_OFFSET::4] = self.dots.translate(_HIGH_BYTES)
+        grid = CellBuffer.__new__(CellBuffer)
+        grid.width = self.width
+        grid.height = self.height
+        grid.glyphs = array('I')
+        grid.glyphs.frombytes(encoded)
+        grid.styles = array('B', self.styles)
+        return grid
+
+class BrailleOrbit:
+    def __init__(self, width: int, height: int, radius: int):
+        self.width = width
+        self.height = height
+        self.radius = radius
+        canvas = BrailleCanvas(width, height)
+        origin_x = (width // 2 + 0.5) * 2
+        origin_y = (height // 2 + 0.5) * 4
+        radius_x = radius * 2
+        radius_y = radius * 0.85 * 4
+
+        ring = {}
+        samples = max(64, int(8 * math.pi * radius))
+        half = samples // 2
+        for i in range(samples):
+            angle = i * math.pi / half
+            dot = canvas.dot(int(origin_x + radius_x * math.cos(angle)), int(origin_y + radius_y * math.sin(angle)))
+            if dot is not None and dot not in ring:
+                ring[dot] = angle % (math.pi / 4) < 0.2
+        self.ring: List[Tuple[int, int, bool]] = [(index, bit, major) for (index, bit), major in ring.items()]
+
+        self.angle_dots: List[Optional[Dot]] = []
+        self.angle_blobs: List[Tuple[Dot, ...]] = []
+        for step in range(ANGLE_STEPS + 1):
+            angle = step / ANGLE_SCALE
+            px = int(origin_x + radius_x * math.cos(angle))
+            py = int(origin_y + radius_y * math.sin(angle))
+            self.angle_dots.append(canvas.dot(px, py))
+            blob = {}
+            for dot in (canvas.dot(px - 1, py - 1), canvas.dot(px, py - 1), canvas.dot(px - 1, py), canvas.dot(px, py)):
+                if dot is not None:
+                    blob[dot[0]] = blob.get(dot[0], 0) | dot[1]
+            self.angle_blobs.append(tuple(blob.items()))
+
+    def dot_at(self, angle: float) -> Optional[Dot]:
+        return self.angle_dots[int(angle * ANGLE_SCALE % ANGLE_STEPS + 0.5)]
+
+    def blob_at(self, angle: float) -> Tuple[Dot, ...]:
+        return self.angle_blobs[int(angle * ANGLE_SCALE % ANGLE_STEPS + 0.5)]
+
+MAX_CACHED_ORBITS = 128
+
+_orbit_cache: 'OrderedDict[Tuple[int, int, int], BrailleOrbit]' = OrderedDict()
+
+def get_braille_orbit(width: int, height: int, radius: int) -> BrailleOrbit:
+    key = (width, height, radius)
+    orbit = _orbit_cache.get(key)
+    if orbit is None:
+        orbit = BrailleOrbit(width, height, radius)
+        _orbit_cache[key] = orbit
+        if len(_orbit_cache) > MAX_CACHED_ORBITS:
+            _orbit_cache.popitem(last=False)
+    else:
+        _orbit_cache.move_to_end(key)
+    return orbit
+
+class BrailleRasterizer:
+    def __init__(self, renderer):
+        self.renderer = renderer
+
+    def orbit(self, shell_idx: int, shell_count: int) -> BrailleOrbit:
+        renderer = self.renderer
+        return get_braille_orbit(renderer.width, renderer.height, renderer.shell_radius(shell_idx, shell_count))
+
+    def create_canvas(self) -> BrailleCanvas:
+        return BrailleCanvas(self.renderer.width, self.renderer.height)
+
+    def draw_orbit_rings(self, canvas: BrailleCanvas, shells: List[int], highlight_major: bool = False):
+        dots, styles = canvas.dots, canvas.styles
+        for shell_idx in range(len(shells)):
+            minor_style = self.renderer.shell_style(shell_idx)
+            major_style = self.renderer.shell_style(shell_idx, bold=True) if highlight_major else minor_style
+            for index, bit, major in self.orbit(shell_idx, len(shells)).ring:
+                if styles[index] == PLAIN or major:
+                    styles[index] = major_style if major else minor_style
+                dots[index] |= bit
+
+    def draw_electrons_static(self, canvas: BrailleCanvas, shells: List[int]):
+        dots, styles = canvas.dots, canvas.styles
+        electron_style = self.renderer.style_electron
+        for shell_idx, electron_count in enumerate(shells):
+            blob_at = self.orbit(shell_idx, len(shells)).blob_at
+            for e in range(electron_count):
+                for index, bit in blob_at((2 * math.pi * e) / electron_count):
+                    dots[index] |= bit
+                    styles[index] = electron_style
+
+    def draw_electrons_animated(self, canvas: BrailleCanvas, shells: List[int], time_step: float):
+        renderer = self.renderer
+        dots, styles = canvas.dots, canvas.styles
+        electron_style = renderer.style_electron
+        trail_flags = renderer.trail_flags
+        over_rings = renderer.trail_over_rings
+
+        orbits = []
+        for shell_idx, electron_count in enumerate(shells):
+            rotation = time_step * shell_speed(shell_idx) * ANGLE_SCALE
+            spacing = ANGLE_STEPS / electron_count
+            orbits.append((self.orbit(shell_idx, len(shells)), [spacing * e + rotation for e in range(electron_count)]))
+
+        for offset, trail_style in renderer.trail:
+            trail_offset = offset * ANGLE_SCALE
+            for orbit, steps in orbits:
+                angle_dots = orbit.angle_dots
+                for step in steps:
+                    trail = angle_dots[int((step - trail_offset) % ANGLE_STEPS + 0.5)]
+                    if trail is not None:
+                        index, bit = trail
+                        if not dots[index] or (over_rings and not trail_flags[styles[index]]):
+                            styles[index] = trail_style
+                        dots[index] |= bit
+
+        for orbit, steps in orbits:
+            angle_blobs = orbit.angle_blobs
+            for step in steps:
+                for index, mask in angle_blobs[int(step % ANGLE_STEPS + 0.5)]:
+                    dots[index] |= mask
+                    styles[index] = electron_style
+
+    def background(self, shells: List[int], animated: bool) -> BrailleCanvas:
+        canvas = self.create_canvas()
+        self.draw_orbit_rings(canvas, shells, highlight_major=not animated)
+        if not animated:
+            self.draw_electrons_static(canvas, shells)
+        return canvas
+
+    def draw_frame(self, background: BrailleCanvas, shells: List[int], time_step: float) -> CellBuffer:
+        canvas = background.copy()
+        self.draw_electrons_animated(canvas, shells, time_step)
+        return canvas.to_cells()
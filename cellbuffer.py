@@ -0,0 +1,179 @@
+import codecs
+import re
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+MAX_STYLES = 256
+
+class InternTable:
+    def __init__(self, default: str, limit: Optional[int] = None):
+        self.values: List[str] = [default]
+        self._ids: Dict[str, int] = {default: 0}
+        self.limit = limit
+
+    def intern(self, value: str) -> int:
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            if self.limit is not None and value_id >= self.limit:
+                raise OverflowError(f"Too many distinct styles: a cell stores at most {self.limit} style ids")
+            self.values.append(value)
+            self._ids[value] = value_id
+        return value_id
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+STYLES = InternTable('', MAX_STYLES)
+
+BLANK = ord(' ')
+PLAIN = 0
+
+_decode_glyphs = codecs.utf_32_le_decode if sys.byteorder == 'little' else codecs.utf_32_be_decode
+
+STYLE_RUN = re.compile(rb'([^\x00])(?:\x00*\1)*')
+SGR = re.compile(r'\033\[([0-9;]*)m')
+
+StyleState = Tuple[str, bool, bool]
+PLAIN_STATE: StyleState = ("", False, False)
+
+def parse_style(value: str) -> StyleState:
+    foreground, bold, dim = PLAIN_STATE
+    for params in SGR.findall(value):
+        codes = params.split(';')
+        i = 0
+        while i < len(codes):
+            code = codes[i]
+            if code in ('', '0'):
+                foreground, bold, dim = PLAIN_STATE
+            elif code == '1':
+                bold = True
+            elif code == '2':
+                dim = True
+            elif code == '22':
+                bold = dim = False
+            elif code == '39':
+                foreground = ""
+            elif code == '38':
+                length = 3 if codes[i + 1:i + 2] == ['5'] else 5
+                foreground = ';'.join(codes[i:i + length])
+                i += length - 1
+            elif code.isdigit() and (30 <= int(code) <= 37 or 90 <= int(code) <= 97):
+                foreground = code
+            i += 1
+    return foreground, bold, dim
+
+def sgr_transition(previous: StyleState, state: StyleState) -> str:
+    if previous == state:
+        return ""
+    if state == PLAIN_STATE:
+        return '\033[m'
+    foreground, bold, dim = state
+    previous_foreground, previous_bold, previous_dim = previous
+    codes = []
+    if (previous_bold and not bold) or (previous_dim and not dim):
+        codes.append('22')
+        previous_bold = previous_dim = False
+    if foreground != previous_foreground:
+        codes.append(foreground or '39')
+    if bold and not previous_bold:
+        codes.append('1')
+    if dim and not previous_dim:
+        codes.append('2')
+    reset = ['0'] + [code for code, on in ((foreground, foreground), ('1', bold), ('2', dim)) if on]
+    if len(';'.join(reset)) < len(';'.join(codes)):
+        codes = reset
+    return f"\033[{';'.join(codes)}m"
+
+_style_states: List[StyleState] = []
+_transitions: Dict[int, str] = {}
+
+def style_transition(previous: int, style: int) -> str:
+    key = previous << 8 | style
+    transition = _transitions.get(key)
+    if transition is None:
+        while len(_style_states) < len(STYLES):
+            _style_states.append(parse_style(STYLES.values[len(_style_states)]))
+        transition = _transitions[key] = sgr_transition(_style_states[previous], _style_states[style])
+    return transition
+
+class CellBuffer:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.glyphs = array('I', [BLANK]) * (width * height)
+        self.styles = array('B', [PLAIN]) * (width * height)
+
+    def clear(self):
+        size = self.width * self.height
+        self.glyphs[:] = array('I', [BLANK]) * size
+        self.styles[:] = array('B', [PLAIN]) * size
+
+    def copy(self) -> 'CellBuffer':
+        clone = CellBuffer.__new__(CellBuffer)
+        clone.width = self.width
+        clone.height = self.height
+        clone.glyphs = array('I', self.glyphs)
+        clone.styles = array('B', self.styles)
+        return clone
+
+    def copy_from(self, other: 'CellBuffer'):
+        self.glyphs[:] = other.glyphs
+        self.styles[:] = other.styles
+
+    def put(self, x: int, y: int, glyph: int, style: int):
+        index = y * self.width + x
+        self.glyphs[index] = glyph
+        self.styles[index] = style
+
+    def put_if_blank(self, x: int, y: int, glyph: int, style: int):
+        index = y * self.width + x
+        if self.glyphs[index] == BLANK:
+            self.glyphs[index] = glyph
+            self.styles[index] = style
+
+    def is_blank(self, x: int, y: int) -> bool:
+        return self.glyphs[y * self.width + x] == BLANK
+
+    def encode_span(self, start: int, end: int) -> str:
+        text = _decode_glyphs(self.glyphs[start:end].tobytes())[0]
+        styles = self.styles
+        parts = []
+        position = 0
+        current = PLAIN
+        for run in STYLE_RUN.finditer(styles[start:end].tobytes()):
+            run_start, run_end = run.span()
+            if position < run_start:
+                gap = text[position:run_start]
+                if current != PLAIN and gap.strip(' '):
+                    parts.append(style_transition(current, PLAIN))
+                    current = PLAIN
+                parts.append(gap)
+            style = styles[start + run_start]
+            parts.append(style_transition(current, style))
+            parts.append(text[run_start:run_end])
+            current = style
+            position = run_end
+        if not parts:
+            return text
+        parts.append(style_transition(current, PLAIN))
+        parts.append(text[position:])
+        return ''.join(parts)
+
+    def encode_row(self, y: int) -> str:
+        start = y * self.width
+        return self.encode_span(start, start + self.width)
+
+    def render_lines(self) -> List[str]:
+        return [self.encode_row(y) for y in range(self.height)]
+
+@dataclass
+class Frame:
+    header: List[str]
+    grid: CellBuffer
+    footer: List[str]
+
+    def lines(self) -> List[str]:
+        return self.header + self.grid.render_lines() + self.footer
@@ -1,5 +1,11 @@
+import os
+from typing import Dict, List, Tuple
+
+COLOR_LEVELS = ("none", "16", "256", "truecolor")
+MONOCHROME_TERMINALS = ("dumb", "vt52", "vt100", "vt102", "vt220", "vt320")
+
 class Colors:
-    RESET = '\033[0m'
+    RESET = '\033[m'
     BOLD = '\033[1m'
     DIM = '\033[2m'
     
@@ -38,6 +44,111 @@ class Colors:
     ERROR = BRIGHT_RED
     SUCCESS = BRIGHT_GREEN
 
+FALLBACK_16 = {
+    "PROTON": '\033[33m',
+    "NEUTRON": '\033[37m',
+    "SHELL_5": '\033[35m',
+    "SHELL_6": '\033[95m',
+    "SHELL_7": '\033[96m',
+}
+
+ANSI_16 = [
+    (30, (0, 0, 0)), (31, (205, 0, 0)), (32, (0, 205, 0)), (33, (205, 205, 0)),
+    (34, (0, 0, 238)), (35, (205, 0, 205)), (36, (0, 205, 205)), (37, (229, 229, 229)),
+    (90, (127, 127, 127)), (91, (255, 0, 0)), (92, (0, 255, 0)), (93, (255, 255, 0)),
+    (94, (92, 92, 255)), (95, (255, 0, 255)), (96, (0, 255, 255)), (97, (255, 255, 255)),
+]
+CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+TRAIL_STEPS = {"256": 4, "truecolor": 6}
+TRAIL_NEAR = (200, 230, 255)
+TRAIL_FAR = (40, 60, 100)
+
+_DEFAULTS: Dict[str, str] = {name: value for name, value in vars(Colors).items() if name.isupper()}
+_color_level = "256"
+
+def detect_color_level(environ=None) -> str:
+    environ = os.environ if environ is None else environ
+    if environ.get("NO_COLOR"):
+        return "none"
+    term = environ.get("TERM", "").lower()
+    if environ.get("COLORTERM", "").lower() in ("truecolor", "24bit") or term.endswith("-direct"):
+        return "truecolor"
+    if not term:
+        if os.name == "nt":
+            return "truecolor" if "WT_SESSION" in environ else "16"
+        return "none"
+    if term.startswith(MONOCHROME_TERMINALS):
+        return "none"
+    if "256" in term:
+        return "256"
+    return "16"
+
+def set_color_level(level: str):
+    global _color_level
+    if level not in COLOR_LEVELS:
+        raise ValueError(f"Unknown color level: {level}")
+    for name, value in _DEFAULTS.items():
+        if level == "none":
+            value = ""
+        elif level == "16":
+            value = FALLBACK_16.get(name, value)
+        setattr(Colors, name, value)
+    _color_level = level
+
+def get_color_level() -> str:
+    return _color_level
+
+def xterm_rgb(index: int) -> Tuple[int, int, int]:
+    if index >= 232:
+        gray = 8 + (index - 232) * 10
+        return gray, gray, gray
+    index -= 16
+    return CUBE_LEVELS[index // 36], CUBE_LEVELS[index // 6 % 6], CUBE_LEVELS[index % 6]
+
+def rgb_to_256(r: int, g: int, b: int) -> int:
+    cube = 16 + sum(min(range(6), key=lambda i: abs(CUBE_LEVELS[i] - value)) * weight
+                    for value, weight in ((r, 36), (g, 6), (b, 1)))
+    gray = 232 + max(0, min(23, round(((r + g + b) / 3 - 8) / 10)))
+    return min((cube, gray), key=lambda index: sum((a - c) ** 2 for a, c in zip(xterm_rgb(index), (r, g, b))))
+
+def color_rgb(r: int, g: int, b: int) -> str:
+    if _color_level == "none":
+        return ""
+    if _color_level == "16":
+        code = min(ANSI_16, key=lambda entry: sum((a - c) ** 2 for a, c in zip(entry[1], (r, g, b))))[0]
+        return f'\033[{code}m'
+    index = rgb_to_256(r, g, b)
+    if _color_level == "256" or xterm_rgb(index) == (r, g, b):
+        return f'\033[38;5;{index}m'
+    return f'\033[38;2;{r};{g};{b}m'
+
+def default_rgb(name: str) -> Tuple[int, int, int]:
+    codes = [int(code) for code in _DEFAULTS[name][2:-1].split(';')]
+    if codes[:2] == [38, 5]:
+        return ANSI_16[codes[2]][1] if codes[2] < 16 else xterm_rgb(codes[2])
+    if codes[:2] == [38, 2]:
+        return codes[2], codes[3], codes[4]
+    return dict(ANSI_16)[codes[0]]
+
+def scale_rgb(rgb: Tuple[int, int, int], factor: float) -> Tuple[int, int, int]:
+    return tuple(round(channel * factor) for channel in rgb)
+
+def mix_rgb(rgb: Tuple[int, int, int], other: Tuple[int, int, int], fraction: float) -> Tuple[int, int, int]:
+    return tuple(round(a + (b - a) * fraction) for a, b in zip(rgb, other))
+
+def trail_rgb(steps: int) -> List[Tuple[int, int, int]]:
+    colors = []
+    for step in range(steps):
+        fraction = step / (steps - 1)
+        colors.append(tuple(round(near + (far - near) * fraction) for near, far in zip(TRAIL_NEAR, TRAIL_FAR)))
+    return colors
+
+def trail_gradient() -> List[str]:
+    return [color_rgb(*rgb) for rgb in trail_rgb(TRAIL_STEPS.get(_color_level, 0))]
+
+set_color_level(detect_color_level())
+
 def clear_screen():
     print('\033[2J\033[H', end='')
 
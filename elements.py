@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 @dataclass
 class Element:
@@ -148,130 +148,159 @@ def get_element(atomic_number: int) -> Element:
             category="Unknown"
         )
 
-def get_electron_shells(atomic_number: int) -> List[int]:
-    max_electrons = [2, 8, 18, 32, 50, 72, 98]
-    shells = []
-    remaining_electrons = atomic_number
-    
-    for max_in_shell in max_electrons:
-        if remaining_electrons <= 0:
+_ELEMENT_NAMES = {key: number for number, element in ELEMENTS.items()
+                  for key in (element.symbol.lower(), element.name.lower())}
+
+def find_element(query: str) -> Optional[Element]:
+    query = query.strip().lower()
+    if query.isdigit():
+        return ELEMENTS.get(int(query))
+    number = _ELEMENT_NAMES.get(query)
+    return ELEMENTS[number] if number is not None else None
+
+ORBITAL_ORDER = [
+    ("1s", 2), ("2s", 2), ("2p", 6), ("3s", 2), ("3p", 6), ("4s", 2),
+    ("3d", 10), ("4p", 6), ("5s", 2), ("4d", 10), ("5p", 6), ("6s", 2),
+    ("4f", 14), ("5d", 10), ("6p", 6), ("7s", 2), ("5f", 14), ("6d", 10), ("7p", 6)
+]
+
+AUFBAU_EXCEPTIONS = {
+    24: {"4s": 1, "3d": 5},
+    29: {"4s": 1, "3d": 10},
+    41: {"5s": 1, "4d": 4},
+    42: {"5s": 1, "4d": 5},
+    44: {"5s": 1, "4d": 7},
+    45: {"5s": 1, "4d": 8},
+    46: {"5s": 0, "4d": 10},
+    47: {"5s": 1, "4d": 10},
+    57: {"4f": 0, "5d": 1},
+    58: {"4f": 1, "5d": 1},
+    64: {"4f": 7, "5d": 1},
+    78: {"6s": 1, "5d": 9},
+    79: {"6s": 1, "5d": 10},
+    89: {"5f": 0, "6d": 1},
+    90: {"5f": 0, "6d": 2},
+    91: {"5f": 2, "6d": 1},
+    92: {"5f": 3, "6d": 1},
+    93: {"5f": 4, "6d": 1},
+    96: {"5f": 7, "6d": 1},
+    103: {"6d": 0, "7p": 1},
+}
+
+NOBLE_GASES = [(2, "He"), (10, "Ne"), (18, "Ar"), (36, "Kr"), (54, "Xe"), (86, "Rn"), (118, "Og")]
+
+PERIOD_ENDS = [2, 10, 18, 36, 54, 86, 118]
+
+SUPERSCRIPTS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+@dataclass(frozen=True)
+class ElementData:
+    shells: Tuple[int, ...]
+    configuration: str
+    noble_gas_notation: str
+    period: int
+    group: int
+    valence: int
+
+def _fill_orbitals(atomic_number: int) -> List[Tuple[str, int]]:
+    occupancy = []
+    remaining = atomic_number
+    for orbital, capacity in ORBITAL_ORDER:
+        if remaining <= 0:
             break
-        
-        electrons_in_shell = min(remaining_electrons, max_in_shell)
-        shells.append(electrons_in_shell)
-        remaining_electrons -= electrons_in_shell
-    
-    if remaining_electrons > 0:
-        shells.append(remaining_electrons)
+        electrons = min(remaining, capacity)
+        occupancy.append((orbital, electrons))
+        remaining -= electrons
     
-    return shells
+    overrides = AUFBAU_EXCEPTIONS.get(atomic_number)
+    if overrides:
+        filled = dict(occupancy)
+        filled.update(overrides)
+        occupancy = [(orbital, filled[orbital]) for orbital, _ in ORBITAL_ORDER if filled.get(orbital)]
+    return occupancy
 
-def get_electron_configuration(atomic_number: int) -> str:
-    if atomic_number <= 0:
-        return ""
+def _format_orbitals(occupancy: List[Tuple[str, int]]) -> str:
+    return " ".join(f"{orbital}{str(electrons).translate(SUPERSCRIPTS)}" for orbital, electrons in occupancy)
+
+def _period_of(atomic_number: int) -> int:
+    for period, last in enumerate(PERIOD_ENDS, start=1):
+        if atomic_number <= last:
+            return period
+    return len(PERIOD_ENDS) + 1
+
+def _group_of(atomic_number: int) -> int:
+    period = _period_of(atomic_number)
+    if period == 1:
+        return {1: 1, 2: 18}.get(atomic_number, 0)
+    if period > len(PERIOD_ENDS):
+        return 0
+    position = atomic_number - PERIOD_ENDS[period - 2]
+    length = PERIOD_ENDS[period - 1] - PERIOD_ENDS[period - 2]
+    if length == 8:
+        return position if position <= 2 else position + 10
+    if length == 18:
+        return position
+    if position <= 2:
+        return position
+    if position <= 16:
+        return 0
+    return position - 14
+
+def _build_element_data(atomic_number: int) -> ElementData:
+    occupancy = _fill_orbitals(atomic_number)
     
-    orbital_order = [
-        ("1s", 2), ("2s", 2), ("2p", 6), ("3s", 2), ("3p", 6), ("4s", 2),
-        ("3d", 10), ("4p", 6), ("5s", 2), ("4d", 10), ("5p", 6), ("6s", 2),
-        ("4f", 14), ("5d", 10), ("6p", 6), ("7s", 2), ("5f", 14), ("6d", 10), ("7p", 6)
-    ]
+    shell_counts: Dict[int, int] = {}
+    for orbital, electrons in occupancy:
+        level = int(orbital[0])
+        shell_counts[level] = shell_counts.get(level, 0) + electrons
+    shells = [shell_counts.get(level, 0) for level in range(1, max(shell_counts, default=0) + 1)]
+    leftover = atomic_number - sum(shells)
+    if leftover > 0:
+        shells.append(leftover)
     
-    configuration = []
-    remaining_electrons = atomic_number
+    configuration = _format_orbitals(occupancy)
     
-    for orbital, max_electrons in orbital_order:
-        if remaining_electrons <= 0:
-            break
-        
-        electrons_in_orbital = min(remaining_electrons, max_electrons)
-        
-        superscript_map = {
-            1: "¹", 2: "²", 3: "³", 4: "⁴", 5: "⁵", 6: "⁶", 7: "⁷", 8: "⁸", 9: "⁹", 10: "¹⁰",
-            11: "¹¹", 12: "¹²", 13: "¹³", 14: "¹⁴"
-        }
-        
-        superscript = superscript_map.get(electrons_in_orbital, str(electrons_in_orbital))
-        configuration.append(f"{orbital}{superscript}")
-        remaining_electrons -= electrons_in_orbital
+    notation = configuration
+    core = [(number, symbol) for number, symbol in NOBLE_GASES if number < atomic_number]
+    if core and atomic_number > 2:
+        core_number, core_symbol = core[-1]
+        core_orbitals = {orbital for orbital, _ in _fill_orbitals(core_number)}
+        outer = [(orbital, electrons) for orbital, electrons in occupancy if orbital not in core_orbitals]
+        notation = f"[{core_symbol}] {_format_orbitals(outer)}" if outer else f"[{core_symbol}]"
     
-    return " ".join(configuration)
+    return ElementData(
+        shells=tuple(shells),
+        configuration=configuration,
+        noble_gas_notation=notation,
+        period=_period_of(atomic_number),
+        group=_group_of(atomic_number),
+        valence=shells[-1] if shells else 0,
+    )
+
+PERIODIC_TABLE: Tuple[ElementData, ...] = tuple(_build_element_data(z) for z in range(0, 119))
+
+def get_element_data(atomic_number: int) -> ElementData:
+    if 0 <= atomic_number < len(PERIODIC_TABLE):
+        return PERIODIC_TABLE[atomic_number]
+    return _build_element_data(max(atomic_number, 0))
+
+def get_electron_shells(atomic_number: int) -> List[int]:
+    return list(get_element_data(atomic_number).shells)
+
+def get_electron_configuration(atomic_number: int) -> str:
+    return get_element_data(atomic_number).configuration
 
 def get_noble_gas_notation(atomic_number: int) -> str:
-    if atomic_number <= 2:
-        return get_electron_configuration(atomic_number)
-    
-    noble_gases = {
-        2: ("He", 2),
-        10: ("Ne", 10),
-        18: ("Ar", 18),
-        36: ("Kr", 36),
-        54: ("Xe", 54),
-        86: ("Rn", 86),
-    }
-    
-    core_symbol = ""
-    core_electrons = 0
-    
-    for ng_atomic_num, (symbol, electrons) in noble_gases.items():
-        if ng_atomic_num < atomic_number:
-            core_symbol = symbol
-            core_electrons = electrons
-    
-    if core_electrons == 0:
-        return get_electron_configuration(atomic_number)
-    
-    remaining_electrons = atomic_number - core_electrons
-    if remaining_electrons > 0:
-        outer_config = get_electron_configuration(remaining_electrons)
-        return f"[{core_symbol}] {outer_config}"
-    else:
-        return f"[{core_symbol}]"
+    return get_element_data(atomic_number).noble_gas_notation
 
 def get_valence_electrons(atomic_number: int) -> int:
-    shells = get_electron_shells(atomic_number)
-    return shells[-1] if shells else 0
+    return get_element_data(atomic_number).valence
 
 def get_element_period(atomic_number: int) -> int:
-    if atomic_number <= 2:
-        return 1
-    elif atomic_number <= 10:
-        return 2
-    elif atomic_number <= 18:
-        return 3
-    elif atomic_number <= 36:
-        return 4
-    elif atomic_number <= 54:
-        return 5
-    elif atomic_number <= 86:
-        return 6
-    elif atomic_number <= 118:
-        return 7
-    else:
-        return 8
+    return get_element_data(atomic_number).period
 
 def get_element_group(atomic_number: int) -> int:
-    if atomic_number == 1:
-        return 1
-    elif atomic_number == 2:
-        return 18
-    elif atomic_number in [3, 11, 19, 37, 55, 87]:
-        return 1
-    elif atomic_number in [4, 12, 20, 38, 56, 88]:
-        return 2
-    elif atomic_number in [5, 13, 31, 49, 81, 113]:
-        return 13
-    elif atomic_number in [6, 14, 32, 50, 82, 114]:
-        return 14
-    elif atomic_number in [7, 15, 33, 51, 83, 115]:
-        return 15
-    elif atomic_number in [8, 16, 34, 52, 84, 116]:
-        return 16
-    elif atomic_number in [9, 17, 35, 53, 85, 117]:
-        return 17
-    elif atomic_number in [10, 18, 36, 54, 86, 118]:
-        return 18
-    else:
-        return 0
+    return get_element_data(atomic_number).group
 
 def get_orbital_diagram(atomic_number: int) -> str:
     if atomic_number <= 0:
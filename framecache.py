@@ -0,0 +1,126 @@
+import sys
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+from cellbuffer import CellBuffer
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+MAX_REPLAYED_STEPS = 4
+
+class FrameCycle:
+    def __init__(self, period: float, frames: int, width: int, height: int, top: int,
+                 build_grid: Callable[[float], CellBuffer], max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.period = period
+        self.frames = frames
+        self.width = width
+        self.height = height
+        self.top = top
+        self.max_bytes = max_bytes
+        self.build_grid = build_grid
+        self.transitions: Dict[int, List[Optional[str]]] = {}
+        self.cached_frames = 0
+        self.nbytes = sys.getsizeof(self.transitions)
+
+    def time_step(self, index: int) -> float:
+        return index * self.period / self.frames
+
+    def index_at(self, time_step: float) -> int:
+        return int(time_step % self.period * self.frames / self.period + 0.5) % self.frames
+
+    def grid(self, index: int) -> CellBuffer:
+        return self.build_grid(self.time_step(index))
+
+    def stride(self, previous: int, index: int) -> int:
+        return (index - previous) % self.frames
+
+    def transition(self, previous: int, index: int) -> Optional[str]:
+        steps = self.stride(previous, index)
+        if steps == 0:
+            return ""
+        stored = self.transitions.get(steps)
+        if stored is not None and stored[index] is not None:
+            return stored[index]
+        single = self.transitions.get(1)
+        if single is None or steps > MAX_REPLAYED_STEPS:
+            return None
+        parts = []
+        for step in range(1, steps + 1):
+            text = single[(previous + step) % self.frames]
+            if text is None:
+                return None
+            parts.append(text)
+        return ''.join(parts)
+
+    def store(self, previous: int, index: int, text: str):
+        steps = self.stride(previous, index)
+        if steps == 0:
+            return
+        stored = self.transitions.get(steps)
+        if stored is None:
+            size = sys.getsizeof([None] * self.frames)
+            if self.nbytes + size > self.max_bytes:
+                return
+            stored = self.transitions[steps] = [None] * self.frames
+            self.nbytes += size
+        size = sys.getsizeof(text)
+        if stored[index] is None and self.nbytes + size <= self.max_bytes:
+            stored[index] = text
+            self.cached_frames += 1
+            self.nbytes += size
+
+    def complete(self, steps: int = 1) -> bool:
+        stored = self.transitions.get(steps)
+        return stored is not None and None not in stored
+
+class CycleFrame:
+    def __init__(self, header: List[str], footer: List[str], cycle: FrameCycle, index: int,
+                 grid: Optional[CellBuffer] = None):
+        self.header = header
+        self.footer = footer
+        self.cycle = cycle
+        self.index = index
+        self._grid = grid
+
+    @property
+    def grid(self) -> CellBuffer:
+        if self._grid is None:
+            self._grid = self.cycle.grid(self.index)
+        return self._grid
+
+    @property
+    def built(self) -> bool:
+        return self._grid is not None
+
+    def lines(self) -> List[str]:
+        return self.header + self.grid.render_lines() + self.footer
+
+class FrameCache:
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._cycles: 'OrderedDict[Hashable, FrameCycle]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[FrameCycle]:
+        cycle = self._cycles.get(key)
+        if cycle is not None:
+            self._cycles.move_to_end(key)
+        return cycle
+
+    def put(self, key: Hashable, cycle: FrameCycle):
+        self._cycles[key] = cycle
+        self._cycles.move_to_end(key)
+        self.trim()
+
+    def trim(self):
+        while len(self._cycles) > 1 and self.nbytes > self.max_bytes:
+            self._cycles.popitem(last=False)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(cycle.nbytes for cycle in self._cycles.values())
+
+    def clear(self):
+        self._cycles.clear()
+
+    def __len__(self) -> int:
+        return len(self._cycles)
@@ -0,0 +1,100 @@
+import math
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+ANGLE_STEPS = 2048
+ANGLE_SCALE = ANGLE_STEPS / (2 * math.pi)
+ELECTRON_BLINK_RATE = 3
+NUCLEUS_PULSE_RATE = 2
+
+Cell = Tuple[int, int]
+
+class OrbitGeometry:
+    def __init__(self, width: int, height: int, radius: int, samples: int):
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.samples = samples
+        center_x = width // 2
+        center_y = height // 2
+
+        self.ring_cells: List[Tuple[int, int, bool]] = []
+        self.ring_indices: List[Tuple[int, bool]] = []
+        half = samples // 2
+        for i in range(samples):
+            angle = i * math.pi / half
+            x = int(center_x + radius * math.cos(angle))
+            y = int(center_y + radius * math.sin(angle) * 0.85)
+            if 0 <= x < width and 0 <= y < height:
+                major = angle % (math.pi / 4) < 0.2
+                self.ring_cells.append((x, y, major))
+                self.ring_indices.append((y * width + x, major))
+
+        self.angle_cells: List[Optional[Cell]] = []
+        self.angle_indices: List[int] = []
+        for step in range(ANGLE_STEPS + 1):
+            angle = step / ANGLE_SCALE
+            x = int(center_x + radius * math.cos(angle))
+            y = int(center_y + radius * math.sin(angle) * 0.85)
+            if 0 <= x < width and 0 <= y < height:
+                self.angle_cells.append((x, y))
+                self.angle_indices.append(y * width + x)
+            else:
+                self.angle_cells.append(None)
+                self.angle_indices.append(-1)
+
+    def cell_at(self, angle: float) -> Optional[Cell]:
+        return self.angle_cells[int(angle * ANGLE_SCALE % ANGLE_STEPS + 0.5)]
+
+    def index_at(self, angle: float) -> int:
+        return self.angle_indices[int(angle * ANGLE_SCALE % ANGLE_STEPS + 0.5)]
+
+MAX_CACHED_GEOMETRIES = 256
+
+_geometry_cache: 'OrderedDict[Tuple[int, int, int, int], OrbitGeometry]' = OrderedDict()
+
+def get_orbit_geometry(width: int, height: int, radius: int, samples: int) -> OrbitGeometry:
+    key = (width, height, radius, samples)
+    geometry = _geometry_cache.get(key)
+    if geometry is None:
+        geometry = OrbitGeometry(width, height, radius, samples)
+        _geometry_cache[key] = geometry
+        if len(_geometry_cache) > MAX_CACHED_GEOMETRIES:
+            _geometry_cache.popitem(last=False)
+    else:
+        _geometry_cache.move_to_end(key)
+    return geometry
+
+def clear_geometry_cache():
+    _geometry_cache.clear()
+
+def shell_speed(shell_idx: int) -> float:
+    return 1.5 - shell_idx * 0.2
+
+_loop_periods: Dict[Tuple[int, ...], float] = {}
+
+def loop_divisor(shells: Sequence[int]) -> int:
+    divisor = 0
+    for shell_idx, electron_count in enumerate(shells):
+        divisor = math.gcd(divisor, electron_count * round(shell_speed(shell_idx) * 10))
+    return max(1, divisor)
+
+def loop_period(shells: Sequence[int]) -> float:
+    key = tuple(shells)
+    period = _loop_periods.get(key)
+    if period is None:
+        period = _loop_periods[key] = 20 * math.pi / loop_divisor(key)
+    return period
+
+def shared_loop_period(shell_lists: Iterable[Sequence[int]]) -> float:
+    divisor = 0
+    for shells in shell_lists:
+        divisor = math.gcd(divisor, loop_divisor(shells))
+    return 20 * math.pi / max(1, divisor)
+
+def blink_cycle(rate: float, period: float) -> float:
+    return period / max(1, round(period * rate / 2))
+
+def blink(time_step: float, rate: float, period: float) -> int:
+    half_cycles = 2 * max(1, round(period * rate / 2))
+    return int(time_step % period * half_cycles / period) % 2
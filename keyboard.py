@@ -0,0 +1,190 @@
+import os
+import select
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+from colors import Colors, clear_screen, hide_cursor, show_cursor
+from scheduler import FrameScheduler
+
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+
+ESCAPE_SEQUENCES = {
+    "\033[A": "up",
+    "\033[B": "down",
+    "\033[C": "right",
+    "\033[D": "left",
+    "\033OA": "up",
+    "\033OB": "down",
+    "\033OC": "right",
+    "\033OD": "left",
+}
+
+SPEED_STEP = 1.25
+ELEMENT_COUNT = 118
+
+def csi_end(data: str, start: int) -> int:
+    position = start
+    while position < len(data) and "\x20" <= data[position] <= "\x3f":
+        position += 1
+    if position < len(data) and not "\x40" <= data[position] <= "\x7e":
+        return position
+    return position + 1 if position < len(data) else -1
+
+def parse_keys(data: str) -> Tuple[List[str], str]:
+    keys = []
+    position = 0
+    while position < len(data):
+        char = data[position]
+        if char == "\033":
+            if position + 1 == len(data):
+                keys.append("escape")
+                break
+            introducer = data[position + 1]
+            if introducer == "[":
+                end = csi_end(data, position + 2)
+            elif introducer == "O":
+                end = position + 3 if position + 2 < len(data) else -1
+            else:
+                end = position + 2
+            if end < 0:
+                return keys, data[position:]
+            if data[position:end] in ESCAPE_SEQUENCES:
+                keys.append(ESCAPE_SEQUENCES[data[position:end]])
+            position = end
+            continue
+        elif char in "\r\n":
+            keys.append("enter")
+        elif char in "\x7f\b":
+            keys.append("backspace")
+        else:
+            keys.append(char)
+        position += 1
+    return keys, ""
+
+class KeyReader:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdin
+        self.fd = -1
+        self.saved_attributes = None
+        self.pending = ""
+        try:
+            self.fd = self.stream.fileno()
+            self.active = termios is not None and os.isatty(self.fd)
+        except (AttributeError, ValueError, OSError):
+            self.active = False
+
+    def __enter__(self) -> 'KeyReader':
+        if self.active:
+            self.saved_attributes = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.saved_attributes is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved_attributes)
+            self.saved_attributes = None
+
+    def wait(self, timeout: float) -> bool:
+        if not self.active:
+            time.sleep(timeout)
+            return False
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(readable)
+
+    def read_keys(self) -> List[str]:
+        if not self.active or not select.select([self.fd], [], [], 0)[0]:
+            return []
+        data = os.read(self.fd, 1024)
+        keys, self.pending = parse_keys(self.pending + data.decode('utf-8', errors='ignore'))
+        return keys
+
+class AnimationControls:
+    def __init__(self, scheduler: FrameScheduler, atomic_number: Optional[int] = None):
+        self.scheduler = scheduler
+        self.atomic_number = atomic_number
+        self.navigation = atomic_number is not None
+        self.typed = ""
+        self.quit = False
+
+    def handle(self, key: str):
+        scheduler = self.scheduler
+        if not self.navigation and (key.isdigit() or key in ("backspace", "enter", "n", "right", "b", "left")):
+            return
+        if key.isdigit():
+            if len(self.typed) < 3:
+                self.typed += key
+        elif key == "backspace":
+            self.typed = self.typed[:-1]
+        elif key == "enter":
+            if self.typed and 1 <= int(self.typed) <= ELEMENT_COUNT:
+                self.atomic_number = int(self.typed)
+            self.typed = ""
+        elif key == "escape":
+            if self.typed:
+                self.typed = ""
+            else:
+                self.quit = True
+        elif key in ("q", "Q"):
+            self.quit = True
+        elif key in (" ", "p"):
+            scheduler.toggle_pause()
+        elif key in ("+", "=", "up"):
+            scheduler.set_speed(scheduler.speed * SPEED_STEP)
+        elif key in ("-", "_", "down"):
+            scheduler.set_speed(scheduler.speed / SPEED_STEP)
+        elif key == ".":
+            scheduler.step(1)
+        elif key == ",":
+            scheduler.step(-1)
+        elif key in ("n", "right"):
+            self.atomic_number = self.atomic_number % ELEMENT_COUNT + 1
+        elif key in ("b", "left"):
+            self.atomic_number = (self.atomic_number - 2) % ELEMENT_COUNT + 1
+
+    def status(self) -> str:
+        status = f"{Colors.INFO}Press q to stop animation{Colors.RESET}"
+        if self.scheduler.paused:
+            status += f" {Colors.HIGHLIGHT}| paused{Colors.RESET}"
+        if self.scheduler.speed != 1.0:
+            status += f" {Colors.HIGHLIGHT}| {self.scheduler.speed:.2g}x{Colors.RESET}"
+        if self.typed:
+            status += f" {Colors.HIGHLIGHT}| go to {self.typed}_{Colors.RESET}"
+        return status
+
+    def help_line(self) -> str:
+        navigation = " | ←/→ element | number+Enter jump" if self.navigation else ""
+        return f"{Colors.DIM}space pause | ,/. step | +/- speed{navigation}{Colors.RESET}"
+
+def run_animation(controls: AnimationControls, draw_frame: Callable[[Optional[AnimationControls]], None],
+                  frames: Optional[int] = None, duration: Optional[float] = None,
+                  on_start: Optional[Callable[[], None]] = None, on_stop: Optional[Callable[[], None]] = None):
+    scheduler = controls.scheduler
+    try:
+        with KeyReader() as keys:
+            active = controls if keys.active else None
+            clear_screen()
+            hide_cursor()
+            if on_start is not None:
+                on_start()
+            scheduler.start()
+            while not controls.quit:
+                if frames is not None and scheduler.frames >= frames:
+                    break
+                if duration is not None and time.monotonic() - scheduler.start_time >= duration:
+                    break
+                draw_frame(active)
+                scheduler.wait(keys.wait)
+                for key in keys.read_keys():
+                    controls.handle(key)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if on_stop is not None:
+            on_stop()
+    show_cursor()
+    clear_screen()
+    print(f"{Colors.INFO}Thank you for exploring the atomic world! ⚛️{Colors.RESET}")
@@ -0,0 +1,34 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, List, Optional, Union
+from braille import BrailleCanvas
+from cellbuffer import CellBuffer
+
+@dataclass
+class Background:
+    grid: Union[CellBuffer, BrailleCanvas]
+    footer: List[str]
+    shells: List[int]
+
+class LayerCache:
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._layers: 'OrderedDict[Hashable, Background]' = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Background]:
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+        return layer
+
+    def put(self, key: Hashable, layer: Background):
+        self._layers[key] = layer
+        self._layers.move_to_end(key)
+        while len(self._layers) > self.max_entries:
+            self._layers.popitem(last=False)
+
+    def clear(self):
+        self._layers.clear()
+
+    def __len__(self) -> int:
+        return len(self._layers)
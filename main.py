@@ -1,37 +1,213 @@
 #!/usr/bin/env python3
+import argparse
+import shutil
 import sys
-from colors import Colors, show_cursor
-from renderer import AtomRenderer
-from menu import AtomMenu
+from typing import Optional
+from colors import COLOR_LEVELS, Colors, set_color_level, show_cursor
+from elements import Element, find_element
+from framecache import DEFAULT_CACHE_BYTES
+from renderer import ELECTRON_BACKENDS, INFO_PANEL_ROWS, RASTER_MODES, AtomRenderer
+
+MODES = ("static", "animated")
+DEFAULT_OUTPUT_FRAMES = 40
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Terminal atom visualizer")
+    parser.add_argument("atomic_number", nargs="?", metavar="element",
+                        help="atomic number, symbol or name to open in the menu directly")
+    parser.add_argument("-e", "--element", help="render this element without the menu: atomic number, symbol or name")
+    parser.add_argument("--neutrons", type=int, metavar="N",
+                        help="draw an isotope of the chosen element with N neutrons, e.g. -e C --neutrons 8 for carbon-14")
+    parser.add_argument("--mode", choices=MODES, help="render without the menu (default: animated with --frames or "
+                                                      "--duration, otherwise static)")
+    parser.add_argument("--frames", type=int, help="stop the animation after this many frames")
+    parser.add_argument("--duration", type=float, help="stop the animation after this many seconds")
+    parser.add_argument("--fps", type=float, default=8.0, help="animation frame rate (default: 8)")
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help=f"write frames to FILE, or - for stdout, instead of drawing them live "
+                             f"(default: {DEFAULT_OUTPUT_FRAMES} frames when animated); a .svg or .html FILE "
+                             f"gets the whole animation as a self-contained vector file")
+    parser.add_argument("--record", metavar="FILE", help="record the animation to an asciicast v2 file")
+    parser.add_argument("--play", metavar="FILE", help="play back an asciicast v2 recording and exit")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier (default: 1.0)")
+    parser.add_argument("--raster", choices=RASTER_MODES, default="cell",
+                        help="draw with one glyph per cell or with 2x4 Braille dots per cell (default: cell)")
+    parser.add_argument("--backend", choices=ELECTRON_BACKENDS, default="python",
+                        help="compute electron positions in pure Python or batched with NumPy, if installed (default: python)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="build the next frame while a writer thread sends the current one to the terminal")
+    parser.add_argument("--bandwidth", metavar="RATE",
+                        help="keep output within RATE bytes per second (e.g. 9600, 4k, 1.5M), or auto to measure "
+                             "the link from write latency; lowers detail and frame rate as needed")
+    parser.add_argument("--frame-cache", type=int, default=DEFAULT_CACHE_BYTES >> 20, metavar="MB",
+                        help="memory for replaying already-rendered animation cycles, 0 to disable "
+                             f"(default: {DEFAULT_CACHE_BYTES >> 20})")
+    parser.add_argument("--graphics", choices=("sixel", "kitty"),
+                        help="draw the atom as pixel graphics with the sixel or kitty graphics protocol")
+    parser.add_argument("--pixel-size", default="800x600", metavar="WxH",
+                        help="image size in pixels for --graphics (default: 800x600)")
+    parser.add_argument("--tiles", metavar="SPEC",
+                        help="animate many mini-atoms at once: table, period:N or group:N")
+    parser.add_argument("--colors", choices=("auto",) + COLOR_LEVELS, default="auto",
+                        help="color support to render for; auto reads NO_COLOR, TERM and COLORTERM (default: auto)")
+    parser.add_argument("--hud", action="store_true", help="show per-stage frame timings under the atom")
+    parser.add_argument("--perf-log", metavar="FILE", help="write per-frame stage timings to a .csv or .json file on exit")
+    args = parser.parse_args()
+    if args.frames is not None and args.frames <= 0:
+        parser.error("--frames must be positive")
+    if args.duration is not None and args.duration <= 0:
+        parser.error("--duration must be positive")
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.frame_cache < 0:
+        parser.error("--frame-cache must not be negative")
+    try:
+        args.pixel_size = tuple(int(value) for value in args.pixel_size.lower().split("x"))
+    except ValueError:
+        args.pixel_size = ()
+    if len(args.pixel_size) != 2 or min(args.pixel_size) < 16:
+        parser.error("--pixel-size must look like 800x600, at least 16x16")
+    if args.bandwidth is not None:
+        from bandwidth import parse_bandwidth
+        try:
+            args.bandwidth_budget = parse_bandwidth(args.bandwidth)
+        except ValueError as e:
+            parser.error(f"--bandwidth: {e}")
+    if args.neutrons is not None:
+        if args.neutrons < 0:
+            parser.error("--neutrons must not be negative")
+        if args.element is None and args.atomic_number is None:
+            parser.error("--neutrons needs an element")
+    return args
+
+def lookup_element(query: str) -> Element:
+    element = find_element(query)
+    if element is None:
+        print(f"{Colors.ERROR}Unknown element: {query} (use an atomic number 1-118, a symbol or a name){Colors.RESET}")
+        sys.exit(1)
+    return element
+
+def run_once(renderer: AtomRenderer, element: Element, mode: str, frames: Optional[int], duration: Optional[float],
+             output: Optional[str]):
+    animated = mode == "animated"
+    if output is None:
+        if animated:
+            renderer.draw_animated_atom(element, frames=frames, duration=duration)
+        else:
+            renderer.draw_static_atom(element)
+        return
+
+    if output.lower().endswith((".svg", ".html")):
+        from svgexport import SvgExporter
+        SvgExporter(renderer).write(element, output)
+        return
+
+    if not animated:
+        frames = 1
+    elif duration is not None:
+        duration_frames = max(1, round(duration * renderer.scheduler.fps))
+        frames = duration_frames if frames is None else min(frames, duration_frames)
+    elif frames is None:
+        frames = DEFAULT_OUTPUT_FRAMES
+    if output == "-":
+        renderer.write_frames(element, sys.stdout, animated, frames)
+    else:
+        with open(output, 'w', encoding='utf-8') as stream:
+            renderer.write_frames(element, stream, animated, frames)
 
 def main():
+    args = parse_args()
+    if args.colors != "auto":
+        set_color_level(args.colors)
+    live = args.output is None
+    scripted = any(value is not None for value in (args.element, args.mode, args.frames, args.duration, args.output))
+    recorder = None
+    perf = None
+    governor = None
     try:
-        renderer = AtomRenderer()
-        menu = AtomMenu()
-        
-        if len(sys.argv) > 1:
+        if args.play:
+            from asciicast import play_asciicast
+            play_asciicast(args.play, speed=args.speed)
+            return
+
+        renderer = AtomRenderer(fps=args.fps, raster=args.raster, backend=args.backend, pipelined=args.pipeline,
+                                frame_cache_bytes=args.frame_cache << 20)
+
+        if args.neutrons is not None:
+            renderer.isotopes[lookup_element(args.element or args.atomic_number).atomic_number] = args.neutrons
+
+        if args.bandwidth is not None:
+            governor = renderer.enable_bandwidth_budget(args.bandwidth_budget)
+
+        if args.hud or args.perf_log:
+            perf = renderer.enable_perf(hud=args.hud, export_path=args.perf_log)
+
+        if args.record:
+            from asciicast import AsciicastRecorder
+            columns = max(shutil.get_terminal_size().columns, renderer.width)
+            rows = renderer.height + INFO_PANEL_ROWS + (perf.hud_rows if perf is not None else 0)
+            recorder = AsciicastRecorder(args.record, columns, rows)
+            renderer.diff_renderer.recorder = recorder
+
+        if args.tiles:
+            from tiles import TileCompositor, parse_tile_selection
             try:
-                atomic_number = int(sys.argv[1])
-                if 1 <= atomic_number <= 118:
-                    menu.run_direct_mode(renderer, atomic_number)
+                title, atomic_numbers, table = parse_tile_selection(args.tiles)
+                tiles = TileCompositor(renderer, title, atomic_numbers, table)
+            except ValueError as e:
+                print(f"{Colors.ERROR}{e}{Colors.RESET}")
+                sys.exit(1)
+            tiles.run(frames=args.frames, duration=args.duration)
+        elif args.graphics:
+            from pixels import PixelRenderer
+            pixels = PixelRenderer(renderer, args.graphics, *args.pixel_size)
+            element = lookup_element(args.element or args.atomic_number or "1")
+            if args.output is None:
+                pixels.run(element, frames=args.frames, duration=args.duration)
+            else:
+                frames = args.frames or (DEFAULT_OUTPUT_FRAMES if args.mode == "animated" else 1)
+                if args.duration is not None:
+                    frames = min(frames, max(1, round(args.duration * renderer.scheduler.fps)))
+                if args.output == "-":
+                    pixels.write_frames(element, sys.stdout, frames)
                 else:
-                    print(f"{Colors.ERROR}Atomic number must be between 1 and 118.{Colors.RESET}")
-                    sys.exit(1)
-            except ValueError:
-                print(f"{Colors.ERROR}Invalid atomic number: {sys.argv[1]}{Colors.RESET}")
+                    with open(args.output, 'w', encoding='utf-8') as stream:
+                        pixels.write_frames(element, stream, frames)
+        elif scripted:
+            query = args.element or args.atomic_number
+            if query is None:
+                print(f"{Colors.ERROR}Choose an element with --element to render without the menu.{Colors.RESET}")
                 sys.exit(1)
+            mode = args.mode or ("animated" if args.frames or args.duration else "static")
+            run_once(renderer, lookup_element(query), mode, args.frames, args.duration, args.output)
         else:
-            menu.run_interactive_mode(renderer)
-    
+            from menu import AtomMenu
+            menu = AtomMenu()
+            if args.atomic_number is not None:
+                menu.run_direct_mode(renderer, lookup_element(args.atomic_number).atomic_number)
+            else:
+                menu.run_interactive_mode(renderer)
+
     except KeyboardInterrupt:
-        show_cursor()
+        if live:
+            show_cursor()
         print(f"\n\n{Colors.HIGHLIGHT}Program interrupted. Goodbye!{Colors.RESET}")
     except Exception as e:
-        show_cursor()
+        if live:
+            show_cursor()
         print(f"\n{Colors.ERROR}An error occurred: {e}{Colors.RESET}")
         sys.exit(1)
     finally:
-        show_cursor()
+        if perf is not None and perf.export_path:
+            perf.export()
+            print(f"{Colors.INFO}Frame timings written to {perf.export_path}{Colors.RESET}")
+        if governor is not None and governor.total_bytes:
+            print(governor.summary())
+        if recorder is not None:
+            recorder.close()
+            print(f"{Colors.INFO}Recorded {recorder.recorded_events} events to {recorder.path}{Colors.RESET}")
+        if live:
+            show_cursor()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,66 @@
+import math
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+CELL_ASPECT = 0.85
+CORE_NUCLEONS = 5
+GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+
+Nucleon = Tuple[int, int, bool]
+Candidate = Tuple[float, float, float, int, int]
+
+_cluster_candidates: Dict[int, List[Candidate]] = {}
+
+def cluster_candidates(size: int) -> List[Candidate]:
+    candidates = _cluster_candidates.get(size)
+    if candidates is None:
+        reach = int(size / CELL_ASPECT)
+        candidates = []
+        for dy in range(-reach, reach + 1):
+            for dx in range(-size, size + 1):
+                distance = dx * dx + (dy / CELL_ASPECT) ** 2
+                if distance <= size * size + 0.5:
+                    angle = math.atan2(dy, dx) % (2 * math.pi)
+                    candidates.append((distance, angle % math.pi, angle, dx, dy))
+        candidates.sort()
+        _cluster_candidates[size] = candidates
+    return candidates
+
+def cluster_size(nucleons: int, limit: int) -> int:
+    size = 1
+    while size < limit and len(cluster_candidates(size)) < nucleons:
+        size += 1
+    return size
+
+class NucleusLayout:
+    def __init__(self, protons: int, neutrons: int, size: int):
+        self.protons = protons
+        self.neutrons = neutrons
+        self.size = size
+        nucleons = max(1, protons + neutrons)
+        cells = cluster_candidates(size)[:nucleons]
+        self.nucleons_per_cell = nucleons / len(cells)
+        proton_cells = round(len(cells) * protons / nucleons)
+        scattered = sorted(range(len(cells)), key=lambda i: i * GOLDEN_RATIO % 1)
+        proton_indices = set(scattered[:proton_cells])
+        self.cells: List[Nucleon] = [(dx, dy, i in proton_indices) for i, (_, _, _, dx, dy) in enumerate(cells)]
+        self.core: List[Nucleon] = self.cells[:CORE_NUCLEONS]
+
+MAX_CACHED_NUCLEI = 128
+
+_nucleus_cache: 'OrderedDict[Tuple[int, int, int], NucleusLayout]' = OrderedDict()
+
+def get_nucleus_layout(protons: int, neutrons: int, size: int) -> NucleusLayout:
+    key = (protons, neutrons, size)
+    layout = _nucleus_cache.get(key)
+    if layout is None:
+        layout = NucleusLayout(protons, neutrons, size)
+        _nucleus_cache[key] = layout
+        if len(_nucleus_cache) > MAX_CACHED_NUCLEI:
+            _nucleus_cache.popitem(last=False)
+    else:
+        _nucleus_cache.move_to_end(key)
+    return layout
+
+def clear_nucleus_cache():
+    _nucleus_cache.clear()
@@ -0,0 +1,124 @@
+import csv
+import json
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from colors import Colors
+
+STAGES = ("draw", "compose", "encode", "write")
+HUD_ROWS = 2
+
+HISTOGRAM_BOUNDS_US = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def histogram(values_us: List[float]) -> Dict[str, int]:
+    buckets = {f"<={bound}us": 0 for bound in HISTOGRAM_BOUNDS_US}
+    buckets[f">{HISTOGRAM_BOUNDS_US[-1]}us"] = 0
+    for value in values_us:
+        for bound in HISTOGRAM_BOUNDS_US:
+            if value <= bound:
+                buckets[f"<={bound}us"] += 1
+                break
+        else:
+            buckets[f">{HISTOGRAM_BOUNDS_US[-1]}us"] += 1
+    return buckets
+
+class PerfMonitor:
+    def __init__(self, hud: bool = True, export_path: Optional[str] = None, window: int = 60):
+        self.hud = hud
+        self.export_path = export_path
+        self.window: Deque[Tuple[int, ...]] = deque(maxlen=window)
+        self.window_totals = [0] * len(STAGES)
+        self.records: List[Tuple[float, ...]] = []
+        self.stage_ns: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.frame_start = 0
+        self.session_start = time.perf_counter_ns()
+        self.frames = 0
+        self.bytes_last_frame = 0
+        self.fps = 0.0
+        self.dropped_frames = 0
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter_ns()
+        for stage in STAGES:
+            self.stage_ns[stage] = 0
+
+    def add(self, stage: str, elapsed_ns: int):
+        self.stage_ns[stage] += elapsed_ns
+
+    def end_frame(self, bytes_written: int, fps: float = 0.0, dropped_frames: int = 0):
+        now = time.perf_counter_ns()
+        stage_values = tuple(self.stage_ns[stage] for stage in STAGES)
+        if len(self.window) == self.window.maxlen:
+            for i, value in enumerate(self.window[0]):
+                self.window_totals[i] -= value
+        self.window.append(stage_values)
+        for i, value in enumerate(stage_values):
+            self.window_totals[i] += value
+        if self.export_path:
+            self.records.append((self.frames, (self.frame_start - self.session_start) / 1e6)
+                                + tuple(value / 1e3 for value in stage_values)
+                                + ((now - self.frame_start) / 1e3, bytes_written))
+        self.frames += 1
+        self.bytes_last_frame = bytes_written
+        self.fps = fps
+        self.dropped_frames = dropped_frames
+
+    @property
+    def hud_rows(self) -> int:
+        return HUD_ROWS if self.hud else 0
+
+    def hud_lines(self) -> List[str]:
+        if not self.hud or not self.window:
+            return []
+        count = len(self.window)
+        averages = [total / count / 1e6 for total in self.window_totals]
+        timings = " | ".join(f"{stage} {average:.2f}" for stage, average in zip(STAGES, averages))
+        return [
+            f"{Colors.DIM}Perf (ms): {timings}{Colors.RESET}",
+            f"{Colors.DIM}Output: {self.bytes_last_frame} B/frame | {self.fps:.1f} fps | dropped {self.dropped_frames}{Colors.RESET}",
+        ]
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        columns = list(STAGES) + ["total"]
+        summary = {}
+        for offset, name in enumerate(columns, start=2):
+            values = sorted(record[offset] for record in self.records)
+            summary[name] = {
+                "p50_us": round(percentile(values, 0.50), 1),
+                "p95_us": round(percentile(values, 0.95), 1),
+                "p99_us": round(percentile(values, 0.99), 1),
+                "max_us": round(values[-1], 1) if values else 0.0,
+                "histogram": histogram(values),
+            }
+        return summary
+
+    def export(self, path: Optional[str] = None):
+        path = path or self.export_path
+        if not path:
+            return
+        header = ["frame", "time_ms"] + [f"{stage}_us" for stage in STAGES] + ["total_us", "bytes"]
+        summary = self.summary()
+        if path.endswith(".csv"):
+            with open(path, 'w', newline='', encoding='utf-8') as output:
+                writer = csv.writer(output)
+                writer.writerow(header)
+                for record in self.records:
+                    writer.writerow([round(value, 1) if isinstance(value, float) else value for value in record])
+                writer.writerow([])
+                writer.writerow(["stage", "p50_us", "p95_us", "p99_us", "max_us"])
+                for stage, stats in summary.items():
+                    writer.writerow([stage, stats["p50_us"], stats["p95_us"], stats["p99_us"], stats["max_us"]])
+        else:
+            with open(path, 'w', encoding='utf-8') as output:
+                json.dump({
+                    "frames": [dict(zip(header, record)) for record in self.records],
+                    "dropped_frames": self.dropped_frames,
+                    "summary": summary,
+                }, output, indent=1)
@@ -0,0 +1,97 @@
+import threading
+import time
+from typing import List, Optional, Tuple
+from cellbuffer import Frame
+from terminal import DiffRenderer, FrameWriter
+
+class FramePipeline:
+    def __init__(self, diff_renderer: DiffRenderer):
+        self.diff_renderer = diff_renderer
+        first = diff_renderer.frame_writer()
+        self.buffers: List[FrameWriter] = [first, FrameWriter(first.stream, first.synchronized)]
+        self.condition = threading.Condition()
+        self.pending: Optional[FrameWriter] = None
+        self.pending_output = ""
+        self.pending_snapshot: Optional[Tuple] = None
+        self.writing: Optional[FrameWriter] = None
+        self.resync = False
+        self.closed = False
+        self.error: Optional[BaseException] = None
+        self.submitted_frames = 0
+        self.replaced_frames = 0
+        self.written_frames = 0
+        self.write_ns = 0
+        self.writer = threading.Thread(target=self._write_frames, name="frame-writer", daemon=True)
+
+    def start(self):
+        self.writer.start()
+
+    def submit(self, frame: Frame):
+        diff_renderer = self.diff_renderer
+        with self.condition:
+            if self.error is not None:
+                raise self.error
+            buffer = self.pending
+            if buffer is not None:
+                self.pending = None
+                diff_renderer.restore(self.pending_snapshot)
+                self.replaced_frames += 1
+            else:
+                buffer = self.buffers[0] if self.buffers[0] is not self.writing else self.buffers[1]
+            if self.resync:
+                self.resync = False
+                diff_renderer.reset()
+            write_ns, self.write_ns = self.write_ns, 0
+        if diff_renderer.perf is not None and write_ns:
+            diff_renderer.perf.add("write", write_ns)
+        snapshot = diff_renderer.snapshot()
+        output = diff_renderer.prepare(frame, buffer)
+        with self.condition:
+            self.submitted_frames += 1
+            if output:
+                self.pending = buffer
+                self.pending_output = output
+                self.pending_snapshot = snapshot
+                self.condition.notify_all()
+
+    def wait_idle(self):
+        with self.condition:
+            while (self.pending is not None or self.writing is not None) and self.error is None:
+                self.condition.wait()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.writer.is_alive():
+            self.writer.join()
+
+    def _write_frames(self):
+        recorder = self.diff_renderer.recorder
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                buffer = self.pending
+                if buffer is None:
+                    return
+                output = self.pending_output
+                self.pending = None
+                self.writing = buffer
+            started = time.perf_counter_ns()
+            try:
+                buffer.flush()
+            except BaseException as e:
+                with self.condition:
+                    self.error = e
+                    self.writing = None
+                    self.condition.notify_all()
+                return
+            recorded = recorder is None or recorder.record(output)
+            with self.condition:
+                self.writing = None
+                self.written_frames += 1
+                self.write_ns += time.perf_counter_ns() - started
+                if not recorded:
+                    self.resync = True
+                self.condition.notify_all()
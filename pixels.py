@@ -0,0 +1,419 @@
+import base64
+import math
+import re
+import struct
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, TextIO, Tuple
+from colors import TRAIL_STEPS, Colors, default_rgb, mix_rgb, scale_rgb, trail_rgb
+from elements import Element, get_element, get_electron_shells
+from geometry import ELECTRON_BLINK_RATE, NUCLEUS_PULSE_RATE, blink, loop_period, shell_speed
+from keyboard import AnimationControls, run_animation
+from nucleus import CELL_ASPECT, get_nucleus_layout
+from renderer import MAX_SHELLS, TRAIL_SPACING, AtomRenderer, base_shell_radii, nucleus_size
+from terminal import CURSOR_HOME, FrameWriter
+
+PIXEL_PROTOCOLS = ("sixel", "kitty")
+DEFAULT_PIXEL_SIZE = (800, 600)
+BAND_ROWS = 6
+PIXEL_MARGIN = 12
+RING_WIDTH = 2.0
+RING_BRIGHTNESS = 0.55
+PULSE_BRIGHTNESS = 0.4
+NUCLEON_RADIUS = 0.62
+ELECTRON_RADIUS = 0.45
+MIN_ELECTRON_RADIUS = 3
+MAX_ELECTRON_RADIUS = 10
+MAX_CACHED_BACKGROUNDS = 8
+
+BACKGROUND_RGB = (0, 0, 0)
+KITTY_IMAGE_ID = 1
+KITTY_CHUNK = 4096
+KITTY_COMPRESSION = 6
+ADLER_BASE = 65521
+
+RGB = Tuple[int, int, int]
+Spans = List[Tuple[int, int]]
+
+def disc_spans(radius: float) -> Spans:
+    reach = int(radius)
+    return [(dy, int(math.sqrt(radius * radius - dy * dy) + 0.5)) for dy in range(-reach, reach + 1)]
+
+class PixelBackground:
+    def __init__(self, pixels: bytes, shells: List[int]):
+        self.pixels = pixels
+        self.shells = shells
+        self.encoded: Dict[str, list] = {}
+
+class PixelFrame:
+    def __init__(self, background: PixelBackground, pixels: bytearray, dirty: bytearray):
+        self.background = background
+        self.pixels = pixels
+        self.dirty = dirty
+
+    def dirty_bands(self) -> List[int]:
+        return [band for band, flag in enumerate(self.dirty) if flag]
+
+class PixelScene:
+    def __init__(self, renderer: AtomRenderer, width: int, height: int):
+        self.renderer = renderer
+        self.width = width
+        self.height = height
+        self.center_x = width // 2
+        self.center_y = height // 2
+        self.bands = (height + BAND_ROWS - 1) // BAND_ROWS
+        self._backgrounds: 'OrderedDict[Tuple[int, int], PixelBackground]' = OrderedDict()
+        self._spans: Dict[float, Spans] = {}
+
+        self.palette: List[RGB] = [BACKGROUND_RGB]
+        shell_rgb = [default_rgb(f"SHELL_{shell_idx + 1}") for shell_idx in range(len(renderer.shell_colors))]
+        self.shell_colors = [self.add_color(rgb) for rgb in shell_rgb]
+        self.ring_colors = [self.add_color(scale_rgb(rgb, RING_BRIGHTNESS)) for rgb in shell_rgb]
+        electron_rgb = default_rgb("BRIGHT_WHITE")
+        self.electron_color = self.add_color(electron_rgb)
+        self.trail = [(TRAIL_SPACING * (i + 1), self.add_color(rgb)) for i, rgb in enumerate(trail_rgb(TRAIL_STEPS["truecolor"]))]
+        proton_rgb = default_rgb("PROTON")
+        self.proton_color = self.add_color(proton_rgb)
+        self.proton_pulse_color = self.add_color(mix_rgb(proton_rgb, electron_rgb, PULSE_BRIGHTNESS))
+        self.neutron_color = self.add_color(default_rgb("NEUTRON"))
+        self.runs = [bytes((color,)) * width for color in range(len(self.palette))]
+
+    def add_color(self, rgb: RGB) -> int:
+        self.palette.append(rgb)
+        return len(self.palette) - 1
+
+    def spans(self, radius: float) -> Spans:
+        spans = self._spans.get(radius)
+        if spans is None:
+            spans = self._spans[radius] = disc_spans(radius)
+        return spans
+
+    def scale(self, shells: List[int]) -> float:
+        return (min(self.width, self.height) / 2 - PIXEL_MARGIN) / base_shell_radii(len(shells))[-1]
+
+    def electron_radius(self, scale: float) -> float:
+        return float(max(MIN_ELECTRON_RADIUS, min(MAX_ELECTRON_RADIUS, round(scale * ELECTRON_RADIUS))))
+
+    def fill_disc(self, pixels: bytearray, dirty: Optional[bytearray], x: int, y: int, spans: Spans, color: int):
+        width, height = self.width, self.height
+        run = self.runs[color]
+        for dy, half in spans:
+            row = y + dy
+            if 0 <= row < height:
+                start = max(0, x - half)
+                end = min(width, x + half + 1)
+                if start < end:
+                    offset = row * width
+                    pixels[offset + start:offset + end] = run[:end - start]
+        if dirty is not None:
+            top = max(0, y + spans[0][0]) // BAND_ROWS
+            bottom = min(height - 1, y + spans[-1][0]) // BAND_ROWS
+            if top <= bottom:
+                dirty[top:bottom + 1] = b"\x01" * (bottom + 1 - top)
+
+    def draw_ring(self, pixels: bytearray, radius: float, color: int):
+        width, height = self.width, self.height
+        run = self.runs[color]
+        outer = radius + RING_WIDTH / 2
+        inner = radius - RING_WIDTH / 2
+        for dy in range(-int(outer), int(outer) + 1):
+            row = self.center_y + dy
+            if not 0 <= row < height:
+                continue
+            outer_half = int(math.sqrt(outer * outer - dy * dy) + 0.5)
+            inner_half = int(math.sqrt(inner * inner - dy * dy) + 0.5) if abs(dy) < inner else -1
+            for start, end in ((-outer_half, -inner_half), (inner_half + 1, outer_half + 1)):
+                start = max(0, self.center_x + start)
+                end = min(width, self.center_x + end)
+                if start < end:
+                    pixels[row * width + start:row * width + end] = run[:end - start]
+
+    def nucleons(self, element: Element, shells: List[int], core: bool = False):
+        renderer = self.renderer
+        neutrons = renderer.neutron_count(element)
+        layout = get_nucleus_layout(element.atomic_number, neutrons,
+                                    nucleus_size(element.atomic_number + neutrons, base_shell_radii(MAX_SHELLS)[0]))
+        scale = self.scale(shells)
+        spans = self.spans(round(scale * NUCLEON_RADIUS, 1))
+        for dx, dy, is_proton in layout.core if core else layout.cells:
+            yield round(self.center_x + dx * scale), round(self.center_y + dy * scale / CELL_ASPECT), spans, is_proton
+
+    def background(self, element: Element) -> PixelBackground:
+        key = (element.atomic_number, self.renderer.neutron_count(element))
+        layer = self._backgrounds.get(key)
+        if layer is not None:
+            self._backgrounds.move_to_end(key)
+            return layer
+        shells = get_electron_shells(element.atomic_number)
+        pixels = bytearray(self.width * self.height)
+        scale = self.scale(shells)
+        for shell_idx, radius in enumerate(base_shell_radii(len(shells))):
+            self.draw_ring(pixels, radius * scale, self.ring_colors[shell_idx % len(self.ring_colors)])
+        for x, y, spans, is_proton in self.nucleons(element, shells):
+            self.fill_disc(pixels, None, x, y, spans, self.proton_color if is_proton else self.neutron_color)
+        layer = self._backgrounds[key] = PixelBackground(bytes(pixels), shells)
+        if len(self._backgrounds) > MAX_CACHED_BACKGROUNDS:
+            self._backgrounds.popitem(last=False)
+        return layer
+
+    def draw(self, element: Element, time_step: float) -> PixelFrame:
+        layer = self.background(element)
+        shells = layer.shells
+        pixels = bytearray(layer.pixels)
+        dirty = bytearray(self.bands)
+        period = loop_period(shells)
+        scale = self.scale(shells)
+        center_x, center_y = self.center_x, self.center_y
+
+        if blink(time_step, NUCLEUS_PULSE_RATE, period):
+            for x, y, spans, is_proton in self.nucleons(element, shells, core=True):
+                if is_proton:
+                    self.fill_disc(pixels, dirty, x, y, spans, self.proton_pulse_color)
+
+        electron_radius = self.electron_radius(scale)
+        orbits = []
+        for shell_idx, (electron_count, radius) in enumerate(zip(shells, base_shell_radii(len(shells)))):
+            rotation = time_step * shell_speed(shell_idx)
+            angles = [(2 * math.pi * e) / electron_count + rotation for e in range(electron_count)]
+            orbits.append((radius * scale, angles, self.shell_colors[shell_idx % len(self.shell_colors)]))
+
+        for step, (offset, color) in enumerate(self.trail):
+            spans = self.spans(max(1.0, round(electron_radius * (1 - (step + 1) / (len(self.trail) + 1)), 1)))
+            for radius, angles, _ in orbits:
+                for angle in angles:
+                    x = round(center_x + radius * math.cos(angle - offset))
+                    y = round(center_y + radius * math.sin(angle - offset))
+                    self.fill_disc(pixels, dirty, x, y, spans, color)
+
+        spans = self.spans(electron_radius)
+        core_spans = self.spans(round(electron_radius / 2, 1)) if blink(time_step, ELECTRON_BLINK_RATE, period) else None
+        for radius, angles, shell_color in orbits:
+            for angle in angles:
+                x = round(center_x + radius * math.cos(angle))
+                y = round(center_y + radius * math.sin(angle))
+                self.fill_disc(pixels, dirty, x, y, spans, self.electron_color)
+                if core_spans is not None:
+                    self.fill_disc(pixels, None, x, y, core_spans, shell_color)
+        return PixelFrame(layer, pixels, dirty)
+
+    def rgb(self, pixels: bytes) -> bytearray:
+        rgb = bytearray(len(pixels) * 3)
+        for channel in range(3):
+            table = bytes(color[channel] for color in self.palette).ljust(256, b"\x00")
+            rgb[channel::3] = pixels.translate(table)
+        return rgb
+
+SIXEL_CHARS = bytes(63 + value if value < 64 else 63 for value in range(256))
+SIXEL_RUN = re.compile(rb'([?-~])\1{3,}')
+
+def sixel_repeat(match) -> bytes:
+    run = match.group()
+    return b"!%d%c" % (len(run), run[0])
+
+class SixelEncoder:
+    protocol = "sixel"
+    clear = b""
+
+    def __init__(self, scene: PixelScene):
+        self.scene = scene
+        self.width = scene.width
+        self.height = scene.height
+        definitions = b"".join(b"#%d;2;%d;%d;%d" % ((index,) + tuple(round(channel * 100 / 255) for channel in rgb))
+                               for index, rgb in enumerate(scene.palette))
+        self.header = b'\033P0;1;0q"1;1;%d;%d' % (self.width, self.height) + definitions
+        self.masks = [[bytes(1 << row if value == color else 0 for value in range(256)) for color in range(len(scene.palette))]
+                      for row in range(BAND_ROWS)]
+
+    def encode_band(self, pixels: bytes, band: int) -> bytes:
+        width = self.width
+        top = band * BAND_ROWS
+        bottom = min(top + BAND_ROWS, self.height)
+        band_pixels = pixels[top * width:bottom * width]
+        rows = [band_pixels[y * width:(y + 1) * width] for y in range(bottom - top)]
+        masks = self.masks
+        parts = []
+        for color in range(len(self.scene.palette)):
+            if color not in band_pixels:
+                continue
+            bits = 0
+            for row_idx, row in enumerate(rows):
+                if color in row:
+                    bits |= int.from_bytes(row.translate(masks[row_idx][color]), 'big')
+            sixels = bits.to_bytes(width, 'big').translate(SIXEL_CHARS).rstrip(b"?")
+            trimmed = sixels.lstrip(b"?")
+            skipped = len(sixels) - len(trimmed)
+            lead = b"!%d?" % skipped if skipped > 3 else b"?" * skipped
+            parts.append(b"#%d%s%s$" % (color, lead, SIXEL_RUN.sub(sixel_repeat, trimmed)))
+        parts.append(b"-")
+        return b"".join(parts)
+
+    def encode(self, frame: PixelFrame) -> bytes:
+        background = frame.background
+        bands = background.encoded.get(self.protocol)
+        if bands is None:
+            bands = background.encoded[self.protocol] = [self.encode_band(background.pixels, band)
+                                                         for band in range(self.scene.bands)]
+        bands = list(bands)
+        for band in frame.dirty_bands():
+            bands[band] = self.encode_band(frame.pixels, band)
+        return self.header + b"".join(bands) + b"\033\\"
+
+def adler32_combine(first: int, second: int, second_length: int) -> int:
+    remainder = second_length % ADLER_BASE
+    low = ((first & 0xffff) + (second & 0xffff) - 1) % ADLER_BASE
+    high = ((first >> 16) + (second >> 16) + remainder * ((first & 0xffff) - 1)) % ADLER_BASE
+    return high << 16 | low
+
+class KittyEncoder:
+    protocol = "kitty"
+    clear = b"\033_Ga=d,d=I,i=%d,q=2\033\\" % KITTY_IMAGE_ID
+
+    def __init__(self, scene: PixelScene):
+        self.scene = scene
+        self.width = scene.width
+        self.height = scene.height
+        self.tables = [bytes(color[channel] for color in scene.palette).ljust(256, b"\x00") for channel in range(3)]
+        self.final_block = zlib.compressobj(KITTY_COMPRESSION, zlib.DEFLATED, -15).flush()
+
+    def encode_band(self, pixels: bytes, band: int) -> Tuple[bytes, int, int]:
+        width = self.width
+        indices = pixels[band * BAND_ROWS * width:min((band + 1) * BAND_ROWS, self.height) * width]
+        rgb = bytearray(len(indices) * 3)
+        for channel, table in enumerate(self.tables):
+            rgb[channel::3] = indices.translate(table)
+        compressor = zlib.compressobj(KITTY_COMPRESSION, zlib.DEFLATED, -15)
+        return compressor.compress(rgb) + compressor.flush(zlib.Z_FULL_FLUSH), zlib.adler32(rgb), len(rgb)
+
+    def encode(self, frame: PixelFrame) -> bytes:
+        background = frame.background
+        bands = background.encoded.get(self.protocol)
+        if bands is None:
+            bands = background.encoded[self.protocol] = [self.encode_band(background.pixels, band)
+                                                         for band in range(self.scene.bands)]
+        bands = list(bands)
+        for band in frame.dirty_bands():
+            bands[band] = self.encode_band(frame.pixels, band)
+        checksum = 1
+        for _, band_checksum, length in bands:
+            checksum = adler32_combine(checksum, band_checksum, length)
+        stream = b"".join([b"\x78\x01"] + [chunk for chunk, _, _ in bands] + [self.final_block, struct.pack(">I", checksum)])
+        payload = base64.standard_b64encode(stream)
+        parts = []
+        for position in range(0, len(payload), KITTY_CHUNK):
+            more = int(position + KITTY_CHUNK < len(payload))
+            if position == 0:
+                control = b"a=T,f=24,s=%d,v=%d,o=z,i=%d,p=1,q=2,C=1,m=%d" % (self.width, self.height, KITTY_IMAGE_ID, more)
+            else:
+                control = b"m=%d" % more
+            parts.append(b"\033_G%s;%s\033\\" % (control, payload[position:position + KITTY_CHUNK]))
+        return b"".join(parts)
+
+ENCODERS = {"sixel": SixelEncoder, "kitty": KittyEncoder}
+
+SIXEL_TOKEN = re.compile(rb'"(\d+);(\d+);(\d+);(\d+)|#(\d+)(?:;2;(\d+);(\d+);(\d+))?|!(\d+)([?-~])|([?-~$-])')
+
+def decode_sixel(data: bytes) -> Tuple[int, int, Dict[int, RGB], bytearray]:
+    body = data[data.index(b"q") + 1:data.rindex(b"\033\\")]
+    width = height = 0
+    palette: Dict[int, RGB] = {}
+    pixels = bytearray()
+    color = x = y = 0
+    for match in SIXEL_TOKEN.finditer(body):
+        raster, _, raster_width, raster_height, register, red, green, blue, count, repeated, char = match.groups()
+        if raster is not None:
+            width, height = int(raster_width), int(raster_height)
+            pixels = bytearray(width * height)
+        elif register is not None:
+            color = int(register)
+            if red is not None:
+                palette[color] = tuple(round(int(value) * 255 / 100) for value in (red, green, blue))
+        elif char == b"$":
+            x = 0
+        elif char == b"-":
+            x = 0
+            y += BAND_ROWS
+        else:
+            value = (repeated or char)[0] - 63
+            for _ in range(int(count) if count else 1):
+                for bit in range(BAND_ROWS):
+                    if value >> bit & 1 and y + bit < height and x < width:
+                        pixels[(y + bit) * width + x] = color
+                x += 1
+    return width, height, palette, pixels
+
+KITTY_COMMAND = re.compile(rb'\033_G([^;\033]*);([^\033]*)\033\\')
+
+def decode_kitty(data: bytes) -> Tuple[int, int, bytes]:
+    keys: Dict[str, str] = {}
+    payload = []
+    for control, chunk in KITTY_COMMAND.findall(data):
+        for item in control.decode('ascii').split(','):
+            key, value = item.split('=', 1)
+            keys.setdefault(key, value)
+        payload.append(chunk)
+    raw = base64.standard_b64decode(b"".join(payload))
+    if keys.get('o') == 'z':
+        raw = zlib.decompress(raw)
+    return int(keys['s']), int(keys['v']), raw
+
+class PixelRenderer:
+    def __init__(self, renderer: AtomRenderer, protocol: str = "sixel", width: int = DEFAULT_PIXEL_SIZE[0],
+                 height: int = DEFAULT_PIXEL_SIZE[1]):
+        if protocol not in ENCODERS:
+            raise ValueError(f"Unknown graphics protocol: {protocol}")
+        self.renderer = renderer
+        self.protocol = protocol
+        self.scene = PixelScene(renderer, width, height)
+        self.encoder = ENCODERS[protocol](self.scene)
+        self.bytes_last_frame = 0
+        self.encode_ms = 0.0
+
+    def encode_frame(self, element: Element, time_step: float) -> bytes:
+        started = time.perf_counter()
+        image = self.encoder.encode(self.scene.draw(element, time_step))
+        self.encode_ms = (time.perf_counter() - started) * 1000
+        self.bytes_last_frame = len(image)
+        return image
+
+    def status(self, element: Element, controls: Optional[AnimationControls]) -> str:
+        renderer = self.renderer
+        status = controls.status() if controls is not None else f"{Colors.INFO}Press Ctrl+C to stop animation{Colors.RESET}"
+        status += (f" {Colors.DIM}| {renderer.display_name(element)} ({element.symbol}) | {self.protocol} "
+                   f"{self.scene.width}x{self.scene.height} | {self.bytes_last_frame} B/frame | "
+                   f"encode {self.encode_ms:.1f} ms{Colors.RESET}")
+        if renderer.scheduler.frames > 2:
+            status += f" {Colors.DIM}| {renderer.scheduler.achieved_fps():.1f} fps{Colors.RESET}"
+        return status
+
+    def write_frames(self, element: Element, output: TextIO, frames: int = 1) -> int:
+        writer = FrameWriter(output, synchronized=False)
+        scheduler = self.renderer.scheduler
+        scheduler.set_period(loop_period(get_electron_shells(element.atomic_number)))
+        total = 0
+        for frame in range(frames):
+            total += writer.prepare_bytes(self.encode_frame(element, scheduler.frame_time_step(frame)), CURSOR_HOME, b"\n")
+            writer.flush()
+        return total
+
+    def run(self, element: Element, frames: Optional[int] = None, duration: Optional[float] = None):
+        scheduler = self.renderer.scheduler
+        controls = AnimationControls(scheduler, element.atomic_number)
+        writer = self.renderer.diff_renderer.frame_writer()
+        shown = [element]
+
+        def draw_frame(active: Optional[AnimationControls]):
+            if controls.atomic_number != shown[0].atomic_number:
+                shown[0] = get_element(controls.atomic_number)
+                scheduler.set_period(loop_period(get_electron_shells(shown[0].atomic_number)))
+            image = self.encode_frame(shown[0], scheduler.begin_frame())
+            header = f"{self.status(shown[0], active)}\033[K\n{active.help_line() if active else ''}\033[K\n"
+            writer.prepare_bytes(image, CURSOR_HOME + header.encode('utf-8'))
+            writer.flush()
+
+        def stop():
+            writer.prepare_bytes(self.encoder.clear)
+            writer.flush()
+
+        scheduler.set_period(loop_period(get_electron_shells(element.atomic_number)))
+        run_animation(controls, draw_frame, frames, duration, on_stop=stop)
@@ -1,140 +1,289 @@
 import math
+import shutil
+import signal
 import time
-from typing import List
-from colors import Colors, clear_screen, hide_cursor, show_cursor
-from elements import Element, get_electron_shells, get_electron_configuration
+from typing import TYPE_CHECKING, Dict, List, Optional, TextIO, Tuple
+from colors import Colors, clear_screen, trail_gradient
+from elements import ELEMENTS, Element, get_element, get_electron_shells, get_electron_configuration
+from braille import BrailleRasterizer
+from cellbuffer import BLANK, STYLES, CellBuffer, Frame
+from framecache import DEFAULT_CACHE_BYTES, CycleFrame, FrameCache, FrameCycle
+from layers import Background, LayerCache
+from geometry import ELECTRON_BLINK_RATE, NUCLEUS_PULSE_RATE, OrbitGeometry, blink, get_orbit_geometry, loop_period, shell_speed
+from keyboard import AnimationControls, run_animation
+from nucleus import NucleusLayout, cluster_size, get_nucleus_layout
+from scheduler import FrameScheduler
+from terminal import DiffRenderer
+
+if TYPE_CHECKING:
+    from bandwidth import BandwidthGovernor
+    from perf import PerfMonitor
+    from pipeline import FramePipeline
+
+INFO_PANEL_ROWS = 11
+HEADER_ROWS = 2
+MIN_WIDTH = 20
+MIN_HEIGHT = 10
+RESIZE_SETTLE = 0.1
+TRAIL_OFFSET = 0.4
+TRAIL_SPACING = 0.1
+SHELL_BASE_RADIUS = 8
+SHELL_SPACING = 4
+NUCLEUS_MAX_SIZE = 5
+NUCLEUS_CLEARANCE = 3
+RING_SAMPLES = 48
+STATUS_REFRESH = 2.0
+RASTER_MODES = ("cell", "braille")
+ELECTRON_BACKENDS = ("python", "numpy")
+MAX_SHELLS = len(get_electron_shells(max(ELEMENTS)))
+
+def base_shell_radii(shell_count: int) -> List[int]:
+    return [SHELL_BASE_RADIUS + shell_idx * SHELL_SPACING for shell_idx in range(shell_count)]
+
+def nucleus_size(nucleons: int, first_radius: int) -> int:
+    return cluster_size(nucleons, max(1, min(NUCLEUS_MAX_SIZE, first_radius - NUCLEUS_CLEARANCE)))
+
+def terminal_grid_size(extra_rows: int = 0) -> Tuple[int, int]:
+    columns, lines = shutil.get_terminal_size((100, 40 + INFO_PANEL_ROWS))
+    return max(MIN_WIDTH, columns), max(MIN_HEIGHT, lines - INFO_PANEL_ROWS - extra_rows)
 
 class AtomRenderer:
-    def __init__(self, width: int = 100, height: int = 40):
-        self.width = width
-        self.height = height
-        self.center_x = width // 2
-        self.center_y = height // 2
+    def __init__(self, width: Optional[int] = None, height: Optional[int] = None, fps: float = 8.0, raster: str = "cell",
+                 backend: str = "python", pipelined: bool = False, frame_cache_bytes: int = DEFAULT_CACHE_BYTES):
+        if raster not in RASTER_MODES:
+            raise ValueError(f"Unknown raster mode: {raster}")
+        if backend not in ELECTRON_BACKENDS:
+            raise ValueError(f"Unknown electron backend: {backend}")
+        self.raster = raster
+        self.backend = backend
+        self.pipelined = pipelined
+        self.auto_size = width is None and height is None
+        if self.auto_size:
+            width, height = terminal_grid_size()
+        self.width = width or 100
+        self.height = height or 40
+        self.center_x = self.width // 2
+        self.center_y = self.height // 2
+        self._shell_radii: Dict[int, List[int]] = {}
+        self.isotopes: Dict[int, int] = {}
+        self.resize_pending = False
+        self.last_resize_signal = 0.0
         self.shell_colors = [
             Colors.SHELL_1, Colors.SHELL_2, Colors.SHELL_3, Colors.SHELL_4,
             Colors.SHELL_5, Colors.SHELL_6, Colors.SHELL_7
         ]
         self.frame_buffer = []
+        self.diff_renderer = DiffRenderer()
+        self.scheduler = FrameScheduler(fps)
+        self.layers = LayerCache()
+        self.frame_cache = FrameCache(frame_cache_bytes) if frame_cache_bytes > 0 else None
+        self.perf: Optional['PerfMonitor'] = None
+        self.controls: Optional[AnimationControls] = None
+        self.pipeline: Optional['FramePipeline'] = None
+        self.governor: Optional['BandwidthGovernor'] = None
+        self.held_stats: Optional[Tuple[str, float]] = None
+        self.ring_samples = RING_SAMPLES
+        self.braille = BrailleRasterizer(self)
+        self.vectorized = None
+        if backend == "numpy":
+            from vectorized import VectorizedElectrons
+            self.vectorized = VectorizedElectrons(self)
+        
+        self.glyph_dot = ord('·')
+        self.glyph_electrons = [ord(symbol) for symbol in ['●', '◉', '⬢', '◆']]
+        self.glyph_proton = ord('●')
+        self.glyph_proton_pulse = ord('◉')
+        self.glyph_neutron = ord('○')
+        self.style_proton = STYLES.intern(f"{Colors.PROTON}{Colors.BOLD}")
+        self.style_neutron = STYLES.intern(Colors.NEUTRON)
+        self.style_electron = STYLES.intern(f"{Colors.BRIGHT_WHITE}{Colors.BOLD}")
+        self.style_trail = STYLES.intern(f"{Colors.WHITE}{Colors.DIM}")
+        gradient = trail_gradient()
+        if gradient:
+            self.trail = [(TRAIL_SPACING * (i + 1), STYLES.intern(color)) for i, color in enumerate(gradient)]
+        else:
+            self.trail = [(TRAIL_OFFSET, self.style_trail)]
+        self.full_trail = self.trail
+        self.trail_over_rings = bool(gradient)
+        self.trail_flags = bytearray(256)
+        for _, style in self.trail:
+            self.trail_flags[style] = 1
+        self.style_shells = [STYLES.intern(color) for color in self.shell_colors]
+        self.style_shells_bold = [STYLES.intern(f"{color}{Colors.BOLD}") for color in self.shell_colors]
+        self.style_shell_default = STYLES.intern(Colors.ELECTRON)
+        self.style_shell_default_bold = STYLES.intern(f"{Colors.ELECTRON}{Colors.BOLD}")
     
-    def create_grid(self) -> List[List[str]]:
-        return [[' ' for _ in range(self.width)] for _ in range(self.height)]
-    
-    def draw_nucleus(self, grid: List[List[str]], element: Element, time_step: float = 0):
-        neutrons = round(element.atomic_mass) - element.atomic_number
-        nucleus_size = 3
-        actual_size = nucleus_size
-        
-        for dy in range(-int(actual_size), int(actual_size) + 1):
-            for dx in range(-int(actual_size), int(actual_size) + 1):
-                x = self.center_x + dx
-                y = self.center_y + dy
-                distance = math.sqrt(dx*dx + dy*dy)
-                
-                if 0 <= x < self.width and 0 <= y < self.height and distance <= actual_size:
-                    if distance <= 1:
-                        if int(time_step * 2) % 2 == 0:
-                            grid[y][x] = f"{Colors.BLUE}{Colors.BOLD}●{Colors.RESET}"
-                        else:
-                            grid[y][x] = f"{Colors.BLUE}{Colors.BOLD}◉{Colors.RESET}"
-                    elif distance <= 2:
-                        grid[y][x] = f"{Colors.BRIGHT_BLUE}●{Colors.RESET}"
-                    else:
-                        grid[y][x] = f"{Colors.CYAN}●{Colors.RESET}"
-    
-    def draw_electron_shells_static(self, grid: List[List[str]], element: Element):
-        shells = get_electron_shells(element.atomic_number)
+    def create_grid(self) -> CellBuffer:
+        return CellBuffer(self.width, self.height)
+    
+    def neutron_count(self, element: Element) -> int:
+        return self.isotopes.get(element.atomic_number, round(element.atomic_mass) - element.atomic_number)
+    
+    def display_name(self, element: Element) -> str:
+        if element.atomic_number in self.isotopes:
+            return f"{element.name}-{element.atomic_number + self.isotopes[element.atomic_number]}"
+        return element.name
+    
+    def nucleus_layout(self, element: Element) -> NucleusLayout:
+        neutrons = self.neutron_count(element)
+        first_radius = self.shell_radius(0, MAX_SHELLS)
+        return get_nucleus_layout(element.atomic_number, neutrons, nucleus_size(element.atomic_number + neutrons, first_radius))
+    
+    def blit_nucleons(self, grid: CellBuffer, nucleons: List[Tuple[int, int, bool]], pulse: bool):
+        glyphs, styles = grid.glyphs, grid.styles
+        width, height = self.width, self.height
+        center_x, center_y = self.center_x, self.center_y
+        proton = (self.glyph_proton_pulse if pulse else self.glyph_proton, self.style_proton)
+        neutron = (self.glyph_neutron, self.style_neutron)
+        for dx, dy, is_proton in nucleons:
+            x = center_x + dx
+            y = center_y + dy
+            if 0 <= x < width and 0 <= y < height:
+                index = y * width + x
+                glyphs[index], styles[index] = proton if is_proton else neutron
+    
+    def nucleus_pulse(self, element: Element, time_step: float) -> bool:
+        return bool(blink(time_step, NUCLEUS_PULSE_RATE, loop_period(get_electron_shells(element.atomic_number))))
+    
+    def draw_nucleus(self, grid: CellBuffer, element: Element, time_step: float = 0):
+        self.blit_nucleons(grid, self.nucleus_layout(element).cells, self.nucleus_pulse(element, time_step))
+    
+    def resize(self, width: int, height: int) -> bool:
+        if (width, height) == (self.width, self.height):
+            return False
+        self.width = width
+        self.height = height
+        self.center_x = width // 2
+        self.center_y = height // 2
+        self._shell_radii.clear()
+        self.layers.clear()
+        if self.frame_cache is not None:
+            self.frame_cache.clear()
+        self.diff_renderer.reset()
+        return True
+    
+    def fit_terminal(self) -> bool:
+        extra_rows = len(self.perf.hud_lines()) if self.perf is not None and self.perf.hud else 0
+        return self.resize(*terminal_grid_size(extra_rows))
+    
+    def handle_resize_signal(self, signum, frame):
+        self.resize_pending = True
+        self.last_resize_signal = time.monotonic()
+    
+    def apply_pending_resize(self) -> bool:
+        if not self.resize_pending or time.monotonic() - self.last_resize_signal < RESIZE_SETTLE:
+            return False
+        self.resize_pending = False
+        if self.auto_size:
+            self.fit_terminal()
+        self.diff_renderer.reset()
+        return True
+    
+    def shell_radii(self, shell_count: int) -> List[int]:
+        radii = self._shell_radii.get(shell_count)
+        if radii is None:
+            radii = base_shell_radii(shell_count)
+            limit = min(self.center_x - 1, int((self.center_y - 1) / 0.85))
+            if radii and radii[-1] > limit:
+                scale = limit / radii[-1]
+                previous = 3
+                for shell_idx, radius in enumerate(radii):
+                    previous = max(int(radius * scale), previous + 1)
+                    radii[shell_idx] = previous
+            self._shell_radii[shell_count] = radii
+        return radii
+    
+    def shell_radius(self, shell_idx: int, shell_count: Optional[int] = None) -> int:
+        return self.shell_radii(max(shell_count or 0, shell_idx + 1))[shell_idx]
+    
+    def shell_geometry(self, shell_idx: int, samples: int, shell_count: Optional[int] = None) -> OrbitGeometry:
+        return get_orbit_geometry(self.width, self.height, self.shell_radius(shell_idx, shell_count), samples)
+    
+    def shell_style(self, shell_idx: int, bold: bool = False) -> int:
+        if shell_idx < len(self.shell_colors):
+            return self.style_shells_bold[shell_idx] if bold else self.style_shells[shell_idx]
+        return self.style_shell_default_bold if bold else self.style_shell_default
+    
+    def draw_nucleus_core(self, grid: CellBuffer, element: Element, time_step: float):
+        self.blit_nucleons(grid, self.nucleus_layout(element).core, self.nucleus_pulse(element, time_step))
+    
+    def draw_orbit_rings(self, grid: CellBuffer, shells: List[int], samples: int, highlight_major: bool = False):
+        glyphs, styles = grid.glyphs, grid.styles
+        glyph_dot = self.glyph_dot
         
-        for shell_idx, electron_count in enumerate(shells):
-            color = self.shell_colors[shell_idx] if shell_idx < len(self.shell_colors) else Colors.ELECTRON
-            radius = 8 + shell_idx * 4
-            
-            for angle in [i * math.pi / 32 for i in range(64)]:
-                x = int(self.center_x + radius * math.cos(angle))
-                y = int(self.center_y + radius * math.sin(angle) * 0.85)
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    if grid[y][x] == ' ':
-                        if angle % (math.pi/4) < 0.2:
-                            grid[y][x] = f"{color}{Colors.BOLD}·{Colors.RESET}"
-                        else:
-                            grid[y][x] = f"{color}·{Colors.RESET}"
-            
-            electron_symbols = ['●', '◉', '⬢', '◆']
-            for e in range(electron_count):
-                angle = (2 * math.pi * e) / electron_count
-                x = int(self.center_x + radius * math.cos(angle))
-                y = int(self.center_y + radius * math.sin(angle) * 0.85)
-                
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    symbol_idx = (shell_idx + e) % len(electron_symbols)
-                    grid[y][x] = f"{Colors.BRIGHT_WHITE}{Colors.BOLD}{electron_symbols[symbol_idx]}{Colors.RESET}"
-    
-    def draw_electron_shells_animated(self, grid: List[List[str]], element: Element, time_step: float):
-        shells = get_electron_shells(element.atomic_number)
+        for shell_idx in range(len(shells)):
+            geometry = self.shell_geometry(shell_idx, samples, len(shells))
+            minor_style = self.shell_style(shell_idx)
+            major_style = self.shell_style(shell_idx, bold=True) if highlight_major else minor_style
+            for index, major in geometry.ring_indices:
+                if glyphs[index] == BLANK:
+                    glyphs[index] = glyph_dot
+                    styles[index] = major_style if major else minor_style
+    
+    def draw_electrons_static(self, grid: CellBuffer, shells: List[int]):
+        glyphs, styles = grid.glyphs, grid.styles
         
         for shell_idx, electron_count in enumerate(shells):
-            color = self.shell_colors[shell_idx] if shell_idx < len(self.shell_colors) else Colors.ELECTRON
-            radius = 8 + shell_idx * 4
-            rotation_speed = 1.5 - shell_idx * 0.2  
-            actual_radius = radius
-            
-            for angle in [i * math.pi / 24 for i in range(48)]:
-                x = int(self.center_x + actual_radius * math.cos(angle))
-                y = int(self.center_y + actual_radius * math.sin(angle) * 0.85)
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    if grid[y][x] == ' ':
-                        grid[y][x] = f"{color}·{Colors.RESET}"
-            
+            geometry = self.shell_geometry(shell_idx, 64, len(shells))
             for e in range(electron_count):
-                base_angle = (2 * math.pi * e) / electron_count
-                animated_angle = base_angle + time_step * rotation_speed
-                
-                x = int(self.center_x + actual_radius * math.cos(animated_angle))
-                y = int(self.center_y + actual_radius * math.sin(animated_angle) * 0.85)
-                
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    if int(time_step * 3) % 2 == 0:
-                        grid[y][x] = f"{Colors.BRIGHT_WHITE}{Colors.BOLD}●{Colors.RESET}"
-                    else:
-                        grid[y][x] = f"{Colors.BRIGHT_WHITE}{Colors.BOLD}◉{Colors.RESET}"
-                        
-                trail_angle = animated_angle - 0.4
-                trail_x = int(self.center_x + actual_radius * math.cos(trail_angle))
-                trail_y = int(self.center_y + actual_radius * math.sin(trail_angle) * 0.85)
-                
-                if 0 <= trail_x < self.width and 0 <= trail_y < self.height:
-                    if grid[trail_y][trail_x] == ' ':
-                        grid[trail_y][trail_x] = f"{Colors.WHITE}{Colors.DIM}·{Colors.RESET}"
-    
-    def build_frame_buffer(self, element: Element, animated: bool = False, time_step: float = 0):
-        buffer = []
-        
-        mode = "Animated" if animated else "Static"
-        if animated:
-            
-            buffer.append(f"{Colors.INFO}Press Ctrl+C to stop animation{Colors.RESET}")
-        else:
-            buffer.append(f"{Colors.BOLD}{Colors.HEADER}⚛️  {element.name} ({element.symbol}){Colors.RESET}")
-        
-        buffer.append("") 
+                index = geometry.index_at((2 * math.pi * e) / electron_count)
+                if index >= 0:
+                    glyphs[index] = self.glyph_electrons[(shell_idx + e) % len(self.glyph_electrons)]
+                    styles[index] = self.style_electron
+    
+    def draw_electrons_animated(self, grid: CellBuffer, shells: List[int], time_step: float):
+        if self.vectorized is not None:
+            self.vectorized.draw_electrons_animated(grid, shells, time_step)
+            return
+        glyphs, styles = grid.glyphs, grid.styles
+        glyph_dot = self.glyph_dot
+        electron_glyph = self.glyph_electrons[blink(time_step, ELECTRON_BLINK_RATE, loop_period(shells))]
+        electron_style = self.style_electron
+        trail_flags = self.trail_flags
+        over_rings = self.trail_over_rings
         
-        grid = self.create_grid()
-        self.draw_nucleus(grid, element, time_step)
-        if animated:
-            self.draw_electron_shells_animated(grid, element, time_step)
-        else:
-            self.draw_electron_shells_static(grid, element)
+        orbits = []
+        for shell_idx, electron_count in enumerate(shells):
+            index_at = self.shell_geometry(shell_idx, 48, len(shells)).index_at
+            rotation = time_step * shell_speed(shell_idx)
+            orbits.append((index_at, [(2 * math.pi * e) / electron_count + rotation for e in range(electron_count)]))
         
-        for row in grid:
-            buffer.append(''.join(row))
+        for offset, trail_style in self.trail:
+            for index_at, angles in orbits:
+                for animated_angle in angles:
+                    index = index_at(animated_angle - offset)
+                    if index >= 0:
+                        glyph = glyphs[index]
+                        if glyph == BLANK or (over_rings and glyph == glyph_dot and not trail_flags[styles[index]]):
+                            glyphs[index] = glyph_dot
+                            styles[index] = trail_style
         
-        neutrons = round(element.atomic_mass) - element.atomic_number
+        for index_at, angles in orbits:
+            for animated_angle in angles:
+                index = index_at(animated_angle)
+                if index >= 0:
+                    glyphs[index] = electron_glyph
+                    styles[index] = electron_style
+    
+    def draw_electron_shells_static(self, grid: CellBuffer, element: Element):
+        shells = get_electron_shells(element.atomic_number)
+        self.draw_orbit_rings(grid, shells, 64, highlight_major=True)
+        self.draw_electrons_static(grid, shells)
+    
+    def draw_electron_shells_animated(self, grid: CellBuffer, element: Element, time_step: float):
         shells = get_electron_shells(element.atomic_number)
+        self.draw_orbit_rings(grid, shells, self.ring_samples)
+        self.draw_electrons_animated(grid, shells, time_step)
+    
+    def build_info_panel(self, element: Element, shells: List[int]) -> List[str]:
+        neutrons = self.neutron_count(element)
         electron_config = get_electron_configuration(element.atomic_number)
         
-        buffer.append("") 
-        buffer.append("") 
-        buffer.append(f"{Colors.BOLD}{Colors.HEADER}⚛️  {element.name} ({element.symbol}){Colors.RESET}")
-        buffer.append(f"{Colors.INFO}Protons: {Colors.PROTON}{element.atomic_number}{Colors.RESET} | Neutrons: {Colors.NEUTRON}{neutrons}{Colors.RESET} | Electrons: {Colors.ELECTRON}{element.atomic_number}{Colors.RESET}")
+        footer = []
+        footer.append("") 
+        footer.append("") 
+        footer.append(f"{Colors.BOLD}{Colors.HEADER}⚛️  {self.display_name(element)} ({element.symbol}){Colors.RESET}")
+        footer.append(f"{Colors.INFO}Protons: {Colors.PROTON}{element.atomic_number}{Colors.RESET} | Neutrons: {Colors.NEUTRON}{neutrons}{Colors.RESET} | Electrons: {Colors.ELECTRON}{element.atomic_number}{Colors.RESET}")
         
         shell_line = f"{Colors.INFO}Shells: {Colors.RESET}"
         for i, count in enumerate(shells):
@@ -144,49 +293,218 @@ class AtomRenderer:
             shell_line += f"{color}{shell_name}:{count}{Colors.RESET}"
             if i < len(shells) - 1:
                 shell_line += " | "
-        buffer.append(shell_line)
+        footer.append(shell_line)
+        
+        footer.append(f"{Colors.INFO}Configuration: {Colors.BRIGHT_YELLOW}{electron_config}{Colors.RESET}")
+        footer.append(f"{Colors.INFO}Category: {Colors.HIGHLIGHT}{element.category}{Colors.RESET}")
+        footer.append(f"{Colors.INFO}Atomic Mass: {Colors.HIGHLIGHT}{element.atomic_mass}{Colors.RESET}")
+        return footer
+    
+    def background(self, element: Element, animated: bool) -> Background:
+        key = (element.atomic_number, self.neutron_count(element), self.width, self.height, animated, self.raster,
+               self.ring_samples if animated else 0)
+        layer = self.layers.get(key)
+        if layer is None:
+            shells = get_electron_shells(element.atomic_number)
+            if self.raster == "braille":
+                grid = self.braille.background(shells, animated)
+            else:
+                grid = self.create_grid()
+                self.draw_nucleus(grid, element)
+                if animated:
+                    self.draw_orbit_rings(grid, shells, self.ring_samples)
+                else:
+                    self.draw_electron_shells_static(grid, element)
+            layer = Background(grid, self.build_info_panel(element, shells), shells)
+            self.layers.put(key, layer)
+        return layer
+    
+    def enable_bandwidth_budget(self, budget: Optional[float] = None) -> 'BandwidthGovernor':
+        from bandwidth import BandwidthGovernor
+        self.governor = BandwidthGovernor(self.scheduler.fps, budget)
+        return self.governor
+    
+    def apply_quality(self):
+        level = self.governor.level
+        self.ring_samples = level.ring_samples
+        self.trail = self.full_trail if level.trails else []
+        self.diff_renderer.resend_footer = level.live_panel
+    
+    def update_bandwidth(self):
+        writers = self.pipeline.buffers if self.pipeline is not None else [self.diff_renderer.frame_writer()]
+        if self.governor.record(sum(writer.written_bytes for writer in writers), sum(writer.write_time for writer in writers)):
+            self.apply_quality()
+        self.scheduler.throttle(self.governor.pace_fps)
+    
+    def frame_stats(self) -> str:
+        stats = ""
+        if self.diff_renderer.frames:
+            stats += f" {Colors.DIM}| {self.diff_renderer.bytes_last_frame} B/frame{Colors.RESET}"
+        if self.scheduler.frames > 2:
+            stats += f" {Colors.DIM}| {self.scheduler.achieved_fps():.1f} fps ±{self.scheduler.jitter_ms():.1f} ms{Colors.RESET}"
+        governor = self.governor
+        if governor is None:
+            return stats
+        stats += f" {Colors.DIM}| {governor.status()}{Colors.RESET}"
+        now = time.monotonic()
+        if governor.level.live_panel or self.held_stats is None or now - self.held_stats[1] >= STATUS_REFRESH:
+            self.held_stats = (stats, now)
+        return self.held_stats[0]
+    
+    def enable_perf(self, hud: bool = True, export_path: Optional[str] = None) -> 'PerfMonitor':
+        from perf import PerfMonitor
+        self.perf = PerfMonitor(hud=hud, export_path=export_path)
+        self.diff_renderer.perf = self.perf
+        return self.perf
+    
+    def build_grid(self, element: Element, animated: bool = False, time_step: float = 0) -> CellBuffer:
+        layer = self.background(element, animated)
+        if self.raster == "braille":
+            grid = self.braille.draw_frame(layer.grid, layer.shells, time_step) if animated else layer.grid.to_cells()
+            self.draw_nucleus(grid, element, time_step)
+        else:
+            grid = layer.grid.copy()
+            if animated:
+                self.draw_nucleus_core(grid, element, time_step)
+                self.draw_electrons_animated(grid, layer.shells, time_step)
+        return grid
+    
+    def frame_cycle(self, element: Element) -> FrameCycle:
+        key = (element.atomic_number, self.neutron_count(element), self.width, self.height, self.scheduler.fps, self.raster,
+               self.ring_samples, len(self.trail))
+        cycle = self.frame_cache.get(key)
+        if cycle is None:
+            period = loop_period(get_electron_shells(element.atomic_number))
+            cycle = FrameCycle(period, self.scheduler.loop_frames(period), self.width, self.height, HEADER_ROWS,
+                               lambda time_step: self.build_grid(element, True, time_step), self.frame_cache.max_bytes)
+            self.frame_cache.put(key, cycle)
+        return cycle
+    
+    def build_frame(self, element: Element, animated: bool = False, time_step: float = 0,
+                    cycle: Optional[FrameCycle] = None) -> Frame:
+        perf = self.perf
+        if perf is not None:
+            started = time.perf_counter_ns()
         
-        buffer.append(f"{Colors.INFO}Configuration: {Colors.BRIGHT_YELLOW}{electron_config}{Colors.RESET}")
-        buffer.append(f"{Colors.INFO}Category: {Colors.HIGHLIGHT}{element.category}{Colors.RESET}")
-        buffer.append(f"{Colors.INFO}Atomic Mass: {Colors.HIGHLIGHT}{element.atomic_mass}{Colors.RESET}")
+        layer = self.background(element, animated)
+        grid = self.build_grid(element, animated, time_step) if cycle is None else None
         
-        return buffer
+        if perf is not None:
+            drawn = time.perf_counter_ns()
+            perf.add("draw", drawn - started)
+        
+        header = []
+        
+        mode = "Animated" if animated else "Static"
+        if animated:
+            if self.controls is not None:
+                status = self.controls.status()
+            else:
+                status = f"{Colors.INFO}Press Ctrl+C to stop animation{Colors.RESET}"
+            header.append(status + self.frame_stats())
+        else:
+            header.append(f"{Colors.BOLD}{Colors.HEADER}⚛️  {self.display_name(element)} ({element.symbol}){Colors.RESET}")
+        
+        header.append(self.controls.help_line() if animated and self.controls is not None else "") 
+        
+        footer = list(layer.footer)
+        if perf is not None:
+            footer.extend(perf.hud_lines())
+        if cycle is not None:
+            frame = CycleFrame(header, footer, cycle, cycle.index_at(time_step))
+        else:
+            frame = Frame(header, grid, footer)
+        
+        if perf is not None:
+            perf.add("compose", time.perf_counter_ns() - drawn)
+        return frame
+    
+    def build_frame_buffer(self, element: Element, animated: bool = False, time_step: float = 0) -> List[str]:
+        return self.build_frame(element, animated, time_step).lines()
     
     def render_frame_buffer(self, buffer: List[str]):
-        print("\033[H", end="")
-        output = "\n".join(buffer)
-        print(output)
-        print("\033[J", end="")
+        self.diff_renderer.frame_writer().write_lines(buffer)
     
     def draw_static_atom(self, element: Element):
+        if self.auto_size:
+            self.fit_terminal()
         clear_screen()
         buffer = self.build_frame_buffer(element, animated=False)
         self.render_frame_buffer(buffer)
     
     def draw_animated_frame(self, element: Element, time_step: float):
-        buffer = self.build_frame_buffer(element, animated=True, time_step=time_step)
-        self.render_frame_buffer(buffer)
+        if self.perf is not None:
+            self.perf.begin_frame()
+        cycle = None
+        if self.frame_cache is not None and self.scheduler.speed >= 1:
+            cycle = self.frame_cycle(element)
+        frame = self.build_frame(element, animated=True, time_step=time_step, cycle=cycle)
+        if self.pipeline is not None:
+            self.pipeline.submit(frame)
+        else:
+            self.diff_renderer.render(frame)
+        if cycle is not None:
+            if frame.built:
+                self.frame_cache.misses += 1
+                self.frame_cache.trim()
+            else:
+                self.frame_cache.hits += 1
+        if self.governor is not None:
+            self.update_bandwidth()
+        if self.perf is not None:
+            self.perf.end_frame(self.diff_renderer.bytes_last_frame, self.scheduler.achieved_fps(), self.dropped_frames())
+    
+    def dropped_frames(self) -> int:
+        dropped = self.scheduler.dropped_frames
+        if self.pipeline is not None:
+            dropped += self.pipeline.replaced_frames
+        return dropped
     
-    def draw_animated_atom(self, element: Element):
-        print(f"\n{Colors.BOLD}{Colors.HIGHLIGHT}🚀 Initializing atomic visualization...{Colors.RESET}")
-        print(f"{Colors.DIM}Press Ctrl+C to stop animation{Colors.RESET}")
-        time.sleep(1)
-        
-        try:
-            clear_screen()
-            hide_cursor()
-            
-            time_step = 0
-            frame_count = 0
-            
-            while True:
-                self.draw_animated_frame(element, time_step)
-                time.sleep(0.12)
-                time_step += 0.08
-                if time_step > 50:
-                    time_step = 0
-                    
-        except KeyboardInterrupt:
-            show_cursor()
-            clear_screen()
-            print(f"{Colors.INFO}Thank you for exploring the atomic world! ⚛️{Colors.RESET}")
+    def write_frames(self, element: Element, output: TextIO, animated: bool = False, frames: int = 1) -> int:
+        self.diff_renderer.stream = output
+        self.diff_renderer.reset()
+        self.scheduler.set_period(loop_period(get_electron_shells(element.atomic_number)))
+        for frame in range(frames if animated else 1):
+            time_step = self.scheduler.frame_time_step(frame)
+            self.diff_renderer.render(self.build_frame(element, animated=animated, time_step=time_step))
+        return self.diff_renderer.total_bytes
+    
+    def draw_animated_atom(self, element: Element, frames: Optional[int] = None, duration: Optional[float] = None):
+        previous_handler = None
+        if self.auto_size:
+            self.fit_terminal()
+        if hasattr(signal, "SIGWINCH"):
+            previous_handler = signal.signal(signal.SIGWINCH, self.handle_resize_signal)
+        
+        controls = AnimationControls(self.scheduler, element.atomic_number)
+        shown = [element]
+        
+        def start():
+            self.diff_renderer.reset()
+            if self.pipelined:
+                from pipeline import FramePipeline
+                self.pipeline = FramePipeline(self.diff_renderer)
+                self.pipeline.start()
+            self.scheduler.set_period(loop_period(get_electron_shells(element.atomic_number)))
+        
+        def draw_frame(active: Optional[AnimationControls]):
+            self.controls = active
+            if self.resize_pending:
+                if self.pipeline is not None:
+                    self.pipeline.wait_idle()
+                if self.apply_pending_resize():
+                    clear_screen()
+            if controls.atomic_number != shown[0].atomic_number:
+                shown[0] = get_element(controls.atomic_number)
+                self.scheduler.set_period(loop_period(get_electron_shells(shown[0].atomic_number)))
+            self.draw_animated_frame(shown[0], self.scheduler.begin_frame())
+        
+        def stop():
+            if self.pipeline is not None:
+                self.pipeline.close()
+                self.pipeline = None
+            self.controls = None
+            if previous_handler is not None:
+                signal.signal(signal.SIGWINCH, previous_handler)
+        
+        run_animation(controls, draw_frame, frames, duration, on_start=start, on_stop=stop)
@@ -0,0 +1,97 @@
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+ANIMATION_RATE = 0.08 / 0.12
+TIME_STEP_WRAP = 50
+MIN_SPEED = 0.125
+MAX_SPEED = 8.0
+
+class FrameScheduler:
+    def __init__(self, fps: float = 8.0, window: int = 60):
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, got {fps}")
+        self.fps = fps
+        self.interval = 1.0 / fps
+        self.frame_times: Deque[float] = deque(maxlen=window)
+        self.start_time = 0.0
+        self.next_deadline = 0.0
+        self.frames = 0
+        self.dropped_frames = 0
+        self.speed = 1.0
+        self.paused = False
+        self.animation_time = 0.0
+        self.last_tick = 0.0
+        self.period = float(TIME_STEP_WRAP)
+
+    def start(self):
+        now = time.monotonic()
+        self.start_time = now
+        self.next_deadline = now
+        self.last_tick = now
+        self.animation_time = 0.0
+        self.frame_times.clear()
+        self.frames = 0
+        self.dropped_frames = 0
+
+    def begin_frame(self) -> float:
+        now = time.monotonic()
+        self.frame_times.append(now)
+        self.frames += 1
+        if not self.paused:
+            self.animation_time += (now - self.last_tick) * self.speed
+        self.last_tick = now
+        return (self.animation_time * ANIMATION_RATE) % self.period
+
+    def frame_time_step(self, frame: int) -> float:
+        return (frame * self.interval * self.speed * ANIMATION_RATE) % self.period
+
+    def set_period(self, period: Optional[float]):
+        self.period = period or float(TIME_STEP_WRAP)
+
+    def loop_frames(self, period: float) -> int:
+        return max(1, round(period * self.fps / ANIMATION_RATE))
+
+    def throttle(self, fps: float):
+        self.interval = 1.0 / min(self.fps, fps)
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def set_speed(self, speed: float):
+        self.speed = min(MAX_SPEED, max(MIN_SPEED, speed))
+
+    def step(self, frames: int = 1):
+        self.paused = True
+        self.animation_time += frames * self.interval * self.speed
+
+    def advance(self) -> float:
+        self.next_deadline += self.interval
+        delay = self.next_deadline - time.monotonic()
+        if -delay >= self.interval:
+            missed = int(-delay / self.interval)
+            self.dropped_frames += missed
+            self.next_deadline += missed * self.interval
+        return max(0.0, delay)
+
+    def wait(self, sleep: Callable[[float], Optional[bool]] = time.sleep) -> bool:
+        delay = self.advance()
+        if delay > 0 and sleep(delay):
+            self.next_deadline = time.monotonic()
+            return True
+        return False
+
+    def achieved_fps(self) -> float:
+        if len(self.frame_times) < 2:
+            return 0.0
+        span = self.frame_times[-1] - self.frame_times[0]
+        return (len(self.frame_times) - 1) / span if span > 0 else 0.0
+
+    def jitter_ms(self) -> float:
+        if len(self.frame_times) < 3:
+            return 0.0
+        times = list(self.frame_times)
+        intervals = [b - a for a, b in zip(times, times[1:])]
+        mean = sum(intervals) / len(intervals)
+        return math.sqrt(sum((interval - mean) ** 2 for interval in intervals) / len(intervals)) * 1000
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import re
+import sys
+from typing import Dict, Optional, Set, Tuple
+from batch import positive_float, positive_int
+from colors import COLOR_LEVELS, Colors, set_color_level
+from elements import ELEMENTS, Element, find_element, get_electron_shells
+from geometry import loop_period, shared_loop_period
+from renderer import RASTER_MODES, AtomRenderer
+from scheduler import FrameScheduler
+from terminal import DiffRenderer
+
+TELNET_COMMAND = re.compile(rb'\xff[\xfb-\xfe].|\xff[\xf0-\xfa]')
+CLIENT_SETUP = "\033[2J\033[H\033[?25l"
+PROMPT_TIMEOUT = 30.0
+
+SSE_HEADERS = (
+    "HTTP/1.1 200 OK\r\n"
+    "Content-Type: text/event-stream; charset=utf-8\r\n"
+    "Cache-Control: no-cache\r\n"
+    "Connection: keep-alive\r\n"
+    "Access-Control-Allow-Origin: *\r\n"
+    "\r\n"
+)
+
+def encode_raw(text: str) -> bytes:
+    return text.replace("\n", "\r\n").encode('utf-8')
+
+def encode_sse(text: str) -> bytes:
+    return ("event: frame\n" + "".join(f"data: {line}\n" for line in text.split("\n")) + "\n").encode('utf-8')
+
+ENCODERS = {"raw": encode_raw, "sse": encode_sse}
+
+class Viewer:
+    def __init__(self, writer: asyncio.StreamWriter, kind: str, max_pending: int):
+        self.writer = writer
+        self.kind = kind
+        self.queue: 'asyncio.Queue[bytes]' = asyncio.Queue(maxsize=max_pending)
+        self.needs_full = True
+        self.sent_frames = 0
+        self.dropped_frames = 0
+
+    async def pump(self):
+        while True:
+            payload = await self.queue.get()
+            self.writer.write(payload)
+            await self.writer.drain()
+            self.sent_frames += 1
+
+class Channel:
+    def __init__(self, element: Element):
+        self.element = element
+        self.period = loop_period(get_electron_shells(element.atomic_number))
+        self.diff_renderer = DiffRenderer()
+        self.viewers: Set[Viewer] = set()
+
+    def tick(self, renderer: AtomRenderer, time_step: float):
+        frame = renderer.build_frame(self.element, animated=True, time_step=time_step % self.period)
+        status = f"{Colors.INFO}{self.element.name} ({self.element.symbol}) | {len(self.viewers)} viewer(s){Colors.RESET}"
+        if self.diff_renderer.frames:
+            status += f" {Colors.DIM}| {self.diff_renderer.bytes_last_frame} B/frame{Colors.RESET}"
+        frame.header = [status, ""]
+
+        diff = self.diff_renderer.encode(frame)
+        full = None
+        payloads: Dict[Tuple[str, bool], bytes] = {}
+        for viewer in self.viewers:
+            if viewer.needs_full:
+                if full is None:
+                    full = self.diff_renderer.full_frame(frame)
+                text = full
+            else:
+                text = diff
+            if not text:
+                continue
+            key = (viewer.kind, viewer.needs_full)
+            payload = payloads.get(key)
+            if payload is None:
+                payload = payloads[key] = ENCODERS[viewer.kind](text)
+            try:
+                viewer.queue.put_nowait(payload)
+                viewer.needs_full = False
+            except asyncio.QueueFull:
+                viewer.dropped_frames += 1
+                viewer.needs_full = True
+
+class FrameServer:
+    def __init__(self, default_element: Element, width: int = 100, height: int = 40, fps: float = 8.0,
+                 raster: str = "cell", max_pending: int = 4):
+        self.default_element = default_element
+        self.renderer = AtomRenderer(width, height, fps=fps, raster=raster)
+        self.scheduler = FrameScheduler(fps)
+        self.scheduler.set_period(shared_loop_period(get_electron_shells(z) for z in ELEMENTS))
+        self.max_pending = max_pending
+        self.channels: Dict[int, Channel] = {}
+
+    def subscribe(self, element: Element, viewer: Viewer) -> Channel:
+        channel = self.channels.get(element.atomic_number)
+        if channel is None:
+            channel = self.channels[element.atomic_number] = Channel(element)
+        channel.viewers.add(viewer)
+        return channel
+
+    def unsubscribe(self, channel: Channel, viewer: Viewer):
+        channel.viewers.discard(viewer)
+        if not channel.viewers and self.channels.get(channel.element.atomic_number) is channel:
+            del self.channels[channel.element.atomic_number]
+
+    async def stream(self, element: Element, viewer: Viewer, peer: str):
+        channel = self.subscribe(element, viewer)
+        print(f"{Colors.INFO}{peer} watching {element.symbol} via {viewer.kind} "
+              f"({sum(len(c.viewers) for c in self.channels.values())} viewers){Colors.RESET}", file=sys.stderr)
+        try:
+            await viewer.pump()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.unsubscribe(channel, viewer)
+            viewer.writer.close()
+            print(f"{Colors.DIM}{peer} left after {viewer.sent_frames} frames, "
+                  f"{viewer.dropped_frames} dropped{Colors.RESET}", file=sys.stderr)
+
+    async def handle_telnet(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = str(writer.get_extra_info('peername'))
+        writer.write(f"Atomic number, symbol or name [{self.default_element.symbol}]: ".encode('utf-8'))
+        try:
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), PROMPT_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError):
+            line = b""
+        query = TELNET_COMMAND.sub(b"", line).decode('utf-8', errors='ignore').strip()
+        element = find_element(query) if query else self.default_element
+        if element is None:
+            writer.write(f"Unknown element: {query}\r\n".encode('utf-8'))
+            writer.close()
+            return
+        viewer = Viewer(writer, "raw", self.max_pending)
+        writer.write(CLIENT_SETUP.encode('utf-8'))
+        await self.stream(element, viewer, peer)
+
+    async def handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = str(writer.get_extra_info('peername'))
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), PROMPT_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        parts = request.split(b"\r\n", 1)[0].decode('latin-1').split()
+        path = parts[1].split('?', 1)[0].strip('/') if len(parts) >= 2 else ""
+        element = find_element(path) if path else self.default_element
+        if len(parts) < 2 or parts[0] != "GET" or element is None:
+            body = "Not found. Try /26, /Fe or /iron.\n"
+            writer.write(f"HTTP/1.1 404 Not Found\r\nContent-Type: text/plain\r\nContent-Length: {len(body)}\r\n"
+                         f"Connection: close\r\n\r\n{body}".encode('utf-8'))
+            writer.close()
+            return
+        viewer = Viewer(writer, "sse", self.max_pending)
+        writer.write(SSE_HEADERS.encode('latin-1'))
+        await self.stream(element, viewer, peer)
+
+    async def tick_loop(self):
+        scheduler = self.scheduler
+        scheduler.start()
+        while True:
+            time_step = scheduler.begin_frame()
+            for channel in list(self.channels.values()):
+                channel.tick(self.renderer, time_step)
+            await asyncio.sleep(scheduler.advance())
+
+    async def serve(self, host: str, port: int, http_port: Optional[int]):
+        servers = [await asyncio.start_server(self.handle_telnet, host, port)]
+        print(f"{Colors.SUCCESS}Telnet/netcat viewers: nc {host} {port}{Colors.RESET}", file=sys.stderr)
+        if http_port is not None:
+            servers.append(await asyncio.start_server(self.handle_http, host, http_port))
+            print(f"{Colors.SUCCESS}SSE viewers: http://{host}:{http_port}/<element>{Colors.RESET}", file=sys.stderr)
+        ticks = asyncio.ensure_future(self.tick_loop())
+        try:
+            await asyncio.gather(*(server.serve_forever() for server in servers))
+        finally:
+            ticks.cancel()
+            for server in servers:
+                server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve one shared animation per element to many terminals.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=2323, help="telnet/netcat port (default: 2323)")
+    parser.add_argument("--http-port", type=int, default=8080, help="SSE port, 0 to disable (default: 8080)")
+    parser.add_argument("--element", default="1", help="element for viewers that do not choose one (default: 1)")
+    parser.add_argument("--fps", type=positive_float, default=8.0)
+    parser.add_argument("--width", type=positive_int, default=100)
+    parser.add_argument("--height", type=positive_int, default=40)
+    parser.add_argument("--raster", choices=RASTER_MODES, default="cell")
+    parser.add_argument("--colors", choices=COLOR_LEVELS, default="256",
+                        help="color support to render for, shared by every viewer (default: 256)")
+    parser.add_argument("--max-pending", type=positive_int, default=4, help="frames queued per viewer before dropping (default: 4)")
+    args = parser.parse_args()
+    set_color_level(args.colors)
+
+    element = find_element(args.element)
+    if element is None:
+        print(f"{Colors.ERROR}Unknown element: {args.element}{Colors.RESET}")
+        sys.exit(1)
+
+    server = FrameServer(element, args.width, args.height, args.fps, args.raster, args.max_pending)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.http_port or None))
+    except KeyboardInterrupt:
+        print(f"\n{Colors.HIGHLIGHT}Server stopped.{Colors.RESET}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+import argparse
+import math
+import os
+import sys
+import time
+from html import escape
+from typing import Iterable, List, Optional, Tuple
+from batch import parse_atomic_numbers, positive_int
+from colors import TRAIL_STEPS, Colors, default_rgb, mix_rgb, trail_rgb
+from elements import Element, get_element, get_electron_configuration, get_electron_shells
+from geometry import ELECTRON_BLINK_RATE, NUCLEUS_PULSE_RATE, blink_cycle, loop_period, shell_speed
+from nucleus import CELL_ASPECT
+from renderer import RING_SAMPLES, TRAIL_SPACING, AtomRenderer
+from scheduler import ANIMATION_RATE
+
+EXPORT_FORMATS = ("svg", "html")
+CELL_PIXELS = 12
+MARGIN = 1.5
+RING_DOT = 0.3
+ELECTRON_RADIUS = 0.45
+ELECTRON_CORE = 0.22
+TRAIL_RADIUS = 0.2
+PROTON_SIZE = 0.84
+NEUTRON_SIZE = 0.68
+NEUTRON_HOLE = 0.4
+PULSE_BRIGHTNESS = 0.4
+BACKGROUND_RGB = (0, 0, 0)
+PANEL_RGB = (204, 204, 204)
+SHELL_NAMES = ['K', 'L', 'M', 'N', 'O', 'P', 'Q']
+
+RGB = Tuple[int, int, int]
+
+def number(value: float) -> str:
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    if text.startswith("0."):
+        text = text[1:]
+    elif text.startswith("-0."):
+        text = "-" + text[2:]
+    return "0" if text in ("", "-0") else text
+
+def hex_rgb(rgb: RGB) -> str:
+    return "#%02x%02x%02x" % rgb
+
+def dots(points: Iterable[Tuple[int, int]]) -> str:
+    return "".join(f"M{x} {y}h0" for x, y in points)
+
+class SvgExporter:
+    def __init__(self, renderer: AtomRenderer, speed: float = 1.0):
+        self.renderer = renderer
+        self.speed = speed
+        self.electron = hex_rgb(default_rgb("BRIGHT_WHITE"))
+        self.trail = [(TRAIL_SPACING * (i + 1), hex_rgb(rgb)) for i, rgb in enumerate(trail_rgb(TRAIL_STEPS["truecolor"]))]
+        proton_rgb = default_rgb("PROTON")
+        self.proton = hex_rgb(proton_rgb)
+        self.proton_pulse = hex_rgb(mix_rgb(proton_rgb, default_rgb("BRIGHT_WHITE"), PULSE_BRIGHTNESS))
+        self.neutron = hex_rgb(default_rgb("NEUTRON"))
+        self.background = hex_rgb(BACKGROUND_RGB)
+
+    def shell_color(self, shell_idx: int) -> str:
+        name = f"SHELL_{shell_idx + 1}" if shell_idx < len(self.renderer.shell_colors) else "ELECTRON"
+        return hex_rgb(default_rgb(name))
+
+    def seconds(self, time_steps: float) -> str:
+        return f"{number(time_steps / ANIMATION_RATE / self.speed)}s"
+
+    def style(self, shells: List[int]) -> str:
+        period = loop_period(shells)
+        rules = [f".s{shell_idx}{{animation:spin {self.seconds(2 * math.pi / shell_speed(shell_idx))} linear infinite}}"
+                 for shell_idx in range(len(shells))]
+        rules.append(f".b{{opacity:0;animation:blink {self.seconds(blink_cycle(ELECTRON_BLINK_RATE, period))} step-end infinite}}")
+        rules.append(f".q{{opacity:0;animation:blink {self.seconds(blink_cycle(NUCLEUS_PULSE_RATE, period))} step-end infinite}}")
+        rules.append("@keyframes spin{to{transform:rotate(360deg)}}")
+        rules.append("@keyframes blink{50%{opacity:1}}")
+        return "".join(rules)
+
+    def electron_symbol(self, shell_idx: int, radius: int) -> str:
+        parts = [f'<g id="e{shell_idx}">']
+        for offset, color in reversed(self.trail):
+            parts.append(f'<circle cx="{number(radius * math.cos(offset))}" cy="{number(-radius * math.sin(offset))}" '
+                         f'r="{number(TRAIL_RADIUS)}" fill="{color}"/>')
+        parts.append(f'<circle cx="{radius}" r="{number(ELECTRON_RADIUS)}" fill="{self.electron}"/>')
+        parts.append(f'<circle class="b" cx="{radius}" r="{number(ELECTRON_CORE)}" fill="{self.shell_color(shell_idx)}"/>')
+        parts.append('</g>')
+        return "".join(parts)
+
+    def rings(self, radii: List[int]) -> str:
+        parts = []
+        for shell_idx, radius in enumerate(radii):
+            gap = 2 * math.pi * radius / RING_SAMPLES
+            parts.append(f'<circle r="{radius}" fill="none" stroke="{self.shell_color(shell_idx)}" '
+                         f'stroke-width="{number(RING_DOT)}" stroke-linecap="round" stroke-dasharray="0 {number(gap)}"/>')
+        return "".join(parts)
+
+    def nucleus(self, element: Element) -> str:
+        layout = self.renderer.nucleus_layout(element)
+        protons = [(dx, dy) for dx, dy, is_proton in layout.cells if is_proton]
+        neutrons = [(dx, dy) for dx, dy, is_proton in layout.cells if not is_proton]
+        core = [(dx, dy) for dx, dy, is_proton in layout.core if is_proton]
+        parts = ['<g fill="none" stroke-linecap="round">']
+        if neutrons:
+            parts.append(f'<path d="{dots(neutrons)}" stroke="{self.neutron}" stroke-width="{number(NEUTRON_SIZE)}"/>')
+            parts.append(f'<path d="{dots(neutrons)}" stroke="{self.background}" stroke-width="{number(NEUTRON_HOLE)}"/>')
+        if protons:
+            parts.append(f'<path d="{dots(protons)}" stroke="{self.proton}" stroke-width="{number(PROTON_SIZE)}"/>')
+        if core:
+            parts.append(f'<path class="q" d="{dots(core)}" stroke="{self.proton_pulse}" stroke-width="{number(PROTON_SIZE)}"/>')
+        parts.append('</g>')
+        return "".join(parts)
+
+    def electrons(self, shells: List[int]) -> str:
+        parts = []
+        for shell_idx, electron_count in enumerate(shells):
+            parts.append(f'<g class="s{shell_idx}">')
+            for e in range(electron_count):
+                angle = 360 * e / electron_count
+                rotate = f' transform="rotate({number(angle)})"' if angle else ""
+                parts.append(f'<use href="#e{shell_idx}"{rotate}/>')
+            parts.append('</g>')
+        return "".join(parts)
+
+    def svg(self, element: Element) -> str:
+        renderer = self.renderer
+        shells = get_electron_shells(element.atomic_number)
+        radii = renderer.shell_radii(len(shells))
+        half_width = radii[-1] + MARGIN
+        half_height = radii[-1] * CELL_ASPECT + MARGIN
+        scale = f'<g transform="scale(1 {number(CELL_ASPECT)})">'
+        return "".join([
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{number(-half_width)} {number(-half_height)} '
+            f'{number(2 * half_width)} {number(2 * half_height)}" width="{round(2 * half_width * CELL_PIXELS)}" '
+            f'height="{round(2 * half_height * CELL_PIXELS)}">',
+            f'<title>{escape(renderer.display_name(element))} ({element.symbol})</title>',
+            f'<style>{self.style(shells)}</style>',
+            f'<defs>{"".join(self.electron_symbol(shell_idx, radius) for shell_idx, radius in enumerate(radii))}</defs>',
+            f'<rect x="{number(-half_width)}" y="{number(-half_height)}" width="100%" height="100%" fill="{self.background}"/>',
+            f'{scale}{self.rings(radii)}</g>',
+            self.nucleus(element),
+            f'{scale}{self.electrons(shells)}</g>',
+            '</svg>',
+        ])
+
+    def span(self, text, name: str, bold: bool = False) -> str:
+        weight = ";font-weight:bold" if bold else ""
+        return f'<span style="color:{hex_rgb(default_rgb(name))}{weight}">{escape(str(text))}</span>'
+
+    def info_panel(self, element: Element, shells: List[int]) -> str:
+        renderer = self.renderer
+        shell_counts = []
+        for i, count in enumerate(shells):
+            shell_name = SHELL_NAMES[i] if i < len(SHELL_NAMES) else f"S{i+1}"
+            shell_counts.append(f'<span style="color:{self.shell_color(i)}">{shell_name}:{count}</span>')
+        lines = [
+            self.span(f"⚛️  {renderer.display_name(element)} ({element.symbol})", "HEADER", bold=True),
+            f"Protons: {self.span(element.atomic_number, 'PROTON')} | Neutrons: "
+            f"{self.span(renderer.neutron_count(element), 'NEUTRON')} | Electrons: {self.span(element.atomic_number, 'ELECTRON')}",
+            "Shells: " + " | ".join(shell_counts),
+            f"Configuration: {self.span(get_electron_configuration(element.atomic_number), 'BRIGHT_YELLOW')}",
+            f"Category: {self.span(element.category, 'HIGHLIGHT')}",
+            f"Atomic Mass: {self.span(element.atomic_mass, 'HIGHLIGHT')}",
+        ]
+        return f'<pre style="color:{hex_rgb(default_rgb("INFO"))}">' + "\n".join(lines) + '</pre>'
+
+    def html(self, element: Element) -> str:
+        shells = get_electron_shells(element.atomic_number)
+        return "".join([
+            '<!DOCTYPE html><html><head><meta charset="utf-8">',
+            f'<title>{escape(self.renderer.display_name(element))} ({element.symbol})</title>',
+            f'<style>body{{margin:2em;background:{self.background};color:{hex_rgb(PANEL_RGB)};font-family:monospace}}</style>',
+            '</head><body>',
+            self.svg(element),
+            self.info_panel(element, shells),
+            '</body></html>\n',
+        ])
+
+    def export(self, element: Element, export_format: str = "svg") -> str:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        return self.html(element) if export_format == "html" else self.svg(element) + "\n"
+
+    def write(self, element: Element, path: str, export_format: Optional[str] = None) -> int:
+        export_format = export_format or os.path.splitext(path)[1].lstrip(".").lower()
+        with open(path, 'wb') as output:
+            return output.write(self.export(element, export_format).encode('utf-8'))
+
+def output_path(output_dir: str, atomic_number: int, export_format: str) -> str:
+    return os.path.join(output_dir, f"{atomic_number:03d}_{get_element(atomic_number).symbol}.{export_format}")
+
+def export_elements(exporter: SvgExporter, atomic_numbers: Iterable[int], output_dir: str,
+                    export_format: str = "svg") -> Tuple[List[int], float]:
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    sizes = [exporter.write(get_element(number), output_path(output_dir, number, export_format), export_format)
+             for number in atomic_numbers]
+    return sizes, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Export animated atoms as self-contained SVG or HTML files.")
+    parser.add_argument("elements", nargs="?", default="1-118", help="atomic numbers, e.g. 1-10,26,79 (default: 1-118)")
+    parser.add_argument("-o", "--output", default="exports", help="output directory (default: exports)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="svg", dest="export_format")
+    parser.add_argument("--width", type=positive_int, default=100, help="terminal width the layout follows (default: 100)")
+    parser.add_argument("--height", type=positive_int, default=40, help="terminal height the layout follows (default: 40)")
+    parser.add_argument("--speed", type=float, default=1.0, help="animation speed multiplier (default: 1.0)")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+
+    try:
+        atomic_numbers = parse_atomic_numbers(args.elements)
+        if not atomic_numbers:
+            raise ValueError("No elements selected")
+    except ValueError as e:
+        print(f"{Colors.ERROR}{e}{Colors.RESET}")
+        sys.exit(1)
+
+    exporter = SvgExporter(AtomRenderer(args.width, args.height), speed=args.speed)
+    sizes, elapsed = export_elements(exporter, atomic_numbers, args.output, args.export_format)
+    print(f"{Colors.SUCCESS}Exported {len(sizes)} elements in {elapsed:.2f}s to {args.output}/ "
+          f"({sum(sizes) / len(sizes) / 1024:.1f} KB average, {max(sizes) / 1024:.1f} KB largest){Colors.RESET}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, List, Optional, TextIO, Tuple
+from cellbuffer import CellBuffer, Frame
+from framecache import CycleFrame, FrameCycle
+
+if TYPE_CHECKING:
+    from asciicast import AsciicastRecorder
+    from perf import PerfMonitor
+
+DIFF_CHUNK = 8
+MAX_GAP_CELLS = 4
+
+CURSOR_HOME = b"\033[H"
+CLEAR_TAIL = b"\n\033[J"
+SYNC_BEGIN = b"\033[?2026h"
+SYNC_END = b"\033[?2026l"
+
+SYNC_TERMINALS = ("kitty", "alacritty", "foot", "wezterm", "ghostty", "contour", "rio")
+SYNC_TERM_PROGRAMS = ("iTerm.app", "WezTerm", "vscode", "ghostty", "tmux")
+
+def supports_synchronized_output() -> bool:
+    term = os.environ.get("TERM", "")
+    if any(name in term for name in SYNC_TERMINALS):
+        return True
+    if os.environ.get("TERM_PROGRAM", "") in SYNC_TERM_PROGRAMS:
+        return True
+    return "WT_SESSION" in os.environ or "KITTY_WINDOW_ID" in os.environ
+
+class FrameWriter:
+    def __init__(self, stream: TextIO, synchronized: Optional[bool] = None):
+        self.stream = stream
+        try:
+            self.fd: Optional[int] = stream.fileno()
+        except (AttributeError, ValueError, OSError):
+            self.fd = None
+        if synchronized is None:
+            synchronized = self.fd is not None and os.isatty(self.fd) and supports_synchronized_output()
+        self.begin = SYNC_BEGIN if synchronized else b""
+        self.end = SYNC_END if synchronized else b""
+        self.buffer = bytearray(64 * 1024)
+        self.length = 0
+        self.writes = 0
+        self.frames = 0
+        self.written_bytes = 0
+        self.write_time = 0.0
+
+    @property
+    def synchronized(self) -> bool:
+        return bool(self.begin)
+
+    def prepare(self, text: str, prefix: bytes = b"", suffix: bytes = b"") -> int:
+        return self.prepare_bytes(text.encode('utf-8'), prefix, suffix)
+
+    def prepare_bytes(self, body: bytes, prefix: bytes = b"", suffix: bytes = b"") -> int:
+        begin, end = self.begin, self.end
+        length = len(begin) + len(prefix) + len(body) + len(suffix) + len(end)
+        if length > len(self.buffer):
+            self.buffer = bytearray(max(length, 2 * len(self.buffer)))
+        buffer = self.buffer
+        position = 0
+        for chunk in (begin, prefix, body, suffix, end):
+            buffer[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        self.length = length
+        return length - len(begin) - len(end)
+
+    def prepare_lines(self, lines: List[str]) -> int:
+        return self.prepare("\n".join(lines), CURSOR_HOME, CLEAR_TAIL)
+
+    def flush(self):
+        self.stream.flush()
+        self.frames += 1
+        started = time.perf_counter()
+        if self.fd is None:
+            self.stream.write(self.buffer[:self.length].decode('utf-8'))
+            self.stream.flush()
+            self.writes += 1
+        else:
+            with memoryview(self.buffer) as view:
+                position = 0
+                while position < self.length:
+                    position += os.write(self.fd, view[position:self.length])
+                    self.writes += 1
+        self.write_time += time.perf_counter() - started
+        self.written_bytes += self.length
+
+    def write(self, text: str) -> int:
+        size = self.prepare(text)
+        self.flush()
+        return size
+
+    def write_lines(self, lines: List[str]) -> int:
+        size = self.prepare_lines(lines)
+        self.flush()
+        return size
+
+class DiffRenderer:
+    def __init__(self, stream: Optional[TextIO] = None, recorder: Optional['AsciicastRecorder'] = None):
+        self.stream = stream
+        self.recorder = recorder
+        self.writer: Optional[FrameWriter] = None
+        self.perf: Optional['PerfMonitor'] = None
+        self.previous_grid: Optional[CellBuffer] = None
+        self.previous_cycle: Optional[Tuple[FrameCycle, int]] = None
+        self.previous_text: List[str] = []
+        self.previous_header_rows = 0
+        self.full_length = 0
+        self.bytes_last_frame = 0
+        self.total_bytes = 0
+        self.frames = 0
+        self.full_redraws = 0
+        self.resend_footer = True
+
+    def reset(self):
+        self.previous_grid = None
+        self.previous_cycle = None
+
+    def full_frame(self, frame: Frame) -> str:
+        return "\033[H" + "\n".join(frame.lines()) + "\n\033[J"
+
+    def footer_shown(self, frame: Frame) -> bool:
+        return ((self.previous_grid is not None or self.previous_cycle is not None)
+                and self.previous_header_rows == len(frame.header)
+                and self.previous_text[self.previous_header_rows:] == frame.footer)
+
+    def full_frame_above_footer(self, frame: Frame) -> str:
+        lines = frame.header + frame.grid.render_lines()
+        return "\033[H" + "\n".join(lines) + f"\033[{len(lines) + len(frame.footer) + 1};1H"
+
+    def diff_text(self, parts: List[str], row: int, line: str, previous: str):
+        if line != previous:
+            parts.append(f"\033[{row + 1};1H")
+            parts.append(line)
+            parts.append("\033[K")
+
+    def diff_grid(self, parts: List[str], top: int, grid: CellBuffer, previous: CellBuffer):
+        width = grid.width
+        glyphs, styles = grid.glyphs, grid.styles
+        prev_glyphs, prev_styles = previous.glyphs, previous.styles
+
+        for y in range(grid.height):
+            row_start = y * width
+            row_end = row_start + width
+            if glyphs[row_start:row_end] == prev_glyphs[row_start:row_end] and styles[row_start:row_end] == prev_styles[row_start:row_end]:
+                continue
+
+            runs = []
+            for chunk in range(row_start, row_end, DIFF_CHUNK):
+                chunk_end = chunk + DIFF_CHUNK
+                if chunk_end > row_end:
+                    chunk_end = row_end
+                if glyphs[chunk:chunk_end] == prev_glyphs[chunk:chunk_end] and styles[chunk:chunk_end] == prev_styles[chunk:chunk_end]:
+                    continue
+                while glyphs[chunk] == prev_glyphs[chunk] and styles[chunk] == prev_styles[chunk]:
+                    chunk += 1
+                while glyphs[chunk_end - 1] == prev_glyphs[chunk_end - 1] and styles[chunk_end - 1] == prev_styles[chunk_end - 1]:
+                    chunk_end -= 1
+                if runs and chunk - runs[-1][1] <= MAX_GAP_CELLS:
+                    runs[-1][1] = chunk_end
+                else:
+                    runs.append([chunk, chunk_end])
+
+            for run_start, run_end in runs:
+                parts.append(f"\033[{top + y + 1};{run_start - row_start + 1}H")
+                parts.append(grid.encode_span(run_start, run_end))
+
+    def diff_cycle_grid(self, frame: CycleFrame, header_rows: int) -> Optional[str]:
+        shown = self.previous_cycle
+        if shown is None or shown[0] is not frame.cycle or header_rows != frame.cycle.top:
+            return None
+        return frame.cycle.transition(shown[1], frame.index)
+
+    def diff_frame(self, frame: Frame) -> Optional[str]:
+        previous = self.previous_grid
+        shown = self.previous_cycle
+        text = frame.header + frame.footer
+        header_rows = len(frame.header)
+        if ((previous is None and shown is None) or len(self.previous_text) != len(text)
+                or header_rows != self.previous_header_rows):
+            return None
+
+        cycle_frame = frame if isinstance(frame, CycleFrame) else None
+        grid_diff = self.diff_cycle_grid(cycle_frame, header_rows) if cycle_frame is not None else None
+        if grid_diff is None:
+            if previous is None:
+                previous = self.previous_grid = shown[0].grid(shown[1])
+            grid = frame.grid
+            if previous.width != grid.width or previous.height != grid.height:
+                return None
+            grid_parts = []
+            self.diff_grid(grid_parts, header_rows, grid, previous)
+            grid_diff = ''.join(grid_parts)
+            if (cycle_frame is not None and shown is not None and shown[0] is cycle_frame.cycle
+                    and header_rows == cycle_frame.cycle.top):
+                cycle_frame.cycle.store(shown[1], cycle_frame.index, grid_diff)
+
+        parts = []
+        for row, line in enumerate(frame.header):
+            self.diff_text(parts, row, line, self.previous_text[row])
+        parts.append(grid_diff)
+        footer_top = header_rows + (frame.grid.height if cycle_frame is None else cycle_frame.cycle.height)
+        for offset, line in enumerate(frame.footer):
+            self.diff_text(parts, footer_top + offset, line, self.previous_text[header_rows + offset])
+
+        output = ''.join(parts)
+        if output:
+            output += f"\033[{footer_top + len(frame.footer) + 1};1H"
+        return output
+
+    def frame_writer(self) -> FrameWriter:
+        stream = self.stream or sys.stdout
+        if self.writer is None or self.writer.stream is not stream:
+            self.writer = FrameWriter(stream)
+        return self.writer
+
+    def next_output(self, frame: Frame) -> str:
+        output = self.diff_frame(frame)
+        if output is None or len(output) >= self.full_length:
+            if not self.resend_footer and frame.footer and self.footer_shown(frame):
+                output = self.full_frame_above_footer(frame)
+            else:
+                output = self.full_frame(frame)
+            self.full_length = len(output)
+            self.full_redraws += 1
+
+        if isinstance(frame, CycleFrame):
+            self.previous_cycle = (frame.cycle, frame.index)
+            self.previous_grid = frame.grid if frame.built else None
+        else:
+            self.previous_cycle = None
+            self.previous_grid = frame.grid.copy()
+        self.previous_text = frame.header + frame.footer
+        self.previous_header_rows = len(frame.header)
+        self.frames += 1
+        return output
+
+    def count_bytes(self, size: int):
+        self.bytes_last_frame = size
+        self.total_bytes += size
+
+    def encode(self, frame: Frame) -> str:
+        output = self.next_output(frame)
+        self.count_bytes(len(output.encode('utf-8')))
+        return output
+
+    def snapshot(self) -> Tuple:
+        return self.previous_grid, self.previous_cycle, self.previous_text, self.previous_header_rows, self.full_length
+
+    def restore(self, snapshot: Tuple):
+        self.previous_grid, self.previous_cycle, self.previous_text, self.previous_header_rows, self.full_length = snapshot
+
+    def prepare(self, frame: Frame, writer: FrameWriter) -> str:
+        perf = self.perf
+        if perf is not None:
+            started = time.perf_counter_ns()
+
+        output = self.next_output(frame)
+        self.count_bytes(writer.prepare(output) if output else 0)
+
+        if perf is not None:
+            perf.add("encode", time.perf_counter_ns() - started)
+        return output
+
+    def render(self, frame: Frame):
+        writer = self.frame_writer()
+        output = self.prepare(frame, writer)
+
+        perf = self.perf
+        if perf is not None:
+            encoded = time.perf_counter_ns()
+
+        if output:
+            writer.flush()
+
+        if perf is not None:
+            perf.add("write", time.perf_counter_ns() - encoded)
+
+        if self.recorder is not None and not self.recorder.record(output):
+            self.reset()
@@ -0,0 +1,35 @@
+import unittest
+from colors import COLOR_LEVELS, get_color_level, set_color_level
+from elements import get_element
+from renderer import AtomRenderer
+from vectorized import numpy_available
+
+ELEMENTS = (1, 2, 8, 26, 47, 79, 92, 118)
+TIME_STEPS = (0.0, 0.05, 0.37, 1.0, 2.5, 7.9, 31.4, 100.3)
+SIZES = ((100, 40), (60, 20), (200, 60), (30, 12))
+
+@unittest.skipUnless(numpy_available(), "NumPy is not installed")
+class ElectronBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.color_level = get_color_level()
+
+    def tearDown(self):
+        set_color_level(self.color_level)
+
+    def test_numpy_frames_match_python(self):
+        for level in COLOR_LEVELS:
+            set_color_level(level)
+            for width, height in SIZES:
+                python = AtomRenderer(width, height, backend="python", frame_cache_bytes=0)
+                numpy = AtomRenderer(width, height, backend="numpy", frame_cache_bytes=0)
+                for atomic_number in ELEMENTS:
+                    element = get_element(atomic_number)
+                    for time_step in TIME_STEPS:
+                        with self.subTest(level=level, size=(width, height), element=element.symbol, time_step=time_step):
+                            expected = python.build_grid(element, animated=True, time_step=time_step)
+                            actual = numpy.build_grid(element, animated=True, time_step=time_step)
+                            self.assertEqual(actual.glyphs, expected.glyphs)
+                            self.assertEqual(actual.styles, expected.styles)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import dataclasses
+import unittest
+from elements import (AUFBAU_EXCEPTIONS, ELEMENTS, PERIODIC_TABLE, find_element, get_electron_configuration,
+                      get_electron_shells, get_element_data, get_element_group, get_element_period,
+                      get_noble_gas_notation, get_valence_electrons)
+
+SHELLS = {
+    1: [1],
+    2: [2],
+    18: [2, 8, 8],
+    24: [2, 8, 13, 1],
+    26: [2, 8, 14, 2],
+    29: [2, 8, 18, 1],
+    46: [2, 8, 18, 18],
+    64: [2, 8, 18, 25, 9, 2],
+    79: [2, 8, 18, 32, 18, 1],
+    92: [2, 8, 18, 32, 21, 9, 2],
+    103: [2, 8, 18, 32, 32, 8, 3],
+    118: [2, 8, 18, 32, 32, 18, 8],
+}
+
+NOBLE_GAS_NOTATION = {
+    2: "1s²",
+    10: "[He] 2s² 2p⁶",
+    24: "[Ar] 4s¹ 3d⁵",
+    29: "[Ar] 4s¹ 3d¹⁰",
+    46: "[Kr] 4d¹⁰",
+    79: "[Xe] 6s¹ 4f¹⁴ 5d¹⁰",
+    92: "[Rn] 7s² 5f³ 6d¹",
+}
+
+PERIOD_AND_GROUP = {1: (1, 1), 2: (1, 18), 11: (3, 1), 26: (4, 8), 57: (6, 0), 79: (6, 11), 92: (7, 0), 118: (7, 18)}
+
+SUPERSCRIPT_DIGITS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
+
+class ElementTableTest(unittest.TestCase):
+    def test_table_covers_every_element(self):
+        self.assertEqual(sorted(ELEMENTS), list(range(1, 119)))
+        self.assertEqual(len(PERIODIC_TABLE), 119)
+
+    def test_shells_hold_every_electron(self):
+        for atomic_number in ELEMENTS:
+            with self.subTest(atomic_number=atomic_number):
+                shells = get_electron_shells(atomic_number)
+                self.assertEqual(sum(shells), atomic_number)
+                self.assertTrue(all(count > 0 for count in shells))
+                self.assertEqual(get_valence_electrons(atomic_number), shells[-1])
+
+    def test_configuration_holds_every_electron(self):
+        for atomic_number in ELEMENTS:
+            with self.subTest(atomic_number=atomic_number):
+                orbitals = get_electron_configuration(atomic_number).split()
+                total = sum(int(orbital[2:].translate(SUPERSCRIPT_DIGITS)) for orbital in orbitals)
+                self.assertEqual(total, atomic_number)
+
+    def test_known_shells(self):
+        for atomic_number, shells in SHELLS.items():
+            with self.subTest(atomic_number=atomic_number):
+                self.assertEqual(get_electron_shells(atomic_number), shells)
+
+    def test_aufbau_exceptions_are_applied(self):
+        for atomic_number, overrides in AUFBAU_EXCEPTIONS.items():
+            configuration = dict((orbital[:2], orbital[2:].translate(SUPERSCRIPT_DIGITS))
+                                 for orbital in get_electron_configuration(atomic_number).split())
+            for orbital, electrons in overrides.items():
+                with self.subTest(atomic_number=atomic_number, orbital=orbital):
+                    self.assertEqual(int(configuration.get(orbital, 0)), electrons)
+
+    def test_noble_gas_notation(self):
+        for atomic_number, notation in NOBLE_GAS_NOTATION.items():
+            with self.subTest(atomic_number=atomic_number):
+                self.assertEqual(get_noble_gas_notation(atomic_number), notation)
+
+    def test_period_and_group(self):
+        for atomic_number, (period, group) in PERIOD_AND_GROUP.items():
+            with self.subTest(atomic_number=atomic_number):
+                self.assertEqual((get_element_period(atomic_number), get_element_group(atomic_number)), (period, group))
+
+    def test_table_is_immutable(self):
+        data = get_element_data(26)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            data.shells = (2, 8, 16)
+        get_electron_shells(26).append(1)
+        self.assertEqual(get_electron_shells(26), SHELLS[26])
+
+    def test_find_element(self):
+        for query in ("26", "Fe", "fe", "iron", " Iron "):
+            with self.subTest(query=query):
+                self.assertEqual(find_element(query).atomic_number, 26)
+        for query in ("0", "119", "Xx", ""):
+            with self.subTest(query=query):
+                self.assertIsNone(find_element(query))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from cellbuffer import CellBuffer
+from framecache import MAX_REPLAYED_STEPS, CycleFrame, FrameCache, FrameCycle
+
+FRAMES = 10
+
+def make_cycle(max_bytes: int = 1 << 20) -> FrameCycle:
+    return FrameCycle(2.0, FRAMES, 4, 2, 0, lambda time_step: CellBuffer(4, 2), max_bytes)
+
+def fill(cycle: FrameCycle, steps: int = 1):
+    for index in range(FRAMES):
+        cycle.store((index - steps) % FRAMES, index, f"{steps}:{index}")
+
+def cycle_table_bytes() -> int:
+    cycle = make_cycle()
+    before = cycle.nbytes
+    cycle.store(0, 1, "")
+    return cycle.nbytes - before
+
+class FrameCycleTest(unittest.TestCase):
+    def test_index_wraps_with_the_period(self):
+        cycle = make_cycle()
+        self.assertEqual(cycle.index_at(0.0), 0)
+        self.assertEqual(cycle.index_at(0.2), 1)
+        self.assertEqual(cycle.index_at(1.99), 0)
+        self.assertEqual(cycle.index_at(2.4), 2)
+        self.assertAlmostEqual(cycle.time_step(5), 1.0)
+
+    def test_same_index_needs_no_output(self):
+        self.assertEqual(make_cycle().transition(3, 3), "")
+
+    def test_missing_transition(self):
+        self.assertIsNone(make_cycle().transition(3, 4))
+
+    def test_transitions_are_kept_per_stride(self):
+        cycle = make_cycle()
+        fill(cycle, 1)
+        fill(cycle, 3)
+        self.assertTrue(cycle.complete())
+        self.assertTrue(cycle.complete(3))
+        self.assertFalse(cycle.complete(2))
+        self.assertEqual(cycle.transition(9, 0), "1:0")
+        self.assertEqual(cycle.transition(8, 1), "3:1")
+        self.assertEqual(cycle.cached_frames, 2 * FRAMES)
+
+    def test_short_strides_replay_single_steps(self):
+        cycle = make_cycle()
+        fill(cycle, 1)
+        self.assertEqual(cycle.transition(8, 1), "1:9" + "1:0" + "1:1")
+        self.assertIsNone(cycle.transition(0, MAX_REPLAYED_STEPS + 1))
+
+    def test_single_step_gap_prevents_replay(self):
+        cycle = make_cycle()
+        fill(cycle, 1)
+        cycle.transitions[1][5] = None
+        self.assertIsNone(cycle.transition(3, 6))
+        self.assertEqual(cycle.transition(5, 8), "1:6" + "1:7" + "1:8")
+
+    def test_first_transition_is_kept(self):
+        cycle = make_cycle()
+        cycle.store(0, 1, "first")
+        cycle.store(0, 1, "second")
+        self.assertEqual(cycle.transition(0, 1), "first")
+        self.assertEqual(cycle.cached_frames, 1)
+
+    def test_budget_is_respected(self):
+        cycle = make_cycle(max_bytes=cycle_table_bytes() + 200)
+        for index in range(FRAMES):
+            cycle.store(index - 1, index, "x" * 100)
+        self.assertLessEqual(cycle.nbytes, cycle.max_bytes)
+        self.assertGreater(cycle.cached_frames, 0)
+        self.assertLess(cycle.cached_frames, FRAMES)
+        cycle.store(0, 2, "y")
+        self.assertNotIn(2, cycle.transitions)
+
+    def test_cycle_frame_builds_its_grid_lazily(self):
+        built = []
+        cycle = FrameCycle(2.0, FRAMES, 4, 2, 0, lambda time_step: built.append(time_step) or CellBuffer(4, 2))
+        frame = CycleFrame(["header"], ["footer"], cycle, 5)
+        self.assertFalse(frame.built)
+        self.assertEqual(len(frame.lines()), 4)
+        self.assertTrue(frame.built)
+        self.assertEqual(built, [1.0])
+
+class FrameCacheTest(unittest.TestCase):
+    def test_least_recently_used_cycle_is_evicted(self):
+        cache = FrameCache(max_bytes=1)
+        first, second = make_cycle(), make_cycle()
+        cache.put("first", first)
+        self.assertIs(cache.get("first"), first)
+        cache.put("second", second)
+        self.assertIsNone(cache.get("first"))
+        self.assertIs(cache.get("second"), second)
+        self.assertEqual(len(cache), 1)
+
+    def test_recently_shown_cycle_is_kept(self):
+        cycles = [make_cycle() for _ in range(3)]
+        cache = FrameCache(max_bytes=sum(cycle.nbytes for cycle in cycles[:2]))
+        cache.put(0, cycles[0])
+        cache.put(1, cycles[1])
+        cache.get(0)
+        cache.put(2, cycles[2])
+        self.assertIs(cache.get(0), cycles[0])
+        self.assertIsNone(cache.get(1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import unittest
+from keyboard import AnimationControls, KeyReader, parse_keys, termios
+from scheduler import FrameScheduler
+
+class ParseKeysTest(unittest.TestCase):
+    def test_plain_keys(self):
+        self.assertEqual(parse_keys("q 1+\r\x7f"), (["q", " ", "1", "+", "enter", "backspace"], ""))
+
+    def test_arrow_keys(self):
+        self.assertEqual(parse_keys("\033[A\033[B\033[C\033[D"), (["up", "down", "right", "left"], ""))
+        self.assertEqual(parse_keys("\033OA\033OB\033OC\033OD"), (["up", "down", "right", "left"], ""))
+
+    def test_unbound_sequences_are_skipped_whole(self):
+        for sequence in ("\033[H", "\033[1;5C", "\033[15~", "\033[200~", "\033OP", "\033x"):
+            with self.subTest(sequence=sequence):
+                self.assertEqual(parse_keys(sequence + "n"), (["n"], ""))
+
+    def test_lone_escape_at_end(self):
+        self.assertEqual(parse_keys("\033"), (["escape"], ""))
+        self.assertEqual(parse_keys("+\033"), (["+", "escape"], ""))
+
+    def test_incomplete_sequence_is_kept(self):
+        for sequence in ("\033[", "\033[1;5", "\033O"):
+            with self.subTest(sequence=sequence):
+                self.assertEqual(parse_keys("+" + sequence), (["+"], sequence))
+
+    def test_malformed_csi_ends_at_the_invalid_byte(self):
+        self.assertEqual(parse_keys("\033[1\x01q"), (["\x01", "q"], ""))
+
+@unittest.skipIf(termios is None, "termios is not available")
+class KeyReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.master, slave = os.openpty()
+        self.stream = os.fdopen(slave)
+
+    def tearDown(self):
+        os.close(self.master)
+        self.stream.close()
+
+    def test_sequence_split_across_reads(self):
+        with KeyReader(self.stream) as keys:
+            self.assertTrue(keys.active)
+            os.write(self.master, b"n\033[1;")
+            self.assertTrue(keys.wait(1.0))
+            self.assertEqual(keys.read_keys(), ["n"])
+            os.write(self.master, b"5C\033[")
+            self.assertTrue(keys.wait(1.0))
+            self.assertEqual(keys.read_keys(), [])
+            os.write(self.master, b"D")
+            self.assertTrue(keys.wait(1.0))
+            self.assertEqual(keys.read_keys(), ["left"])
+
+class AnimationControlsTest(unittest.TestCase):
+    def press(self, controls: AnimationControls, keys: str):
+        for key in parse_keys(keys)[0]:
+            controls.handle(key)
+
+    def test_element_navigation(self):
+        controls = AnimationControls(FrameScheduler(), 118)
+        self.press(controls, "n")
+        self.assertEqual(controls.atomic_number, 1)
+        self.press(controls, "\033[D")
+        self.assertEqual(controls.atomic_number, 118)
+        self.press(controls, "26\r")
+        self.assertEqual(controls.atomic_number, 26)
+        self.press(controls, "999\r")
+        self.assertEqual(controls.atomic_number, 26)
+
+    def test_escape_cancels_typing_before_quitting(self):
+        controls = AnimationControls(FrameScheduler(), 1)
+        self.press(controls, "7\033")
+        self.assertFalse(controls.quit)
+        self.press(controls, "\033")
+        self.assertTrue(controls.quit)
+
+    def test_navigation_keys_ignored_without_an_element(self):
+        controls = AnimationControls(FrameScheduler())
+        self.press(controls, "n12\r\033[C")
+        self.assertIsNone(controls.atomic_number)
+        self.assertEqual(controls.typed, "")
+        self.assertFalse(controls.quit)
+
+    def test_speed_and_pause(self):
+        scheduler = FrameScheduler()
+        controls = AnimationControls(scheduler)
+        self.press(controls, "+\033[A ")
+        self.assertGreater(scheduler.speed, 1.0)
+        self.assertTrue(scheduler.paused)
+        self.press(controls, "--- ")
+        self.assertLess(scheduler.speed, 1.0)
+        self.assertFalse(scheduler.paused)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from elements import ELEMENTS, get_element, get_electron_shells
+from nucleus import CELL_ASPECT
+from renderer import AtomRenderer
+
+SIZES = ((100, 40), (60, 20), (200, 60), (30, 12))
+
+class NucleusSizeTest(unittest.TestCase):
+    def cell_counts(self, renderer: AtomRenderer):
+        for atomic_number in sorted(ELEMENTS):
+            element = get_element(atomic_number)
+            nucleons = atomic_number + renderer.neutron_count(element)
+            yield element, nucleons, len(renderer.nucleus_layout(element).cells)
+
+    def test_cell_count_does_not_decrease_with_atomic_number(self):
+        for width, height in SIZES:
+            renderer = AtomRenderer(width, height, frame_cache_bytes=0)
+            lighter = []
+            for element, nucleons, cells in self.cell_counts(renderer):
+                with self.subTest(size=(width, height), element=element.symbol):
+                    for lighter_nucleons, lighter_cells in lighter:
+                        if lighter_nucleons <= nucleons:
+                            self.assertGreaterEqual(cells, lighter_cells)
+                lighter.append((nucleons, cells))
+
+    def test_heavy_nuclei_are_not_smaller_than_iron(self):
+        for width, height in SIZES:
+            renderer = AtomRenderer(width, height, frame_cache_bytes=0)
+            iron = len(renderer.nucleus_layout(get_element(26)).cells)
+            for atomic_number in (79, 92, 118):
+                with self.subTest(size=(width, height), atomic_number=atomic_number):
+                    self.assertGreaterEqual(len(renderer.nucleus_layout(get_element(atomic_number)).cells), iron)
+
+    def test_nucleus_stays_inside_first_shell(self):
+        for width, height in SIZES:
+            renderer = AtomRenderer(width, height, frame_cache_bytes=0)
+            for element, _, _ in self.cell_counts(renderer):
+                radius = renderer.shell_radius(0, len(get_electron_shells(element.atomic_number)))
+                with self.subTest(size=(width, height), element=element.symbol):
+                    for dx, dy, _ in renderer.nucleus_layout(element).cells:
+                        self.assertLess(dx * dx + (dy / CELL_ASPECT) ** 2, radius * radius)
+
+if __name__ == "__main__":
+    unittest.main()
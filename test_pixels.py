@@ -0,0 +1,48 @@
+import unittest
+from elements import get_element
+from pixels import ENCODERS, PixelRenderer, decode_kitty, decode_sixel
+from renderer import AtomRenderer
+
+ELEMENTS = (1, 26, 79, 118)
+TIME_STEPS = (0.0, 0.37, 1.0, 7.9, 31.4)
+SIZES = ((320, 240), (203, 157))
+
+class PixelRoundTripTest(unittest.TestCase):
+    def round_trip(self, protocol: str, check):
+        for width, height in SIZES:
+            pixels = PixelRenderer(AtomRenderer(100, 40, frame_cache_bytes=0), protocol, width, height)
+            for atomic_number in ELEMENTS:
+                element = get_element(atomic_number)
+                for time_step in TIME_STEPS:
+                    with self.subTest(size=(width, height), element=element.symbol, time_step=time_step):
+                        frame = pixels.scene.draw(element, time_step)
+                        check(pixels, frame, pixels.encoder.encode(frame))
+
+    def test_sixel_decodes_to_the_drawn_frame(self):
+        def check(pixels, frame, image):
+            width, height, palette, decoded = decode_sixel(image)
+            self.assertEqual((width, height), (pixels.scene.width, pixels.scene.height))
+            self.assertEqual(len(palette), len(pixels.scene.palette))
+            self.assertEqual(decoded, frame.pixels)
+
+        self.round_trip("sixel", check)
+
+    def test_kitty_decodes_to_the_drawn_frame(self):
+        def check(pixels, frame, image):
+            width, height, rgb = decode_kitty(image)
+            self.assertEqual((width, height), (pixels.scene.width, pixels.scene.height))
+            self.assertEqual(rgb, pixels.scene.rgb(frame.pixels))
+
+        self.round_trip("kitty", check)
+
+    def test_cached_bands_match_a_fresh_encoder(self):
+        element = get_element(79)
+        for protocol in ENCODERS:
+            with self.subTest(protocol=protocol):
+                animated = PixelRenderer(AtomRenderer(100, 40, frame_cache_bytes=0), protocol, 320, 240)
+                for time_step in TIME_STEPS:
+                    fresh = PixelRenderer(AtomRenderer(100, 40, frame_cache_bytes=0), protocol, 320, 240)
+                    self.assertEqual(animated.encode_frame(element, time_step), fresh.encode_frame(element, time_step))
+
+if __name__ == "__main__":
+    unittest.main()
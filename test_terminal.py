@@ -0,0 +1,112 @@
+import io
+import re
+import unittest
+from cellbuffer import PLAIN_STATE, parse_style, sgr_transition
+from elements import get_element, get_electron_shells
+from framecache import CycleFrame
+from geometry import loop_period
+from renderer import RASTER_MODES, AtomRenderer
+from terminal import DiffRenderer
+
+CONTROL = re.compile(r'\033\[(\??)([0-9;]*)([A-Za-z])|(\n)|(.)', re.S)
+
+class Screen:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.cells = [[(' ', PLAIN_STATE)] * width for _ in range(height)]
+        self.x = 0
+        self.y = 0
+        self.state = PLAIN_STATE
+
+    def put(self, char: str):
+        if self.x < self.width and self.y < self.height:
+            self.cells[self.y][self.x] = (char, PLAIN_STATE if char == ' ' else self.state)
+        self.x += 1
+
+    def clear_line(self, y: int, start: int = 0):
+        if y < self.height:
+            self.cells[y][start:] = [(' ', PLAIN_STATE)] * max(0, self.width - start)
+
+    def feed(self, text: str):
+        for private, params, command, newline, char in CONTROL.findall(text):
+            if newline:
+                self.x = 0
+                self.y += 1
+            elif char:
+                self.put(char)
+            elif private:
+                continue
+            elif command == 'H':
+                row, _, column = params.partition(';')
+                self.y = int(row or 1) - 1
+                self.x = int(column or 1) - 1
+            elif command == 'K':
+                self.clear_line(self.y, self.x)
+            elif command == 'J':
+                self.clear_line(self.y, self.x)
+                for y in range(self.y + 1, self.height):
+                    self.clear_line(y)
+            elif command == 'm':
+                self.state = parse_style(sgr_transition(PLAIN_STATE, self.state) + f"\033[{params}m")
+            else:
+                raise AssertionError(f"unexpected control sequence: {command!r}")
+
+class DiffReplayTest(unittest.TestCase):
+    def replay(self, renderer: AtomRenderer, frames) -> int:
+        replayed = 0
+        stream = io.StringIO()
+        renderer.diff_renderer.stream = stream
+        renderer.diff_renderer.reset()
+        size = (renderer.width + 40, renderer.height + 10)
+        screen = Screen(*size)
+        for number, frame in enumerate(frames):
+            renderer.diff_renderer.render(frame)
+            if isinstance(frame, CycleFrame) and not frame.built:
+                replayed += 1
+            screen.feed(stream.getvalue())
+            stream.seek(0)
+            stream.truncate()
+            expected = Screen(*size)
+            expected.feed(DiffRenderer().full_frame(frame))
+            for y, (actual_row, expected_row) in enumerate(zip(screen.cells, expected.cells)):
+                if actual_row != expected_row:
+                    self.fail(f"frame {number} differs from a full redraw on row {y}")
+        return replayed
+
+    def animated_frames(self, renderer: AtomRenderer, atomic_number: int, count: int, stride: int = 1):
+        element = get_element(atomic_number)
+        cycle = renderer.frame_cycle(element) if renderer.frame_cache is not None else None
+        frames = renderer.scheduler.loop_frames(loop_period(get_electron_shells(atomic_number)))
+        step = loop_period(get_electron_shells(atomic_number)) / frames
+        for i in range(count):
+            yield renderer.build_frame(element, animated=True, time_step=i * stride * step, cycle=cycle)
+
+    def test_animation_matches_full_redraw(self):
+        for raster in RASTER_MODES:
+            for atomic_number in (1, 26, 118):
+                with self.subTest(raster=raster, element=atomic_number):
+                    renderer = AtomRenderer(80, 30, raster=raster, frame_cache_bytes=0)
+                    self.replay(renderer, self.animated_frames(renderer, atomic_number, 30))
+
+    def test_cached_loop_replay_matches_full_redraw(self):
+        for stride in (1, 2, 3):
+            with self.subTest(stride=stride):
+                renderer = AtomRenderer(60, 24)
+                frames = renderer.scheduler.loop_frames(loop_period(get_electron_shells(1)))
+                replayed = self.replay(renderer, self.animated_frames(renderer, 1, 2 * frames + 5, stride))
+                self.assertGreaterEqual(replayed, frames)
+
+    def test_switching_elements_and_modes_matches_full_redraw(self):
+        renderer = AtomRenderer(80, 30)
+
+        def frames():
+            yield from self.animated_frames(renderer, 8, 10)
+            yield renderer.build_frame(get_element(8))
+            yield from self.animated_frames(renderer, 79, 10)
+            yield from self.animated_frames(renderer, 2, 10)
+
+        self.replay(renderer, frames())
+
+if __name__ == "__main__":
+    unittest.main()
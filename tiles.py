@@ -0,0 +1,185 @@
+import math
+import shutil
+from typing import Dict, List, Optional, Tuple
+from colors import Colors, clear_screen
+from braille import BrailleCanvas, get_braille_orbit
+from cellbuffer import STYLES, CellBuffer, Frame
+from elements import ELEMENTS, get_electron_shells, get_element, get_element_group, get_element_period
+from geometry import ANGLE_SCALE, ANGLE_STEPS, shared_loop_period, shell_speed
+from keyboard import AnimationControls, run_animation
+
+TABLE_COLUMNS = 18
+TABLE_ROWS = 9
+HEADER_ROWS = 2
+FOOTER_ROWS = 1
+MIN_TILE_WIDTH = 4
+MIN_TILE_HEIGHT = 2
+
+Label = Tuple[int, int, int]
+
+def table_position(atomic_number: int) -> Tuple[int, int]:
+    period = get_element_period(atomic_number)
+    group = get_element_group(atomic_number)
+    if group == 0:
+        first = 57 if period == 6 else 89
+        return 2 + atomic_number - first, period + 1
+    return group - 1, period - 1
+
+def parse_tile_selection(spec: str) -> Tuple[str, List[int], bool]:
+    spec = spec.strip().lower()
+    if spec in ("table", "all"):
+        return "Periodic table", list(ELEMENTS), True
+    kind, _, value = spec.partition(':')
+    if kind == "period" and value.isdigit() and 1 <= int(value) <= 7:
+        return f"Period {value}", [z for z in ELEMENTS if get_element_period(z) == int(value)], False
+    if kind == "group" and value.isdigit() and 1 <= int(value) <= 18:
+        return f"Group {value}", [z for z in ELEMENTS if get_element_group(z) == int(value)], False
+    raise ValueError(f"Unknown tile selection: {spec} (use table, period:1-7 or group:1-18)")
+
+def flow_layout(count: int, width: int, height: int) -> Tuple[int, int]:
+    best = (-1.0, 1, count)
+    for columns in range(1, count + 1):
+        rows = math.ceil(count / columns)
+        radius = min(width // columns / 2, height // rows / 2 / 0.85)
+        if radius > best[0]:
+            best = (radius, columns, rows)
+    return best[1], best[2]
+
+class TileCompositor:
+    def __init__(self, renderer, title: str, atomic_numbers: List[int], table: bool = False):
+        self.renderer = renderer
+        self.title = title
+        self.atomic_numbers = atomic_numbers
+        self.table = table
+        self.style_label = STYLES.intern(f"{Colors.BOLD}{Colors.HEADER}")
+        self.terminal_size = (0, 0)
+        self.layout(*shutil.get_terminal_size((TABLE_COLUMNS * 8, TABLE_ROWS * 4 + HEADER_ROWS + FOOTER_ROWS)))
+
+    def layout(self, columns: int, lines: int):
+        self.terminal_size = (columns, lines)
+        self.width = columns
+        self.height = max(1, lines - HEADER_ROWS - FOOTER_ROWS)
+        if self.table:
+            grid_columns, grid_rows = TABLE_COLUMNS, TABLE_ROWS
+            cells = [table_position(z) for z in self.atomic_numbers]
+        else:
+            grid_columns, grid_rows = flow_layout(len(self.atomic_numbers), self.width, self.height)
+            cells = [(i % grid_columns, i // grid_columns) for i in range(len(self.atomic_numbers))]
+        self.tile_width = self.width // grid_columns
+        self.tile_height = self.height // grid_rows
+        if self.tile_width < MIN_TILE_WIDTH or self.tile_height < MIN_TILE_HEIGHT:
+            raise ValueError(f"Terminal too small for {len(self.atomic_numbers)} tiles: need at least "
+                             f"{grid_columns * MIN_TILE_WIDTH}x{grid_rows * MIN_TILE_HEIGHT + HEADER_ROWS + FOOTER_ROWS}")
+        self.origins: Dict[int, Tuple[int, int]] = {
+            z: (column * self.tile_width, row * self.tile_height) for z, (column, row) in zip(self.atomic_numbers, cells)
+        }
+        self.blank = CellBuffer(self.width, self.height)
+        self._radii: Dict[int, List[float]] = {}
+        self.backgrounds: Dict[int, BrailleCanvas] = {}
+        self.labels: Dict[int, List[Label]] = {}
+        self.renderer.diff_renderer.reset()
+
+    def shell_radii(self, shell_count: int) -> List[float]:
+        radii = self._radii.get(shell_count)
+        if radii is None:
+            outer = max(0.5, min(self.tile_width / 2 - 0.5, (self.tile_height / 2 - 0.25) / 0.85))
+            inner = min(1.5, outer * 0.5)
+            if shell_count == 1:
+                radii = [(inner + outer) / 2]
+            else:
+                radii = [inner + (outer - inner) * i / (shell_count - 1) for i in range(shell_count)]
+            self._radii[shell_count] = radii
+        return radii
+
+    def background(self, atomic_number: int) -> BrailleCanvas:
+        canvas = self.backgrounds.get(atomic_number)
+        if canvas is None:
+            shells = get_electron_shells(atomic_number)
+            radii = self.shell_radii(len(shells))
+            canvas = BrailleCanvas(self.tile_width, self.tile_height)
+            for shell_idx, radius in enumerate(radii):
+                style = self.renderer.shell_style(shell_idx)
+                for index, bit, _ in get_braille_orbit(self.tile_width, self.tile_height, radius).ring:
+                    canvas.dots[index] |= bit
+                    canvas.styles[index] = style
+
+            symbol = get_element(atomic_number).symbol
+            center_x, center_y = self.tile_width // 2, self.tile_height // 2
+            start = max(0, center_x - len(symbol) // 2)
+            labels = []
+            for offset, char in enumerate(symbol[:self.tile_width - start]):
+                labels.append((center_y * self.tile_width + start + offset, ord(char), self.style_label))
+            self.backgrounds[atomic_number] = canvas
+            self.labels[atomic_number] = labels
+        return canvas
+
+    def draw_electrons(self, canvas: BrailleCanvas, atomic_number: int, time_step: float):
+        dots, styles = canvas.dots, canvas.styles
+        electron_style = self.renderer.style_electron
+        shells = get_electron_shells(atomic_number)
+        for shell_idx, (electron_count, radius) in enumerate(zip(shells, self.shell_radii(len(shells)))):
+            angle_dots = get_braille_orbit(self.tile_width, self.tile_height, radius).angle_dots
+            rotation = time_step * shell_speed(shell_idx) * ANGLE_SCALE
+            spacing = ANGLE_STEPS / electron_count
+            for e in range(electron_count):
+                dot = angle_dots[int((spacing * e + rotation) % ANGLE_STEPS + 0.5)]
+                if dot is not None:
+                    index, bit = dot
+                    dots[index] |= bit
+                    styles[index] = electron_style
+
+    def build_grid(self, time_step: float) -> CellBuffer:
+        grid = self.blank.copy()
+        glyphs, styles = grid.glyphs, grid.styles
+        width, tile_width = self.width, self.tile_width
+        for atomic_number, (origin_x, origin_y) in self.origins.items():
+            canvas = self.background(atomic_number).copy()
+            self.draw_electrons(canvas, atomic_number, time_step)
+            tile = canvas.to_cells()
+            for index, glyph, style in self.labels[atomic_number]:
+                tile.glyphs[index] = glyph
+                tile.styles[index] = style
+            for row in range(self.tile_height):
+                source = row * tile_width
+                target = (origin_y + row) * width + origin_x
+                glyphs[target:target + tile_width] = tile.glyphs[source:source + tile_width]
+                styles[target:target + tile_width] = tile.styles[source:source + tile_width]
+        return grid
+
+    def build_frame(self, time_step: float, controls: Optional[AnimationControls] = None) -> Frame:
+        renderer = self.renderer
+        status = f"{Colors.BOLD}{Colors.HEADER}⚛️  {self.title} - {len(self.atomic_numbers)} atoms{Colors.RESET}"
+        if renderer.diff_renderer.frames:
+            status += f" {Colors.DIM}| {renderer.diff_renderer.bytes_last_frame} B/frame{Colors.RESET}"
+        if renderer.scheduler.frames > 2:
+            status += f" {Colors.DIM}| {renderer.scheduler.achieved_fps():.1f} fps ±{renderer.scheduler.jitter_ms():.1f} ms{Colors.RESET}"
+        footer = controls.status() if controls is not None else f"{Colors.INFO}Press Ctrl+C to stop animation{Colors.RESET}"
+        return Frame([status, ""], self.build_grid(time_step), [footer])
+
+    def too_small_frame(self, message: str) -> Frame:
+        status = f"{Colors.BOLD}{Colors.HEADER}⚛️  {self.title} - {len(self.atomic_numbers)} atoms{Colors.RESET}"
+        return Frame([status, ""], CellBuffer(0, 0), [f"{Colors.ERROR}{message}{Colors.RESET}"])
+
+    def run(self, frames: Optional[int] = None, duration: Optional[float] = None):
+        renderer = self.renderer
+        scheduler = renderer.scheduler
+        scheduler.set_period(shared_loop_period(get_electron_shells(z) for z in self.atomic_numbers))
+        too_small: List[str] = []
+
+        def draw_frame(controls: Optional[AnimationControls]):
+            size = tuple(shutil.get_terminal_size(self.terminal_size))
+            if size != self.terminal_size:
+                too_small.clear()
+                try:
+                    self.layout(*size)
+                except ValueError as e:
+                    too_small.append(str(e))
+                clear_screen()
+            time_step = scheduler.begin_frame()
+            if too_small:
+                renderer.diff_renderer.render(self.too_small_frame(too_small[0]))
+            else:
+                renderer.diff_renderer.render(self.build_frame(time_step, controls))
+
+        run_animation(AnimationControls(scheduler), draw_frame, frames=frames, duration=duration,
+                      on_start=renderer.diff_renderer.reset)
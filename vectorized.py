@@ -0,0 +1,78 @@
+import math
+from collections import OrderedDict
+from typing import List, Tuple
+from cellbuffer import BLANK, CellBuffer
+from geometry import ANGLE_SCALE, ANGLE_STEPS, ELECTRON_BLINK_RATE, blink, loop_period, shell_speed
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAX_CACHED_LAYOUTS = 64
+
+def numpy_available() -> bool:
+    return np is not None
+
+class ElectronLayout:
+    def __init__(self, index_table, shell_rows, base_angles, speeds):
+        self.index_table = index_table
+        self.shell_rows = shell_rows
+        self.base_angles = base_angles
+        self.speeds = speeds
+
+class VectorizedElectrons:
+    def __init__(self, renderer):
+        if np is None:
+            raise ImportError("NumPy is required for the vectorized electron backend")
+        self.renderer = renderer
+        self._layouts: 'OrderedDict[Tuple[int, int, Tuple[int, ...]], ElectronLayout]' = OrderedDict()
+
+    def layout(self, shells: List[int]) -> ElectronLayout:
+        renderer = self.renderer
+        key = (renderer.width, renderer.height, tuple(shells))
+        layout = self._layouts.get(key)
+        if layout is None:
+            tables, shell_rows, base_angles, speeds = [], [], [], []
+            for shell_idx, electron_count in enumerate(shells):
+                tables.append(renderer.shell_geometry(shell_idx, 48, len(shells)).angle_indices)
+                rotation_speed = shell_speed(shell_idx)
+                for e in range(electron_count):
+                    shell_rows.append(shell_idx)
+                    base_angles.append((2 * math.pi * e) / electron_count)
+                    speeds.append(rotation_speed)
+            layout = ElectronLayout(np.array(tables, dtype=np.int64), np.array(shell_rows, dtype=np.intp),
+                                    np.array(base_angles, dtype=np.float64), np.array(speeds, dtype=np.float64))
+            self._layouts[key] = layout
+            if len(self._layouts) > MAX_CACHED_LAYOUTS:
+                self._layouts.popitem(last=False)
+        else:
+            self._layouts.move_to_end(key)
+        return layout
+
+    def draw_electrons_animated(self, grid: CellBuffer, shells: List[int], time_step: float):
+        renderer = self.renderer
+        layout = self.layout(shells)
+        glyphs = np.frombuffer(grid.glyphs, dtype=np.uint32)
+        styles = np.frombuffer(grid.styles, dtype=np.uint8)
+        trail_flags = np.frombuffer(renderer.trail_flags, dtype=np.uint8)
+        electron_glyph = renderer.glyph_electrons[blink(time_step, ELECTRON_BLINK_RATE, loop_period(shells))]
+
+        angles = layout.base_angles + time_step * layout.speeds
+        for offset, trail_style in renderer.trail:
+            trail_steps = ((angles - offset) * ANGLE_SCALE % ANGLE_STEPS + 0.5).astype(np.intp)
+            trails = layout.index_table[layout.shell_rows, trail_steps]
+            trails = trails[trails >= 0]
+            found = glyphs[trails]
+            free = found == BLANK
+            if renderer.trail_over_rings:
+                free |= (found == renderer.glyph_dot) & (trail_flags[styles[trails]] == 0)
+            trails = trails[free]
+            glyphs[trails] = renderer.glyph_dot
+            styles[trails] = trail_style
+
+        steps = (angles * ANGLE_SCALE % ANGLE_STEPS + 0.5).astype(np.intp)
+        electrons = layout.index_table[layout.shell_rows, steps]
+        electrons = electrons[electrons >= 0]
+        glyphs[electrons] = electron_glyph
+        styles[electrons] = renderer.style_electron